@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 """检查各模型的实际执行情况"""
 
-import json
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "env"))
+from check_result_store import load_check_result  # noqa: E402
+
 evaluation_outputs_dir = Path('/Users/feixiaoxu01/Documents/agents/agent_auto_evaluation/universal_scenario_framework/tmp_scenarios/novel_writing_alchemist/evaluation_outputs')
 
 eval_dirs = [d for d in evaluation_outputs_dir.iterdir() if d.is_dir() and d.name.startswith('eval_v2_')]
@@ -36,22 +39,21 @@ for eval_dir in eval_dirs:
             check_result_file = env_dir / 'check_resultv3.json'
 
         if check_result_file.exists():
-            with open(check_result_file, 'r', encoding='utf-8') as f:
-                result = json.load(f)
-                completion_status = result.get('completion_status', 'unknown')
-                overall_result = result.get('overall_result', {})
-                overall_status = overall_result.get('status', 'unknown')
-                total_score = overall_result.get('total_score', 0)
-
-                if completion_status == 'completed':
-                    completed += 1
-                    # 检查质量状态
-                    if overall_status == 'Poor':
-                        poor_quality += 1
-                        poor_samples.append(f"{sample_name} (score: {total_score:.2f})")
-                else:
-                    failed += 1
-                    failed_samples.append(f"{sample_name} (status: {completion_status})")
+            result = load_check_result(check_result_file)
+            completion_status = result.get('completion_status', 'unknown')
+            overall_result = result.get('overall_result', {})
+            overall_status = overall_result.get('status', 'unknown')
+            total_score = overall_result.get('total_score', 0)
+
+            if completion_status == 'completed':
+                completed += 1
+                # 检查质量状态
+                if overall_status == 'Poor':
+                    poor_quality += 1
+                    poor_samples.append(f"{sample_name} (score: {total_score:.2f})")
+            else:
+                failed += 1
+                failed_samples.append(f"{sample_name} (status: {completion_status})")
         else:
             no_check_result += 1
             no_result_samples.append(sample_name)
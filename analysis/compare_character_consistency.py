@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 """对比Claude Opus 4.5和Ernie 5.0在人物设定一致性（检查项18）上的表现"""
 
-import json
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "env"))
+from check_result_store import load_check_result  # noqa: E402
+
 claude_dir = Path('/Users/feixiaoxu01/Documents/agents/agent_auto_evaluation/universal_scenario_framework/tmp_scenarios/novel_writing_alchemist/evaluation_outputs/eval_v2_20260205_132400_claude-opus-4-5-20251101')
 ernie_dir = Path('/Users/feixiaoxu01/Documents/agents/agent_auto_evaluation/universal_scenario_framework/tmp_scenarios/novel_writing_alchemist/evaluation_outputs/eval_v2_20260205_140957_ernie-5.0-thinking-preview')
 
@@ -27,8 +30,7 @@ def analyze_model(model_name, eval_dir):
         if not check_result_file.exists():
             continue
 
-        with open(check_result_file, 'r', encoding='utf-8') as f:
-            result = json.load(f)
+        result = load_check_result(check_result_file)
 
         # 只统计execution_success的样本
         output_completeness = result.get('output_completeness', {})
@@ -10,7 +10,6 @@
     python evaluation_statistics.py -v v3             # 简写形式
 """
 
-import json
 import os
 import sys
 import argparse
@@ -21,6 +20,9 @@ import yaml
 from typing import Dict, List, Any, Optional, Tuple
 import re
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "env"))
+from check_result_store import load_check_result
+
 
 def _check_id_sort_key(check_id: str):
     """check_id 排序辅助函数，兼容新旧两种格式。
@@ -191,9 +193,8 @@ class EvaluationStatistics:
                     check_result_file = sample_dir / self.check_result_filename
 
                     if check_result_file.exists():
-                        with open(check_result_file, 'r', encoding='utf-8') as f:
-                            result = json.load(f)
-                            sample_results.append(result)
+                        result = load_check_result(check_result_file)
+                        sample_results.append(result)
 
             self.model_data[model_name] = sample_results
             self.model_total_samples[model_name] = total_sample_count
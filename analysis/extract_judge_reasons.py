@@ -6,11 +6,14 @@ LLM judge reason，用于分析 checker 合理性。
 Part A: logical_contradiction - 强模型 FAIL 案例 + PASS 案例
 Part B: character_design_adherence - 全模型 fail 率统计 + DSV1/DSV2 配对分析
 """
-import json
 import os
 import random
 import sys
 from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "env"))
+from check_result_store import load_check_result  # noqa: E402
 
 random.seed(42)
 
@@ -75,8 +78,7 @@ def load_all_check_details():
             if not os.path.exists(rev006_path):
                 continue
 
-            with open(rev006_path, "r", encoding="utf-8") as f:
-                check_result = json.load(f)
+            check_result = load_check_result(rev006_path)
 
             details = check_result.get("check_details", {})
             for check_name, check_info in details.items():
@@ -7,6 +7,10 @@ import os
 import glob
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "env"))
+import check_result_store  # noqa: E402
+from json_io import load_json  # noqa: E402
+
 EVAL_DIR = os.path.join(
     os.path.dirname(os.path.abspath(__file__)),
     "..", "evaluation_outputs"
@@ -112,8 +116,7 @@ def load_check_result(env_dir, revision="008"):
     for rev in [revision, "007", "006"]:
         path = os.path.join(env_dir, f"check_result_rev{rev}.json")
         if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return check_result_store.load_check_result(path)
     return None
 
 def extract_scores(check_result):
@@ -204,8 +207,7 @@ def main():
             # 有章节产出的 error 样本保留（可能是写了大量内容后超时中断）
             sample_json_path = os.path.join(full_path, sample_id + ".json")
             if os.path.exists(sample_json_path):
-                with open(sample_json_path, "r", encoding="utf-8") as sf:
-                    sample_meta = json.load(sf)
+                sample_meta = load_json(sample_json_path)
                 exec_status = sample_meta.get("execution_status")
                 if exec_status == "error":
                     workspace_path = os.path.join(env_path, "workspace")
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 """调查Ernie 5.0在人物设定一致性（character_trait_consistency）上的0分问题"""
 
-import json
+import sys
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "env"))
+from check_result_store import load_check_result  # noqa: E402
+
 ernie_eval_dir = Path('/Users/feixiaoxu01/Documents/agents/agent_auto_evaluation/universal_scenario_framework/tmp_scenarios/novel_writing_alchemist/evaluation_outputs/eval_v2_20260205_140957_ernie-5.0-thinking-preview')
 
 # 统计数据
@@ -31,8 +34,7 @@ for sample_dir in ernie_eval_dir.iterdir():
     if not check_result_file.exists():
         continue
 
-    with open(check_result_file, 'r', encoding='utf-8') as f:
-        result = json.load(f)
+    result = load_check_result(check_result_file)
 
     # 只统计execution_success的样本
     output_completeness = result.get('output_completeness', {})
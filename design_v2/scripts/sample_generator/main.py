@@ -8,15 +8,57 @@
 3. 基于unified_scenario_design.yaml的need_templates生成样本
 """
 
+import hashlib
 import json
+import time
 import yaml
 from pathlib import Path
 from copy import deepcopy
 
+# tool_call_order 各断言类型需要的事件字段（与 env/tool_call_index.py 保持一致）
+ORDER_ASSERTION_EVENTS = {
+    'before': ('before', 'after'),
+    'at_least_every': ('event', 'marker'),
+    'not_after': ('trigger', 'forbidden'),
+}
+
+# tool_call_order 的 checker_params_spec 内置定义
+TOOL_CALL_ORDER_PARAMS_SPEC = {
+    'description': '工具调用时序断言：单次线性遍历工具调用序列，评估before/at_least_every/not_after断言',
+    'params': {
+        'assertions': {'type': 'array', 'required': True},
+    },
+}
+
+
+def _prefix_order_assertion_tools(params, server_name):
+    """给tool_call_order断言中所有事件的tool_name加上server前缀（已含__的不重复加）"""
+    def _prefix(name):
+        return name if '__' in name else f"{server_name}__{name}"
+
+    for assertion in params.get('assertions', []):
+        if not isinstance(assertion, dict):
+            continue
+        for key in ORDER_ASSERTION_EVENTS.get(assertion.get('type'), ()):
+            event = assertion.get(key)
+            if not isinstance(event, dict):
+                continue
+            tool_name = event.get('tool_name')
+            if isinstance(tool_name, str):
+                event['tool_name'] = _prefix(tool_name)
+            elif isinstance(tool_name, list):
+                event['tool_name'] = [_prefix(t) if isinstance(t, str) else t for t in tool_name]
+
 
 class NovelSampleGenerator:
-    def __init__(self, base_dir):
+    # 增量构建缓存格式版本
+    BUILD_CACHE_VERSION = 1
+
+    def __init__(self, base_dir, incremental=False):
         self.base_dir = Path(base_dir).resolve()  # 转换为绝对路径
+        self.incremental = incremental
+        self.build_graph = []  # [(stage, status, seconds)]
+        stage_start = time.time()
 
         # 加载配置文件
         print("Loading configuration files...")
@@ -44,6 +86,8 @@ class NovelSampleGenerator:
         with open(spec_path, 'r', encoding='utf-8') as f:
             self.sample_format_spec = json.load(f)
         self.checker_params_spec = self.sample_format_spec.get('checker_params_spec', {})
+        # tool_call_order（工具调用时序断言）为本场景新增类型，外部规范未收录时使用内置定义
+        self.checker_params_spec.setdefault('tool_call_order', TOOL_CALL_ORDER_PARAMS_SPEC)
         print(f"Loaded checker_params_spec for {len(self.checker_params_spec)} check types")
 
         # 加载通用检查项（优先从独立的check_definitions目录读取）
@@ -78,14 +122,37 @@ class NovelSampleGenerator:
         ).get('content', '')
         if self.common_user_simulator_behavior:
             print("Loaded common_user_simulator_behavior")
+        self._record_stage("load_config", "done", stage_start)
+
+        # 增量模式下environment构建和schema校验推迟到build_incremental中按需执行
+        self.environment = None
+        if incremental:
+            return
 
         # 构建公共environment
         print("Building common environment...")
+        stage_start = time.time()
         self.environment = self._build_common_environment()
+        self._record_stage("build_environment", "done", stage_start)
 
         # 校验checklist schema
         print("Validating checklist schemas...")
+        stage_start = time.time()
         self.validate_checklist_schemas()
+        self._record_stage("validate_checklist", "done", stage_start)
+
+    def _record_stage(self, stage, status, start_time):
+        """记录构建阶段耗时（用于打印build graph）"""
+        self.build_graph.append((stage, status, time.time() - start_time))
+
+    def print_build_graph(self):
+        """打印各构建阶段的状态和耗时"""
+        print("\nBuild graph:")
+        total = 0.0
+        for stage, status, seconds in self.build_graph:
+            total += seconds
+            print(f"  {stage:<20} {seconds:>7.2f}s  {status}")
+        print(f"  {'total':<20} {total:>7.2f}s")
 
     def _build_capability_lookup(self):
         """从能力体系YAML构建查找结构"""
@@ -278,13 +345,15 @@ class NovelSampleGenerator:
                             )
                         else:
                             method = rule['validation_method']
-                            # P1-P5 程序化检查方法（在checker_execute.py中实现，零LLM成本）
+                            # P1-P6 程序化检查方法（在checker_execute.py中实现，零LLM成本）
+                            # character_presence_timeline 结论存疑时会升级到 llm_judge_criteria 指定的LLM judge
                             PROGRAMMATIC_METHODS = {
                                 'chapter_cloning_detection',
                                 'alternating_repetition_detection',
                                 'chapter_completion_ratio',
                                 'chapter_length_stability',
                                 'paragraph_repetition_detection',
+                                'character_presence_timeline',
                             }
                             VALID_METHODS = {'llm_semantic_analysis', 'word_count_range'} | PROGRAMMATIC_METHODS
                             if method not in VALID_METHODS:
@@ -309,6 +378,61 @@ class NovelSampleGenerator:
                                         f"'evaluation_criteria' in rule or 'llm_judge_criteria_file' in params"
                                     )
 
+    def _validate_order_assertions(self, context, check_id, params, errors):
+        """校验tool_call_order的assertions结构
+
+        Args:
+            context: 上下文标识
+            check_id: 检查项ID
+            params: 参数字典
+            errors: 错误列表
+        """
+        assertions = params.get('assertions')
+        if not isinstance(assertions, list) or not assertions:
+            errors.append(f"[{context}] {check_id}: tool_call_order requires non-empty 'assertions' array")
+            return
+
+        for idx, assertion in enumerate(assertions):
+            if not isinstance(assertion, dict):
+                errors.append(f"[{context}] {check_id}: assertions[{idx}] must be object")
+                continue
+            assertion_type = assertion.get('type')
+            if assertion_type not in ORDER_ASSERTION_EVENTS:
+                errors.append(
+                    f"[{context}] {check_id}: assertions[{idx}] invalid type '{assertion_type}', "
+                    f"must be one of {sorted(ORDER_ASSERTION_EVENTS)}"
+                )
+                continue
+
+            for key in ORDER_ASSERTION_EVENTS[assertion_type]:
+                event = assertion.get(key)
+                if not isinstance(event, dict):
+                    errors.append(f"[{context}] {check_id}: assertions[{idx}] ({assertion_type}) requires '{key}' object")
+                    continue
+                tool_name = event.get('tool_name')
+                if not tool_name or not (isinstance(tool_name, str) or
+                                         (isinstance(tool_name, list) and all(isinstance(t, str) for t in tool_name))):
+                    errors.append(
+                        f"[{context}] {check_id}: assertions[{idx}].{key}.tool_name must be string or array of strings"
+                    )
+                if 'expected_params' in event and not isinstance(event['expected_params'], dict):
+                    errors.append(f"[{context}] {check_id}: assertions[{idx}].{key}.expected_params must be object")
+                mode = event.get('param_match_mode', 'exact')
+                if mode not in ('exact', 'contains', 'prefix'):
+                    errors.append(
+                        f"[{context}] {check_id}: assertions[{idx}].{key}.param_match_mode invalid '{mode}', "
+                        f"must be one of ['contains', 'exact', 'prefix']"
+                    )
+
+            if assertion_type == 'before' and assertion.get('if_after_missing', 'skip') not in ('skip', 'pass', 'fail'):
+                errors.append(
+                    f"[{context}] {check_id}: assertions[{idx}].if_after_missing must be 'skip', 'pass' or 'fail'"
+                )
+            if assertion_type == 'at_least_every':
+                k = assertion.get('k')
+                if not isinstance(k, int) or isinstance(k, bool) or k < 1:
+                    errors.append(f"[{context}] {check_id}: assertions[{idx}].k must be positive integer, got {k!r}")
+
     def _validate_single_check(self, context, check_id, check_item, valid_quality_tiers, errors, warnings):
         """校验单个check项的合法性
 
@@ -382,12 +506,27 @@ class NovelSampleGenerator:
             if 'required_params' not in params:
                 warnings.append(f"[{context}] {check_id}: tool_called_with_params usually needs 'required_params' in params")
 
-        # 10. 严格校验params格式（基于sample_format_spec.json）
+        # 10. tool_call_order特定校验（断言结构）
+        if check_type == 'tool_call_order' and isinstance(check_item.get('params'), dict):
+            self._validate_order_assertions(context, check_id, check_item['params'], errors)
+
+        # 11. 严格校验params格式（基于sample_format_spec.json）
         if check_type and 'params' in check_item and isinstance(check_item['params'], dict):
             self._validate_params_format(context, check_id, check_type, check_item['params'], errors)
 
-    def validate_checklist_schemas(self):
-        """校验check_list的schema合法性（支持check_definitions目录和内嵌两种模式）"""
+        # 12. depends_on类型检查（检查项依赖DAG，引用其他检查项的check_id）
+        depends_on = check_item.get('depends_on')
+        if depends_on is not None and not (
+                isinstance(depends_on, list) and all(isinstance(dep, str) for dep in depends_on)):
+            errors.append(f"[{context}] {check_id}: 'depends_on' must be array of check_id strings")
+
+    def validate_checklist_schemas(self, template_ids=None, include_common=True):
+        """校验check_list的schema合法性（支持check_definitions目录和内嵌两种模式）
+
+        Args:
+            template_ids: 只校验这些模板的check_list（None表示全部，增量构建时只传脏模板）
+            include_common: 是否校验common_check_list
+        """
 
         # quality_tier是固定的枚举值(不在能力体系中定义)
         VALID_QUALITY_TIERS = ['basic', 'advanced', None]
@@ -396,15 +535,19 @@ class NovelSampleGenerator:
         warnings = []
 
         # 首先校验common_check_list（已经在__init__中加载到self.common_checks）
-        if self.common_checks:
+        if include_common and self.common_checks:
             for idx, check_item in enumerate(self.common_checks, 1):
                 check_id = check_item.get('check_id', f'common_check_{idx}')
                 self._validate_single_check('[common_check_list]', check_id, check_item,
                                            VALID_QUALITY_TIERS, errors, warnings)
 
         # 然后校验每个模板的check_list
+        validated_count = 0
         for template in self.scenario['user_need_templates']:
             template_id = template['need_template_id']
+            if template_ids is not None and template_id not in template_ids:
+                continue
+            validated_count += 1
             
             # 获取模板检查项（优先从check_definitions，回退到template内嵌）
             if self.check_definitions_dir and template_id in self.template_checks:
@@ -433,13 +576,18 @@ class NovelSampleGenerator:
             for warning in warnings:
                 print(f"  - {warning}")
 
-        print(f"✓ All checklist schemas validated successfully ({len(self.scenario['user_need_templates'])} templates)")
+        print(f"✓ All checklist schemas validated successfully ({validated_count} templates)")
 
 
     def generate_samples(self):
         """生成所有样本"""
-        samples = []
+        return [
+            self._build_sample(template, query_item, idx)
+            for template, query_item, idx in self._iter_sample_specs()
+        ]
 
+    def _iter_sample_specs(self):
+        """按模板顺序遍历 (template, query_item, idx)，应用样本数量限制"""
         for template in self.scenario['user_need_templates']:
             template_id = template['need_template_id']
             query_pool_id = template['query_pool_id']
@@ -476,10 +624,174 @@ class NovelSampleGenerator:
 
             # 为每个query生成样本
             for idx, query_item in enumerate(queries, 1):
-                sample = self._build_sample(template, query_item, idx)
-                samples.append(sample)
+                yield template, query_item, idx
+
+    @staticmethod
+    def _hash_obj(obj):
+        """计算任意可JSON序列化对象的稳定hash"""
+        payload = json.dumps(obj, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
-        return samples
+    def _compute_input_hashes(self):
+        """计算所有构建输入的hash（增量构建的脏检查依据）
+
+        data_pools/judge_criteria按 (路径, 大小, mtime) 计算，避免每次读取全部文件内容。
+        """
+        env_files = []
+        for dir_name in ["data_pools", "judge_criteria"]:
+            scan_dir = self.base_dir / dir_name
+            if not scan_dir.exists():
+                continue
+            for filepath in sorted(scan_dir.rglob("*")):
+                if filepath.is_file():
+                    st = filepath.stat()
+                    env_files.append([str(filepath.relative_to(self.base_dir)), st.st_size, st.st_mtime_ns])
+
+        scenario_globals = {k: v for k, v in self.scenario.items() if k != 'user_need_templates'}
+        return {
+            "generator": hashlib.sha256(Path(__file__).read_bytes()).hexdigest(),
+            "scenario_globals": self._hash_obj(scenario_globals),
+            "system_prompt": self._hash_obj(self.system_prompt),
+            "taxonomy": self._hash_obj(self.capability_taxonomy),
+            "format_spec": self._hash_obj(self.sample_format_spec),
+            "common_checks": self._hash_obj(self.common_checks),
+            "environment": self._hash_obj(env_files),
+            "templates": {
+                t['need_template_id']: self._hash_obj(t) for t in self.scenario['user_need_templates']
+            },
+            "template_checks": {
+                tid: self._hash_obj(checks) for tid, checks in self.template_checks.items()
+            },
+        }
+
+    def _sample_fingerprint(self, hashes, template, query_item, idx, dedup_environment):
+        """单个样本的输入指纹：任一相关输入变化都会导致该样本重建"""
+        template_id = template['need_template_id']
+        return self._hash_obj([
+            hashes["generator"],
+            hashes["scenario_globals"],
+            hashes["system_prompt"],
+            hashes["common_checks"],
+            hashes["environment"],
+            hashes["templates"].get(template_id),
+            hashes["template_checks"].get(template_id),
+            self._hash_obj(query_item),
+            idx,
+            bool(dedup_environment),
+        ])
+
+    def build_incremental(self, output_path, dedup_environment=False):
+        """增量构建：只重建输入发生变化的样本，未变化的样本直接复用上次输出
+
+        构建缓存保存在输出目录的 .<stem>.build_cache.json（输入hash + 每个样本的指纹）。
+        没有任何样本变化时跳过JSONL/readable/viewer的重写。
+        """
+        output_file = self.base_dir / output_path
+        cache_file = output_file.parent / f".{output_file.stem}.build_cache.json"
+
+        cache = {}
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except Exception as e:
+                print(f"  Warning: Failed to load build cache: {e}")
+            if cache.get('version') != self.BUILD_CACHE_VERSION:
+                cache = {}
+        prev_inputs = cache.get('inputs', {})
+        prev_fingerprints = cache.get('samples', {})
+
+        stage_start = time.time()
+        hashes = self._compute_input_hashes()
+        self._record_stage("hash_inputs", "done", stage_start)
+
+        # 1. schema校验：taxonomy/spec/generator变化时全量校验，否则只校验变化的模板
+        stage_start = time.time()
+        full_validation = any(
+            prev_inputs.get(key) != hashes[key] for key in ("generator", "taxonomy", "format_spec")
+        )
+        if full_validation:
+            print("Validating checklist schemas...")
+            self.validate_checklist_schemas()
+            status = "full"
+        else:
+            dirty_templates = {
+                tid for tid, h in hashes["templates"].items()
+                if prev_inputs.get("templates", {}).get(tid) != h
+                or prev_inputs.get("template_checks", {}).get(tid) != hashes["template_checks"].get(tid)
+            }
+            include_common = prev_inputs.get("common_checks") != hashes["common_checks"]
+            if dirty_templates or include_common:
+                print(f"Validating checklist schemas ({len(dirty_templates)} changed templates)...")
+                self.validate_checklist_schemas(template_ids=dirty_templates, include_common=include_common)
+                status = f"{len(dirty_templates)} templates" + (" + common" if include_common else "")
+            else:
+                status = "cached"
+        self._record_stage("validate_checklist", status, stage_start)
+
+        # 2. 读取上次输出，供未变化的样本复用
+        stage_start = time.time()
+        previous = {}
+        if prev_fingerprints and output_file.exists():
+            with open(output_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        sample = json.loads(line)
+                        previous[sample['data_id']] = sample
+        self._record_stage("load_previous", f"{len(previous)} samples", stage_start)
+
+        # 3. 逐样本比对指纹，只重建脏样本
+        samples = []
+        fingerprints = {}
+        rebuilt = []
+        build_seconds = 0.0
+        for template, query_item, idx in self._iter_sample_specs():
+            data_id = f"{template['need_template_id']}_{idx:03d}"
+            fingerprint = self._sample_fingerprint(hashes, template, query_item, idx, dedup_environment)
+            fingerprints[data_id] = fingerprint
+            if prev_fingerprints.get(data_id) == fingerprint and data_id in previous:
+                samples.append(previous[data_id])
+                continue
+
+            if self.environment is None:
+                print("Building common environment...")
+                stage_start = time.time()
+                self.environment = self._build_common_environment()
+                self._record_stage("build_environment", "done", stage_start)
+
+            sample_start = time.time()
+            samples.append(self._build_sample(template, query_item, idx))
+            build_seconds += time.time() - sample_start
+            rebuilt.append(data_id)
+        self.build_graph.append(("build_samples", f"{len(rebuilt)}/{len(samples)} rebuilt", build_seconds))
+
+        removed = sorted(set(previous) - set(fingerprints))
+        for data_id in rebuilt:
+            print(f"  rebuilt: {data_id}")
+        for data_id in removed:
+            print(f"  removed: {data_id}")
+
+        # 4. 写出结果（无变化时跳过）
+        stage_start = time.time()
+        if not rebuilt and not removed and output_file.exists():
+            print(f"\n✓ {output_file} is up to date ({len(samples)} samples)")
+            self._record_stage("write_outputs", "up-to-date", stage_start)
+        else:
+            if not self.validate_samples(samples):
+                print("\n✗ Sample validation failed")
+                return 1
+            self.save_samples(samples, output_path, dedup_environment=dedup_environment)
+            self._record_stage("write_outputs", "written", stage_start)
+
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": self.BUILD_CACHE_VERSION,
+                "inputs": hashes,
+                "samples": fingerprints,
+            }, f, ensure_ascii=False, indent=2)
+
+        self.print_build_graph()
+        return 0
 
     def _build_sample(self, template, query_item, idx):
         """构建单个样本"""
@@ -599,6 +911,9 @@ class NovelSampleGenerator:
                     # 只有当tool_name不包含__时才加前缀（避免重复加）
                     if '__' not in tool_name:
                         check_item['params']['tool_name'] = f"{server_name}__{tool_name}"
+            # tool_call_order：给每条断言中事件的tool_name加上server前缀
+            if item['check_type'] == 'tool_call_order' and server_name:
+                _prefix_order_assertion_tools(check_item['params'], server_name)
 
             # 添加description（优先使用check_name）
             if 'check_name' in item:
@@ -609,7 +924,7 @@ class NovelSampleGenerator:
             # 保留所有其他字段（用于checker scoring），但跳过check_id（稍后统一编号）
             optional_fields = [
                 'dimension_id', 'subcategory_id', 'quality_tier',
-                'weight', 'is_critical'
+                'weight', 'is_critical', 'depends_on'
             ]
             for field in optional_fields:
                 if field in item:
@@ -638,6 +953,9 @@ class NovelSampleGenerator:
                     # 只有当tool_name不包含__时才加前缀（避免重复加）
                     if '__' not in tool_name:
                         check_item['params']['tool_name'] = f"{server_name}__{tool_name}"
+            # tool_call_order：给每条断言中事件的tool_name加上server前缀
+            if item['check_type'] == 'tool_call_order' and server_name:
+                _prefix_order_assertion_tools(check_item['params'], server_name)
 
             # 识别字数检查项并注入动态范围
             is_word_count_check = False
@@ -682,7 +1000,7 @@ class NovelSampleGenerator:
             # 保留所有其他字段（用于checker scoring），但跳过check_id（稍后统一编号）
             optional_fields = [
                 'dimension_id', 'subcategory_id', 'quality_tier',
-                'weight', 'is_critical'
+                'weight', 'is_critical', 'depends_on'
             ]
             for field in optional_fields:
                 if field in item:
@@ -766,13 +1084,71 @@ class NovelSampleGenerator:
             json.dump(meta, f, ensure_ascii=False, indent=2)
         print(f"✓ Written revision metadata → {meta_file}")
 
-    def save_samples(self, samples, output_path):
-        """保存样本为JSONL格式，同时生成可读版本和HTML查看器"""
+    def _dedup_environment(self, samples, blob_dir):
+        """将environment中的文件内容写入内容寻址的blob存储，样本中只保留引用
+
+        blob_dir/<sha256>: 文件原始字节（binary类型为base64解码后的字节）
+        样本environment条目变为 {path, type, blob, size}，由部署方（extract_bench_from_sample.py）
+        按blob还原。所有样本共享的environment只计算一次，相同内容只存一份。
+        """
+        import base64
+        import hashlib
+
+        blob_dir = Path(blob_dir)
+        blob_dir.mkdir(parents=True, exist_ok=True)
+
+        deduped_envs = {}
+        blob_count = 0
+        raw_size = 0
+        deduped = []
+        for sample in samples:
+            env = sample.get('environment', [])
+            if id(env) not in deduped_envs:
+                refs = []
+                for entry in env:
+                    # 已是blob引用（增量构建复用的旧样本）
+                    if 'blob' in entry:
+                        refs.append(entry)
+                        continue
+                    if entry.get('type') == 'binary':
+                        data = base64.b64decode(entry['content'])
+                    else:
+                        data = entry['content'].encode('utf-8')
+                    digest = hashlib.sha256(data).hexdigest()
+                    blob_file = blob_dir / digest
+                    if not blob_file.exists():
+                        with open(blob_file, 'wb') as f:
+                            f.write(data)
+                        blob_count += 1
+                    raw_size += len(data)
+                    refs.append({
+                        "path": entry['path'],
+                        "type": entry['type'],
+                        "blob": digest,
+                        "size": len(data)
+                    })
+                deduped_envs[id(env)] = refs
+            new_sample = dict(sample)
+            new_sample['environment'] = deduped_envs[id(env)]
+            deduped.append(new_sample)
+
+        print(f"✓ Deduplicated environment: {len(deduped_envs)} distinct environment(s), "
+              f"{raw_size / 1024:.0f}KB content, {blob_count} new blob(s) → {blob_dir}")
+        return deduped
+
+    def save_samples(self, samples, output_path, dedup_environment=False):
+        """保存样本为JSONL格式，同时生成可读版本和HTML查看器
+
+        dedup_environment=True时，environment文件内容写入输出目录下的blobs/，样本只保留blob引用。
+        """
         import base64
 
         output_file = self.base_dir / output_path
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
+        if dedup_environment:
+            samples = self._dedup_environment(samples, output_file.parent / 'blobs')
+
         # 保存JSONL格式（用于评测）
         with open(output_file, 'w', encoding='utf-8') as f:
             for sample in samples:
@@ -1115,12 +1491,21 @@ def main():
     parser = argparse.ArgumentParser(description='生成小说创作场景评测样本')
     parser.add_argument('--output', '-o', default='samples/eval_dsv2.jsonl',
                         help='输出文件路径 (默认: samples/eval_dsv2.jsonl)')
+    parser.add_argument('--dedup-environment', action='store_true',
+                        help='environment文件按内容hash存入输出目录下的blobs/，样本中只保留引用'
+                             '（部署时由extract_bench_from_sample.py还原）')
+    parser.add_argument('--incremental', action='store_true',
+                        help='增量构建：按输入hash只重建变化的样本，并打印build graph')
     parser.add_argument('--export-check-revision', metavar='DIR',
                         help='仅导出评测方案到指定 revision 目录（不生成完整样本）。'
                              '示例: --export-check-revision check_revisions/rev_002')
     args = parser.parse_args()
 
     # 使用当前目录作为base_dir
+    if args.incremental and not args.export_check_revision:
+        generator = NovelSampleGenerator(".", incremental=True)
+        return generator.build_incremental(args.output, dedup_environment=args.dedup_environment)
+
     generator = NovelSampleGenerator(".")
 
     # 生成样本（两种模式都需要先生成内存中的样本以构建 checklist）
@@ -1136,7 +1521,7 @@ def main():
         generator.export_check_revision(samples, args.export_check_revision)
     else:
         # 完整样本生成模式
-        generator.save_samples(samples, args.output)
+        generator.save_samples(samples, args.output, dedup_environment=args.dedup_environment)
 
     return 0
 
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+角色出场扫描
+============
+
+把所有角色名/别名编译成一个trie结构的正则（前缀共享，最长匹配优先），
+每个章节只扫描一遍即可得到所有角色的出现次数，不再拼接全文、逐个角色 `name in text`。
+overlapping=True 时每个位置上所有能匹配的称呼都计数（与 `name in text` 语义一致：
+"李明华"同时计入 李明 / 李明华 / 明华），用于"角色是否出现"这类通过/不通过检查。
+
+输出：
+- 每个角色的总出现次数、出场章节数、首次/最后出场章节
+- 章节 × 角色 的出现次数矩阵（供"主角中途消失"等程序化检查使用）
+- characters.json之外的高频人名（供"新角色喧宾夺主"检查使用）
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 常见单字姓氏（用于从正文中提取未设计的高频人名）
+COMMON_SURNAMES = (
+    "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁"
+    "任沈姚卢姜崔钟谭陆汪范金石廖贾夏韦付方白邹孟熊秦邱江尹薛闫段雷侯龙史陶黎贺顾毛郝龚邵万钱严覃武戴"
+    "莫孔向汤温易常康乔柳楚萧裴洛沐闻傅宁凌霍祁"
+)
+# 以姓氏字开头的常见非人名词
+_NAME_STOPWORDS = {
+    "高声", "高兴", "高大", "江湖", "方向", "方才", "于是", "常常", "万一", "白色", "金色", "温柔", "史上",
+    "王爷", "王妃", "龙头", "石头", "程度", "任何", "任由", "余光", "叶子", "黎明", "宁可", "向来", "向前",
+    "严肃", "孔雀", "易于", "康复", "毛骨", "田野", "夏天", "秦始", "许多", "许久", "马上", "周围",
+    "何时", "何况", "何必", "曾经", "林子", "陈旧", "杨柳", "黄色", "黄昏", "朱红", "胡乱", "罗盘", "谢谢",
+    "唐突", "常年", "付出", "钱财", "苏醒", "雷声", "温暖", "万分", "丁点",
+}
+# 复姓（三字复姓名的后两字不是名，不作为简称）
+COMPOUND_SURNAMES = {
+    "欧阳", "司马", "上官", "诸葛", "东方", "慕容", "令狐", "皇甫", "尉迟", "公孙", "长孙", "宇文", "独孤",
+    "南宫", "西门", "夏侯", "轩辕", "端木", "司徒", "百里", "呼延", "澹台", "拓跋", "闻人", "申屠", "钟离",
+    "太史", "赫连", "万俟", "东郭", "公冶", "濮阳", "淳于", "单于", "仲孙", "左丘", "第五",
+}
+# 出现在名字位置上的动作/副词/助词：归属语境正则会把它们吞进候选名（"赵四笑道" → 赵四笑）
+_NAME_TRAILING_CHARS = set(
+    "说道笑问看想喊叫点摇皱叹低冷轻转站"
+    "又也就却便正忽突微不都还才已再连只仍竟猛缓淡苦沉怒惊哼"
+    "的了着地得和与跟对向把被在"
+)
+_CJK = "\u4e00-\u9fff"
+# 对话/动作归属语境：姓氏 + 1~2字 + 说/道/笑/问/看...
+_NAME_CONTEXT_RE = re.compile(
+    f"([{COMMON_SURNAMES}][{_CJK}]{{1,2}})(?=说|道|笑|问|看|想|喊|叫|点头|摇头|皱眉|叹|低声|冷声|轻声|转身|站)"
+)
+
+
+def _build_trie(words: Iterable[str]) -> Dict:
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return trie
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """把一组字面量编译成trie结构的正则（贪婪可选后缀 → 最长匹配优先）"""
+    trie = _build_trie(words)
+
+    def _build(node):
+        is_end = "" in node
+        branches = []
+        for ch in sorted(k for k in node if k):
+            branches.append(re.escape(ch) + _build(node[ch]))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if is_end:
+            return "(?:" + body + ")?"
+        return body
+
+    return _build(trie)
+
+
+class CharacterMatcher:
+    """多角色名单次扫描匹配器
+
+    Args:
+        aliases: 角色名 → 该角色的所有称呼（含本名）。同一称呼属于多个角色时，每个角色都计数。
+        overlapping: False 时不重叠、最长匹配（同一角色的全名与简称不重复计数）；
+            True 时统计每个称呼的全部出现（含被更长称呼包含的出现）
+    """
+
+    def __init__(self, aliases: Dict[str, List[str]], overlapping: bool = False):
+        self.characters = list(aliases)
+        self._owners: Dict[str, List[str]] = {}
+        for character, forms in aliases.items():
+            for form in forms:
+                if form:
+                    owners = self._owners.setdefault(form, [])
+                    if character not in owners:
+                        owners.append(character)
+        self.overlapping = overlapping
+        self._regex = None
+        if self._owners and overlapping:
+            # 只在称呼首字处沿trie逐字匹配，收集该位置上所有完整称呼
+            self._trie = _build_trie(self._owners)
+            self._regex = re.compile("[" + "".join(re.escape(ch) for ch in sorted(self._trie)) + "]")
+        elif self._owners:
+            self._regex = re.compile(_trie_regex(self._owners))
+
+    def count(self, text: str) -> Dict[str, int]:
+        """统计每个角色在text中的出现次数"""
+        counts = {character: 0 for character in self.characters}
+        if self._regex is None or not text:
+            return counts
+        if self.overlapping:
+            for m in self._regex.finditer(text):
+                node = self._trie
+                start = end = m.start()
+                while end < len(text) and text[end] in node:
+                    node = node[text[end]]
+                    end += 1
+                    if "" in node:
+                        for character in self._owners[text[start:end]]:
+                            counts[character] += 1
+            return counts
+        for m in self._regex.finditer(text):
+            form = m.group()
+            if not form:
+                continue
+            for character in self._owners.get(form, ()):
+                counts[character] += 1
+        return counts
+
+
+def scan_presence(matcher: CharacterMatcher, chapters: Iterable[Tuple[str, str]]) -> Dict:
+    """逐章扫描角色出场情况
+
+    Args:
+        matcher: 角色匹配器
+        chapters: 按章节顺序的 (章节名, 章节文本) 可迭代对象（可以是逐个读取文件的生成器）
+
+    Returns:
+        {
+          "chapters": [章节名, ...],
+          "matrix": {角色: [每章出现次数, ...]},
+          "characters": {角色: {count, chapters_present, first_chapter, last_chapter,
+                                first_index, last_index}}
+        }
+    """
+    chapter_names: List[str] = []
+    matrix: Dict[str, List[int]] = {character: [] for character in matcher.characters}
+
+    for chapter_name, text in chapters:
+        chapter_names.append(chapter_name)
+        counts = matcher.count(text)
+        for character in matcher.characters:
+            matrix[character].append(counts[character])
+
+    summary = {}
+    for character, row in matrix.items():
+        present = [i for i, c in enumerate(row) if c > 0]
+        first_index: Optional[int] = present[0] if present else None
+        last_index: Optional[int] = present[-1] if present else None
+        summary[character] = {
+            "count": sum(row),
+            "chapters_present": len(present),
+            "first_chapter": chapter_names[first_index] if first_index is not None else None,
+            "last_chapter": chapter_names[last_index] if last_index is not None else None,
+            "first_index": first_index,
+            "last_index": last_index,
+        }
+
+    return {
+        "chapters": chapter_names,
+        "matrix": matrix,
+        "characters": summary,
+    }
+
+
+def character_aliases(character: Dict) -> List[str]:
+    """角色的所有称呼：本名 + 显式别名字段 + 三字中文名的名（如 林晚晴 → 晚晴；复姓名如 欧阳锋 除外）"""
+    name = character.get("name", "") if isinstance(character, dict) else ""
+    if not name:
+        return []
+    forms = [name]
+    for key in ("aliases", "alias", "nickname", "nicknames"):
+        value = character.get(key)
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, list):
+            forms.extend(v for v in value if isinstance(v, str) and v)
+    if len(name) == 3 and all("\u4e00" <= ch <= "\u9fff" for ch in name) and name[:2] not in COMPOUND_SURNAMES:
+        forms.append(name[1:])
+    return list(dict.fromkeys(forms))
+
+
+def extract_frequent_names(texts: Iterable[str], exclude: Iterable[str], top_k: int = 5,
+                           min_count: int = 5) -> List[str]:
+    """从对话/动作归属语境中提取高频人名（排除已设计角色的称呼）
+
+    启发式：常见姓氏开头、后接"说/道/笑/问/看..."的2~3字片段。
+    名字末尾吞进的动作/副词/助词会被去掉（"赵四笑道" → 赵四），只剩姓氏时丢弃；
+    与任一已设计称呼互相包含的候选会被排除（避免把主角名的变体当成新角色）。
+    """
+    exclude = [e for e in exclude if e]
+    counter = Counter()
+    for text in texts:
+        for candidate in _NAME_CONTEXT_RE.findall(text):
+            while len(candidate) > 1 and candidate[-1] in _NAME_TRAILING_CHARS:
+                candidate = candidate[:-1]
+            if len(candidate) > 1:
+                counter[candidate] += 1
+
+    names = []
+    for candidate, count in counter.most_common():
+        if count < min_count or len(names) >= top_k:
+            break
+        if candidate in _NAME_STOPWORDS or candidate[:2] in _NAME_STOPWORDS:
+            continue
+        if any(candidate in form or form in candidate for form in exclude):
+            continue
+        if any(candidate in kept or kept in candidate for kept in names):
+            continue
+        names.append(candidate)
+    return names
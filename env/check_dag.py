@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+检查项依赖DAG
+=============
+
+checklist中的检查项按依赖关系组成DAG执行：
+- 前置条件失败时，依赖它的检查项直接产出 dependency_failure 结果，不再执行
+  （例如 章节产出存在性 Gate 判定执行崩坏后，所有针对章节正文的LLM评审都不再调用）
+- 互不依赖的分支可以并发执行（max_workers > 1）
+
+依赖来源：
+1. 显式声明：检查项顶层 depends_on: [check_id, ...]，任一前置失败即跳过
+2. 自动推断：由 analysis_target / target_id / file_pattern 推断出检查项读取的文件，
+   与"文件前置检查"（sop_stage_coverage Gate、attribute_key=exists 的存在性检查）产出的文件匹配；
+   检查项的所有目标文件都已确认缺失时才跳过（多文件目标只缺一部分时仍正常执行）
+3. 执行顺序：配对检查项（paired_check_id）中后出现的一方等待先出现的一方完成，
+   以复用共享的LLM结果（仅约束顺序，不传播失败）
+
+短路结果：
+- 前置失败由 execution_collapsed（Gate执行崩坏）触发时，依赖项记为 fail（与在空workspace上执行的
+  结果一致，评分不变）
+- 显式 depends_on 的前置失败记为 skip（与各checker内部的 dependency_failure 约定一致）
+- 仅由推断的文件前置失败（目标文件缺失）时不短路，照常执行：各checker对缺失文件直接返回
+  fail "未找到匹配文件"，不调用LLM；若记为 skip 会从评分分母中去掉，缺文件的样本反而得分更高
+"""
+
+import contextvars
+import fnmatch
+import heapq
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 读取文件路径的参数字段
+TARGET_PARAM_KEYS = ("analysis_target", "target_id", "file_pattern")
+
+
+class CheckNode:
+    """DAG中的一个检查项"""
+
+    def __init__(self, check_id: str, position: int, item: Dict):
+        self.check_id = check_id
+        self.position = position          # check_list中的位置（从1开始）
+        self.item = item
+        self.explicit: List[str] = []     # 显式依赖：任一失败即跳过
+        self.inferred: List[List[str]] = []  # 推断依赖：每个目标文件对应的前置检查列表，全部目标缺失才跳过
+        self.after: List[str] = []        # 仅约束执行顺序
+
+    @property
+    def upstream(self) -> List[str]:
+        ids = list(self.explicit) + [p for group in self.inferred for p in group] + list(self.after)
+        return list(dict.fromkeys(ids))
+
+
+def _normalize_path(path: str) -> str:
+    path = path.strip()
+    if path.startswith("workspace/"):
+        path = path[len("workspace/"):]
+    return path
+
+
+def check_targets(item: Dict) -> List[str]:
+    """检查项读取的文件（"a + b" 形式拆分为多个目标，统一去掉 workspace/ 前缀）"""
+    params = item.get("params", {}) or {}
+    for key in TARGET_PARAM_KEYS:
+        value = params.get(key)
+        if isinstance(value, str) and value.strip():
+            return [_normalize_path(part) for part in value.split("+") if part.strip()]
+    return []
+
+
+def produced_paths(item: Dict) -> List[str]:
+    """文件前置检查确认存在的文件；不是文件前置检查时返回空列表"""
+    params = item.get("params", {}) or {}
+    check_type = item.get("check_type")
+    if check_type == "sop_stage_coverage":
+        collapse_threshold = params.get("collapse_threshold", "chapter_writing")
+        for stage in params.get("required_stages", []):
+            if stage.get("stage_id") == collapse_threshold:
+                pattern = stage.get("evidence", {}).get("dir_has_files")
+                if pattern:
+                    return [_normalize_path(pattern)]
+        return ["chapters/chapter_*.md"]
+    if (check_type == "entity_attribute_equals" and params.get("attribute_key") == "exists"
+            and params.get("expected_value") is True and isinstance(params.get("target_id"), str)):
+        return [_normalize_path(params["target_id"])]
+    return []
+
+
+def _path_covers(produced: str, target: str) -> bool:
+    """produced 缺失时 target 是否必然缺失"""
+    if produced == target or fnmatch.fnmatch(target, produced):
+        return True
+    # 目录：workspace/chapters/ 缺失 → chapters/chapter_*.md 缺失
+    if produced.endswith("/") and target.startswith(produced):
+        return True
+    # 目录下的文件模式：chapters/chapter_*.md 缺失 → 以 chapters/ 为目标的检查没有可读内容
+    if target.endswith("/") and produced.startswith(target):
+        return True
+    return False
+
+
+def build_check_dag(check_list: List[Dict]) -> Tuple[Dict[str, CheckNode], List[str]]:
+    """构建依赖DAG
+
+    Returns:
+        (check_id → CheckNode, 警告信息列表)
+    """
+    nodes: Dict[str, CheckNode] = {}
+    for i, item in enumerate(check_list, 1):
+        check_id = item.get("check_id", f"检查项{i}")
+        nodes[check_id] = CheckNode(check_id, i, item)
+    warnings: List[str] = []
+
+    producers = {check_id: produced_paths(node.item) for check_id, node in nodes.items()}
+    producers = {check_id: paths for check_id, paths in producers.items() if paths}
+
+    for check_id, node in nodes.items():
+        depends_on = node.item.get("depends_on") or []
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        for dep in depends_on:
+            if dep == check_id:
+                continue
+            if dep not in nodes:
+                warnings.append(f"{check_id}: depends_on 引用了不存在的检查项 {dep}")
+                continue
+            node.explicit.append(dep)
+
+        # 文件前置检查本身不再推断依赖
+        if check_id not in producers and not node.item.get("no_inferred_dependencies"):
+            targets = check_targets(node.item)
+            groups = []
+            for target in targets:
+                group = [pid for pid, paths in producers.items()
+                         if any(_path_covers(path, target) for path in paths)]
+                if not group:
+                    groups = []
+                    break
+                groups.append(group)
+            node.inferred = groups
+
+    # 配对检查项：后出现的一方等待先出现的一方
+    for check_id, node in nodes.items():
+        paired = (node.item.get("params", {}) or {}).get("paired_check_id")
+        if paired in nodes and nodes[paired].position < node.position:
+            node.after.append(paired)
+
+    # 环检测：出现环时丢弃环上节点的依赖（退化为按顺序执行），避免死锁
+    state: Dict[str, int] = {}
+
+    def _visit(check_id: str, path: List[str]) -> None:
+        state[check_id] = 1
+        for dep in nodes[check_id].upstream:
+            if state.get(dep) == 1:
+                cycle = path[path.index(dep):] + [dep] if dep in path else [check_id, dep]
+                warnings.append(f"依赖成环，已忽略环上依赖: {' → '.join(cycle)}")
+                for member in cycle:
+                    nodes[member].explicit, nodes[member].inferred, nodes[member].after = [], [], []
+            elif state.get(dep) is None:
+                _visit(dep, path + [dep])
+        state[check_id] = 2
+
+    for check_id in nodes:
+        if state.get(check_id) is None:
+            _visit(check_id, [check_id])
+
+    return nodes, warnings
+
+
+def _is_failed(result: Dict) -> bool:
+    return (result.get("check_result") == "fail" or bool(result.get("dependency_failure"))
+            or bool(result.get("_is_dependency_failure")))
+
+
+def _is_collapsed(result: Dict) -> bool:
+    return bool(result.get("execution_collapsed") or result.get("collapsed_dependency"))
+
+
+def blocking_preconditions(node: CheckNode, results: Dict[str, Dict]) -> List[str]:
+    """返回导致该检查项无法执行的前置检查项（空列表表示可以执行）"""
+    blocked = [dep for dep in node.explicit if _is_failed(results[dep])]
+    if node.inferred:
+        missing = []
+        for group in node.inferred:
+            failed = [p for p in group if _is_failed(results[p])]
+            if not failed:
+                missing = []
+                break
+            missing.extend(failed)
+        blocked.extend(p for p in missing if p not in blocked)
+    return blocked
+
+
+def dependency_failure_result(node: CheckNode, blocked_by: List[str], results: Dict[str, Dict],
+                              make_result: Callable[[str, str, str], Dict]) -> Optional[Dict]:
+    """前置失败时的检查结果（make_result 即 create_check_item_result）
+
+    只由推断的文件前置失败阻塞时返回None：照常执行，由checker给出与无DAG时相同的 fail 结果
+    """
+    collapsed = [dep for dep in blocked_by if _is_collapsed(results[dep])]
+    if collapsed:
+        details = "; ".join(f"{dep}: {results[dep].get('reason', '')}" for dep in blocked_by)
+        result = make_result("fail", f"前置条件失败（执行崩坏: {', '.join(collapsed)}）", details)
+        result["collapsed_dependency"] = True
+    else:
+        blocked_by = [dep for dep in blocked_by if dep in node.explicit]
+        if not blocked_by:
+            return None
+        details = "; ".join(f"{dep}: {results[dep].get('reason', '')}" for dep in blocked_by)
+        result = make_result("skip", f"前置条件失败（{', '.join(blocked_by)}）", details)
+    result["dependency_failure"] = True
+    result["blocked_by"] = blocked_by
+    return result
+
+
+def run_check_dag(nodes: Dict[str, CheckNode], priority: List[str],
+                  run_check: Callable[[CheckNode], Dict],
+                  on_blocked: Optional[Callable[[CheckNode, List[str], Dict[str, Dict]], Dict]] = None,
+                  max_workers: int = 1, precomputed: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+    """按依赖关系执行检查项
+
+    Args:
+        nodes: build_check_dag 的结果
+        priority: 就绪检查项的执行优先顺序（check_id列表）
+        run_check: 执行单个检查项，返回结果
+        on_blocked: 前置失败时生成结果 (node, blocked_by, results) → result；None 表示不短路，照常执行
+        max_workers: 并发数，1 表示按priority顺序串行执行
+        precomputed: 已经执行过的检查项结果（不再重复执行）
+
+    Returns:
+        check_id → result
+    """
+    rank = {check_id: r for r, check_id in enumerate(priority)}
+    remaining = {check_id: set(node.upstream) for check_id, node in nodes.items()}
+    downstream: Dict[str, List[str]] = {check_id: [] for check_id in nodes}
+    for check_id, deps in remaining.items():
+        for dep in deps:
+            downstream[dep].append(check_id)
+
+    results: Dict[str, Dict] = dict(precomputed or {})
+    lock = threading.Lock()
+    ready: List[Tuple[int, str]] = []
+
+    def _release(check_id: str) -> None:
+        for child in downstream[check_id]:
+            remaining[child].discard(check_id)
+            if not remaining[child] and child not in results:
+                heapq.heappush(ready, (rank.get(child, len(rank)), child))
+
+    for check_id, deps in remaining.items():
+        if not deps and check_id not in results:
+            heapq.heappush(ready, (rank.get(check_id, len(rank)), check_id))
+    for check_id in list(results):
+        _release(check_id)
+
+    def _resolve(check_id: str) -> Optional[Dict]:
+        """前置失败的检查项直接出结果；可以执行时返回None"""
+        if on_blocked is None:
+            return None
+        node = nodes[check_id]
+        with lock:
+            blocked_by = blocking_preconditions(node, results)
+            if not blocked_by:
+                return None
+            snapshot = dict(results)
+        return on_blocked(node, blocked_by, snapshot)
+
+    if max_workers <= 1:
+        while ready:
+            _, check_id = heapq.heappop(ready)
+            result = _resolve(check_id)
+            results[check_id] = result if result is not None else run_check(nodes[check_id])
+            _release(check_id)
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="check") as pool:
+        running = {}
+        while ready or running:
+            while ready and len(running) < max_workers:
+                _, check_id = heapq.heappop(ready)
+                result = _resolve(check_id)
+                if result is not None:
+                    with lock:
+                        results[check_id] = result
+                    _release(check_id)
+                    continue
+                # 在调用方的contextvars上下文中执行（批量编排器按样本路由输出）
+                context = contextvars.copy_context()
+                running[pool.submit(context.run, run_check, nodes[check_id])] = check_id
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                check_id = running.pop(future)
+                result = future.result()
+                with lock:
+                    results[check_id] = result
+                _release(check_id)
+    return results
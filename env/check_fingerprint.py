@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+检查项输入指纹（增量recheck）
+============================
+
+每个检查项的结果只取决于它读取的输入：
+- files:        读取的workspace文件内容hash（由 analysis_target / target_id / file_pattern 等推断）
+- criteria:     检查项params + judge标准文本 + judge模型
+- conversation: 读取的对话片段hash（工具调用类检查只取相关工具的调用，response类语义检查取整段对话）
+
+指纹保存在 check_result_revNNN.json 旁边的 fingerprints_revNNN.json 中（不匹配 check_result*.json，
+避免被当作检查结果读取），只在 checker.py --incremental 时读写：首次增量运行全量执行并写出指纹，
+之后只执行指纹发生变化（或没有历史结果）的检查项，其余直接复用。
+上次judge调用失败、检查过程异常的结果是临时性的，即使指纹未变也重新执行。
+
+文件hash：优先复用 workspace/.stats.json 中size/mtime一致的条目（md5，与直接读取文件计算的结果相同），
+同一个文件在一个样本内只计算一次。文件范围的推断偏保守：目标是通配模式时hash整个所在目录，
+精确文件名同时覆盖嵌套的 workspace/workspace/ 路径和同名不同扩展名的文件（与checker的容错匹配一致）。
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from check_dag import check_targets, produced_paths
+from checker_execute import load_judge_criteria_from_params
+from tool_call_index import ToolCallIndex
+from workspace_stats import STATS_FILENAME, load_stats
+
+FINGERPRINT_VERSION = 1
+FINGERPRINT_PREFIX = "fingerprints"
+LEGACY_FINGERPRINT_SUFFIX = ".fingerprints.json"   # 旧文件名 check_result_revNNN.fingerprints.json
+
+# 不可复用的历史结果（reason 与 checker_execute 中的失败结果一致）：judge调用失败、检查过程异常
+NON_REUSABLE_REASONS = ("LLM调用失败", "LLM配置缺失", "检查失败", "程序化检查异常")
+
+# 只读取对话中工具调用的检查类型
+TOOL_CALL_CHECK_TYPES = ("tool_called_with_params", "tool_call_absence", "tool_call_order")
+
+
+def fingerprint_path(result_path) -> Path:
+    """check_result_revNNN.json → fingerprints_revNNN.json（check_result.json → fingerprints.json）"""
+    result_path = Path(result_path)
+    stem = result_path.stem
+    if stem.startswith("check_result"):
+        stem = FINGERPRINT_PREFIX + stem[len("check_result"):]
+    else:
+        stem = f"{FINGERPRINT_PREFIX}_{stem}"
+    return result_path.with_name(stem + ".json")
+
+
+def legacy_fingerprint_path(result_path) -> Path:
+    result_path = Path(result_path)
+    return result_path.with_name(result_path.stem + LEGACY_FINGERPRINT_SUFFIX)
+
+
+def is_reusable_result(result) -> bool:
+    """历史结果能否在指纹未变时直接复用（judge调用失败、检查异常的结果需要重新执行）"""
+    if not isinstance(result, dict) or result.get("error"):
+        return False
+    return result.get("reason") not in NON_REUSABLE_REASONS
+
+
+def _digest(obj) -> str:
+    payload = json.dumps(obj, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class WorkspaceHasher:
+    """workspace文件内容hash（每个文件只计算一次）"""
+
+    def __init__(self, workspace_dir):
+        self.workspace_dir = Path(workspace_dir)
+        self._stats = load_stats(self.workspace_dir)["files"]
+        self._cache: Dict[str, Optional[str]] = {}
+
+    def file_hash(self, rel_path: str) -> Optional[str]:
+        """相对workspace的文件hash，文件不存在时为None"""
+        if rel_path in self._cache:
+            return self._cache[rel_path]
+        full_path = self.workspace_dir / rel_path
+        value = None
+        try:
+            st = full_path.stat()
+            entry = self._stats.get(rel_path)
+            if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                value = entry.get("hash")
+            else:
+                with open(full_path, "rb") as f:
+                    value = hashlib.md5(f.read()).hexdigest()
+        except OSError:
+            value = None
+        self._cache[rel_path] = value
+        return value
+
+    def _walk(self, rel_dir: str) -> List[str]:
+        base = self.workspace_dir / rel_dir if rel_dir else self.workspace_dir
+        if not base.is_dir():
+            return []
+        found = []
+        for root, dirs, names in os.walk(base):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+            for name in sorted(names):
+                if name in (STATS_FILENAME, STATS_FILENAME + ".tmp"):
+                    continue
+                found.append((Path(root) / name).relative_to(self.workspace_dir).as_posix())
+        return found
+
+    def target_files(self, target: str) -> Dict[str, Optional[str]]:
+        """目标模式覆盖的文件 → hash"""
+        target = target.strip().lstrip("/")
+        if target in ("", ".", "workspace"):
+            return self.workspace_files()
+        files: Dict[str, Optional[str]] = {}
+        for prefix in ("", "workspace/"):
+            pattern = prefix + target
+            directory, _, name = pattern.rstrip("/").rpartition("/")
+            if pattern.endswith("/") or any(ch in name for ch in "*?["):
+                # 目录或通配模式：hash整个目录（覆盖checker的灵活文件名匹配）
+                rel_dir = pattern.rstrip("/") if pattern.endswith("/") else directory
+                for rel_path in self._walk(rel_dir):
+                    files[rel_path] = self.file_hash(rel_path)
+            else:
+                files[pattern] = self.file_hash(pattern)
+                # 扩展名不一致的容错（如 outline.txt）
+                stem = name.rsplit(".", 1)[0]
+                parent = self.workspace_dir / directory if directory else self.workspace_dir
+                if parent.is_dir():
+                    for sibling in sorted(parent.glob(stem + ".*")):
+                        rel_path = sibling.relative_to(self.workspace_dir).as_posix()
+                        if sibling.is_file() and rel_path not in files:
+                            files[rel_path] = self.file_hash(rel_path)
+        # 不存在的嵌套路径不记录（避免无意义的None条目）
+        return {k: v for k, v in files.items() if v is not None or not k.startswith("workspace/")}
+
+    def workspace_files(self) -> Dict[str, Optional[str]]:
+        return {rel_path: self.file_hash(rel_path) for rel_path in self._walk("")}
+
+
+def _spec_tool_names(spec: Dict) -> Optional[List[str]]:
+    names = spec.get("tool_name") if isinstance(spec, dict) else None
+    if isinstance(names, str):
+        return [names]
+    if isinstance(names, list) and names:
+        return [n for n in names if isinstance(n, str)]
+    return None
+
+
+def _relevant_tool_names(check_item: Dict) -> Optional[List[str]]:
+    """工具调用类检查读取的工具名；None 表示读取全部调用"""
+    params = check_item.get("params", {}) or {}
+    check_type = check_item.get("check_type")
+    if check_type == "tool_called_with_params":
+        return [params.get("tool_name")]
+    if check_type == "tool_call_absence":
+        return list(params.get("forbidden_tools", []))
+    names: List[str] = []
+    for assertion in params.get("assertions", []):
+        for value in assertion.values() if isinstance(assertion, dict) else ():
+            if isinstance(value, dict):
+                spec_names = _spec_tool_names(value)
+                if spec_names is None:
+                    return None
+                names.extend(spec_names)
+    return names
+
+
+def _conversation_hash(check_item: Dict, tool_index: ToolCallIndex,
+                       conversation_history: List[Dict]) -> Optional[str]:
+    check_type = check_item.get("check_type")
+    params = check_item.get("params", {}) or {}
+    if check_type in TOOL_CALL_CHECK_TYPES:
+        names = _relevant_tool_names(check_item)
+        calls = tool_index.calls if names is None else sorted(
+            (call for name in set(names) for call in tool_index.calls_of(name)), key=lambda c: c.seq
+        )
+        return _digest([[call.name, call.arguments] for call in calls])
+    if check_type == "semantic_check" and "analysis_target" not in params:
+        # response类语义检查读取对话内容
+        return _digest(conversation_history)
+    return None
+
+
+def _file_hashes(check_item: Dict, hasher: WorkspaceHasher) -> Dict[str, Optional[str]]:
+    params = check_item.get("params", {}) or {}
+    check_type = check_item.get("check_type")
+    targets = check_targets(check_item) or produced_paths(check_item)
+
+    if check_type in TOOL_CALL_CHECK_TYPES:
+        # skip_if_file_not_exists 依赖目标文件是否存在
+        path = (params.get("expected_params") or {}).get("path")
+        if params.get("skip_if_file_not_exists") and path:
+            return {path: hasher.file_hash(path)}
+        return {}
+    if check_type == "file_whitelist_check" or params.get("required_files") or not targets:
+        return hasher.workspace_files()
+
+    files: Dict[str, Optional[str]] = {}
+    for target in targets:
+        files.update(hasher.target_files(target))
+    return dict(sorted(files.items()))
+
+
+def compute_fingerprints(check_list: List[Dict], sample_result: Dict,
+                         model_config: Optional[Dict] = None) -> Dict[str, Dict]:
+    """计算checklist中每个检查项的输入指纹
+
+    Returns:
+        check_id → {"files": {路径: hash}, "criteria": hash, "conversation": hash|None, "digest": hash}
+    """
+    workspace_path = Path(sample_result.get("workspace_path", ""))
+    work_dir = workspace_path.parent
+    conversation_history = sample_result.get("conversation_history", [])
+    tool_index = ToolCallIndex(conversation_history)
+    hasher = WorkspaceHasher(workspace_path)
+    judge = {
+        key: (model_config or {}).get(key)
+        for key in ("model_name", "prompt_layout", "cascade")
+    }
+    if judge.get("cascade"):
+        judge["cascade"] = {k: v for k, v in judge["cascade"].items() if k != "api_key"}
+
+    fingerprints: Dict[str, Dict] = {}
+    for i, check_item in enumerate(check_list, 1):
+        check_id = check_item.get("check_id", f"检查项{i}")
+        params = check_item.get("params", {}) or {}
+        criteria = {
+            "check_type": check_item.get("check_type"),
+            "params": params,
+            "criteria_text": load_judge_criteria_from_params(params, work_dir)
+            if params.get("llm_judge_criteria_file") else None,
+            "judge": judge if check_item.get("check_type") in ("semantic_check", "entity_attribute_equals") else None,
+            "depends_on": check_item.get("depends_on"),
+        }
+        fingerprint = {
+            "files": _file_hashes(check_item, hasher),
+            "criteria": _digest(criteria),
+            "conversation": _conversation_hash(check_item, tool_index, conversation_history),
+        }
+        fingerprint["digest"] = _digest(fingerprint)
+        fingerprints[check_id] = fingerprint
+
+    # 显式依赖：前置检查项的指纹变化也会影响结果
+    for i, check_item in enumerate(check_list, 1):
+        check_id = check_item.get("check_id", f"检查项{i}")
+        depends_on = check_item.get("depends_on") or []
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        upstream = [fingerprints[dep]["digest"] for dep in depends_on if dep in fingerprints]
+        if upstream:
+            fingerprints[check_id]["digest"] = _digest([fingerprints[check_id]["digest"], upstream])
+    return fingerprints
+
+
+def load_fingerprints(result_path) -> Dict[str, Dict]:
+    """读取结果文件旁的指纹文件（不存在或版本不符时返回空字典；兼容旧文件名）"""
+    path = fingerprint_path(result_path)
+    if not path.exists():
+        path = legacy_fingerprint_path(result_path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != FINGERPRINT_VERSION:
+        return {}
+    return data.get("checks", {})
+
+
+def save_fingerprints(result_path, sample_id: str, fingerprints: Dict[str, Dict]) -> Path:
+    path = fingerprint_path(result_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": FINGERPRINT_VERSION, "sample_id": sample_id, "checks": fingerprints},
+                  f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    # 旧文件名匹配 check_result*.json，会被viewer/统计脚本当作检查结果，写出新文件后删除
+    try:
+        legacy_fingerprint_path(result_path).unlink()
+    except FileNotFoundError:
+        pass
+    return path
+
+
+def diff_fingerprints(check_ids: Iterable[str], current: Dict[str, Dict], previous: Dict[str, Dict],
+                      existing_results: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """把检查项分为 reused / changed / new / retry 四类
+
+    reused:  指纹未变且已有结果
+    changed: 有历史指纹但发生变化
+    new:     没有历史指纹或没有历史结果
+    retry:   指纹未变，但历史结果是judge调用失败/检查异常（见 is_reusable_result）
+    """
+    split = {"reused": [], "changed": [], "new": [], "retry": []}
+    for check_id in check_ids:
+        old = previous.get(check_id)
+        if old is None or check_id not in existing_results:
+            split["new"].append(check_id)
+        elif old.get("digest") != current[check_id]["digest"]:
+            split["changed"].append(check_id)
+        elif not is_reusable_result(existing_results[check_id]):
+            split["retry"].append(check_id)
+        else:
+            split["reused"].append(check_id)
+    return split
+
+
+def changed_inputs(old: Dict, new: Dict) -> List[str]:
+    """指纹变化的原因（文件路径 / criteria / conversation），用于日志"""
+    reasons = []
+    old_files, new_files = old.get("files", {}), new.get("files", {})
+    for path in sorted(set(old_files) | set(new_files)):
+        if old_files.get(path) != new_files.get(path):
+            reasons.append(path)
+    for key in ("criteria", "conversation"):
+        if old.get(key) != new.get(key):
+            reasons.append(key)
+    return reasons or ["depends_on"]
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+check_result 紧凑存储格式
+=========================
+
+check_result_revNNN.json 的每个检查项都重复保存 description / dimension_id /
+subcategory_id / check_type，同一revision下不同样本的这些元数据大量相同。
+紧凑格式把它们提取到每个批次目录下的per-revision字典中，检查项只保留一个引用键：
+
+    <agent_results_dir>/
+        _check_meta/check_meta_rev004.json     # {meta_key: {description, dimension_id, ...}}
+        NW_001_env/check_result_rev004.json    # check_details[*] = {"meta": meta_key, "check_result": ...}
+
+- meta_key 是元数据内容的短哈希，相同元数据在所有样本间共享同一条
+- 紧凑格式的 check_result 顶层带 "check_meta_file"（相对该文件的字典路径），
+  读取时由 load_check_result() 还原为与明文格式完全相同的结构
+- 明文与紧凑格式可以在同一批次内混用；压缩（zstd/gzip）由 json_io 透明处理
+
+打包/解包见 scripts/pack_results.py。
+"""
+
+import hashlib
+import json
+import posixpath
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from json_io import load_json
+
+CHECK_META_FIELDS = ("description", "dimension_id", "subcategory_id", "check_type")
+CHECK_META_DIR = "_check_meta"
+
+# 字典文件在一次进程内不会变化，按路径缓存（viewer等长驻进程反复读取同一批次）
+_meta_cache: Dict[str, Dict[str, Dict]] = {}
+_meta_cache_lock = threading.Lock()
+
+
+def meta_key(meta: Dict[str, Any]) -> str:
+    """元数据内容哈希（12位），相同内容得到相同的键"""
+    raw = json.dumps([meta.get(field) for field in CHECK_META_FIELDS], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def meta_file_for(check_result_path: Union[str, Path]) -> Path:
+    """check_result_revNNN.json 对应的字典文件：<agent_results_dir>/_check_meta/check_meta_revNNN.json"""
+    path = Path(check_result_path)
+    suffix = path.name[len("check_result"):] if path.name.startswith("check_result") else ".json"
+    return path.parent.parent / CHECK_META_DIR / f"check_meta{suffix}"
+
+
+def is_packed(check_result: Dict) -> bool:
+    """是否为紧凑格式（检查项元数据在外部字典中）"""
+    return bool(check_result.get("check_meta_file"))
+
+
+def pack_check_result(check_result: Dict, meta_table: Dict[str, Dict],
+                      meta_file_rel: str) -> Dict:
+    """把检查项元数据提取到 meta_table，返回紧凑格式的新结果（不修改入参）
+
+    Args:
+        check_result: 明文格式的check_result
+        meta_table: per-revision字典，新出现的元数据会写入其中
+        meta_file_rel: 字典文件相对check_result文件的路径（posix风格）
+    """
+    packed = dict(check_result)
+    details = {}
+    for key, item in check_result.get("check_details", {}).items():
+        if not isinstance(item, dict):
+            details[key] = item
+            continue
+        meta = {k: v for k, v in item.items() if k in CHECK_META_FIELDS}
+        if not meta:
+            details[key] = item
+            continue
+        mkey = meta_key(meta)
+        meta_table.setdefault(mkey, meta)
+        # 引用键放在第一个元数据字段的位置，还原时字段顺序不变
+        slim = {}
+        for k, v in item.items():
+            if k not in meta:
+                slim[k] = v
+            elif "meta" not in slim:
+                slim["meta"] = mkey
+        details[key] = slim
+    packed["check_details"] = details
+    packed["check_meta_file"] = meta_file_rel
+    return packed
+
+
+def unpack_check_result(check_result: Dict, meta_table: Dict[str, Dict]) -> Dict:
+    """用字典还原紧凑格式的检查项（明文格式原样返回）
+
+    Raises:
+        KeyError: 字典中缺少检查项引用的元数据
+    """
+    if not is_packed(check_result):
+        return check_result
+    result = dict(check_result)
+    result.pop("check_meta_file", None)
+    details = {}
+    for key, item in check_result.get("check_details", {}).items():
+        if isinstance(item, dict) and "meta" in item:
+            full = {}
+            for k, v in item.items():
+                if k == "meta":
+                    full.update(meta_table[v])
+                else:
+                    full[k] = v
+            details[key] = full
+        else:
+            details[key] = item
+    result["check_details"] = details
+    return result
+
+
+def _load_meta_table(meta_path: Path, refresh: bool = False) -> Dict[str, Dict]:
+    cache_key = str(meta_path.resolve())
+    with _meta_cache_lock:
+        cached = None if refresh else _meta_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    table = load_json(meta_path)
+    with _meta_cache_lock:
+        _meta_cache[cache_key] = table
+    return table
+
+
+def clear_meta_cache() -> None:
+    """清空字典缓存（打包工具重写字典后调用）"""
+    with _meta_cache_lock:
+        _meta_cache.clear()
+
+
+def load_check_result(path: Union[str, Path]) -> Dict:
+    """读取check_result文件（明文/压缩/紧凑格式均可），返回明文格式结构"""
+    path = Path(path)
+    data = load_json(path)
+    if not is_packed(data):
+        return data
+    meta_path = path.parent / data["check_meta_file"]
+    try:
+        return unpack_check_result(data, _load_meta_table(meta_path))
+    except KeyError:
+        # 字典只追加不删除：缓存早于本次打包时重新读取一次
+        return unpack_check_result(data, _load_meta_table(meta_path, refresh=True))
+
+
+def hydrate_check_result(data: Optional[Dict], path: str,
+                         read_json: Callable[[str], Optional[Dict]]) -> Optional[Dict]:
+    """用自定义读取函数还原紧凑格式（远程HTTP读取等不能直接打开文件的场景）
+
+    Args:
+        data: 已读取的check_result
+        path: check_result的posix风格相对路径
+        read_json: 按相对路径读取JSON的函数
+    """
+    if data is None or not is_packed(data):
+        return data
+    meta_path = posixpath.normpath(posixpath.join(posixpath.dirname(path), data["check_meta_file"]))
+    meta_table = read_json(meta_path)
+    if meta_table is None:
+        return None
+    return unpack_check_result(data, meta_table)
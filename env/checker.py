@@ -22,24 +22,96 @@
   - --existing-result + --only-checks: 在已有结果上重跑指定项（覆盖）
   - --existing-result 单独使用：在已有结果上增跑新checklist中有但已有结果中没有的项
 
+分级评审（可选）：
+- --prescreen-model: 廉价预筛模型先给出 matched + confidence
+- 只有预筛不通过、置信度低于 --cascade-confidence、或被 --cascade-audit-rate 抽中审计时才调用 --model
+- 路由/一致率/节省的主评审调用记录在 check_details[*].judge_routing 与顶层 judge_cascade 中
+
+Judge用量：
+- 每个发生LLM调用的检查项记录 judge_usage（prompt/completion/cached tokens、耗时、重试、模型、是否截断）
+- 顶层 judge_usage 为样本级汇总（含by_model），scripts/analysis/generate_statistics.py 汇总为批次级开销统计
+
+分组评审（可选）：
+- --group-judging: analysis_target 匹配到相同文件的LLM语义检查合并为一次调用（共享同一份正文），
+  返回以check_id为key的JSON对象后拆回各检查项；缺失或格式错误的项自动单独重跑
+
+Prompt缓存布局（可选）：
+- --prompt-layout content_first: 正文在前作为稳定前缀、业务标准在后，同一分析对象的检查项连续执行，
+  命中provider的prompt缓存；命中token数记录在 check_details[*].prompt_cache 中
+
+耗时分析（可选）：
+- --trace-output: 按检查项/检查方法/文件IO/LLM调用尝试与退避记录span，
+  输出Chrome trace（*.json，可用 chrome://tracing 或 Perfetto 打开）或 JSON Lines（*.jsonl）
+- --profile-output: 同时输出cProfile结果（*.prof；并发检查时合并工作线程的剖析，覆盖范围随路径打印）
+  两项输出都在检查结束或出错时写出
+- 结束时打印按自身耗时排序的Top耗时项
+
+增量recheck（输入指纹）：
+- --incremental: 以已有结果（--existing-result，缺省为 --output 指向的文件）为基础，
+  只重新执行指纹发生变化或没有历史结果的检查项，并报告复用/重算数量
+  （可与 --only-checks 组合：只在指定项中按指纹筛选）
+- 增量模式下执行后在输出文件旁写入 fingerprints_revNNN.json，记录每个检查项读取的输入指纹
+  （匹配文件的内容hash、params+judge标准+judge模型的hash、相关对话片段的hash）；
+  首次增量运行没有历史指纹，全量执行
+- 上次judge调用失败、检查异常的结果不复用；复用的结果仍参与依赖DAG（依赖它们的检查项按其结果短路）
+
+检查项依赖DAG：
+- 检查项可声明 depends_on: [check_id, ...]；也会根据 analysis_target/target_id 自动推断对
+  章节产出存在性 Gate、文件存在性检查的依赖
+- 前置失败的检查项不再执行，直接记为 dependency_failure（Gate执行崩坏时记fail，显式depends_on记skip）；
+  仅推断的文件前置失败时照常执行（checker对缺失文件直接返回fail，不调用LLM，评分与无DAG时一致）；
+  --no-dependency-skip 关闭短路
+- --check-concurrency N: 互不依赖的检查项并发执行
+
+Judge请求去重（可选）：
+- --judge-cache-dir: 相同请求（judge模型 + 端点 + messages）只调用一次，结果落盘供其他进程/目录复用；
+  被复用的请求计入 judge_usage.dedup_hits，不计入 calls 和 token 用量
+
+结果文件读写：
+- 通过 json_io 读写（有 orjson/pysimdjson 时使用），result.json 只解析 conversation_history，
+  不构造 tool_call_list 等大字段
+- --compact: 紧凑格式写出 check_result（默认 indent=2）
+- 输出位于 {data_id}_env/ 下时，写完后向批次目录的 sample_summaries.jsonl 追加该样本摘要
+  （模型/状态/耗时/最新revision得分，见 sample_summary.py），viewer 列表只读摘要
+
+日志：
+- 调试输出（文件路径探测、工具调用参数匹配、LLM请求/响应预览）为DEBUG级别，默认关闭；--log-level DEBUG 开启
+- --log-file: 每样本日志文件（缓冲批量写入），支持 {sample_id} 占位符
+
 check_id 稳定性：
 - 检查结果的 key 使用 checklist.jsonl 中的语义化 check_id（如"逻辑硬伤"、"章节克隆检测"）
 - 增删 check 项不会导致其他项的 key 偏移
 - 如果 check_item 没有 check_id 字段，降级为位置编号（"检查项N"）以向后兼容
 """
 
-import json
 import argparse
 import sys
+import traceback
 from pathlib import Path
+from typing import Dict, Optional
 import tempfile
 
 # 导入两个子模块
-from checker_execute import execute_checks
+from checker_execute import (
+    execute_checks, summarize_judge_cascade, summarize_judge_usage, configure_judge_dedup,
+    DEFAULT_CASCADE_CONFIDENCE, DEFAULT_CASCADE_AUDIT_RATE, DEFAULT_GROUP_JUDGING_SIZE
+)
 from checker_score import calculate_scores
+from checker_trace import tracer
+from check_fingerprint import (
+    compute_fingerprints, load_fingerprints, save_fingerprints, diff_fingerprints, changed_inputs
+)
+from checker_logging import setup_logging
+from json_io import dump_json, load_fields
+from check_result_store import load_check_result
+from sample_summary import append_summary
 
 
-def main():
+class CheckerError(Exception):
+    """检查执行或算分失败（CLI以退出码1结束，批量编排器记为该样本失败）"""
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="小说创作炼金术场景自动评估检查脚本")
     parser.add_argument("--bench", required=True, help="bench.json文件路径（包含check_list）")
     parser.add_argument("--result", required=True, help="result.json文件路径（执行结果）")
@@ -54,17 +126,76 @@ def main():
                        help="已有的check_result.json路径，用于增量模式")
     parser.add_argument("--only-checks", default=None,
                         help="逗号分隔的检查项标识（支持语义ID如'逻辑硬伤,章节克隆检测'，也兼容数字序号如'33,35,36'）")
-    args = parser.parse_args()
+    parser.add_argument("--incremental", action="store_true",
+                        help="增量recheck：只重新执行输入指纹发生变化的检查项（指纹保存在输出文件旁的 fingerprints_revNNN.json）")
+    parser.add_argument("--group-judging", action="store_true",
+                        help="分组评审：分析对象相同的LLM语义检查合并为一次调用")
+    parser.add_argument("--group-judging-size", type=int, default=DEFAULT_GROUP_JUDGING_SIZE,
+                        help=f"分组评审每次调用最多合并的检查项数（默认: {DEFAULT_GROUP_JUDGING_SIZE}）")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="控制台日志级别（默认: INFO，DEBUG输出默认关闭）")
+    parser.add_argument("--log-file", default=None,
+                        help="每样本日志文件（缓冲写入，支持{sample_id}占位符，如 logs/{sample_id}.log）")
+    parser.add_argument("--trace-output", default=None,
+                        help="耗时追踪输出（*.json 为Chrome trace格式，*.jsonl 为JSON Lines）")
+    parser.add_argument("--profile-output", default=None, help="cProfile结果输出路径（*.prof）")
+    parser.add_argument("--check-concurrency", type=int, default=1,
+                        help="互不依赖的检查项并发执行数（默认: 1，串行）")
+    parser.add_argument("--no-dependency-skip", action="store_true",
+                        help="关闭依赖短路：前置检查失败时仍执行依赖它的检查项")
+    parser.add_argument("--prompt-layout", choices=["criteria_first", "content_first"],
+                        default="criteria_first",
+                        help="judge prompt布局：content_first 正文在前作为稳定前缀，便于prompt缓存命中")
+    parser.add_argument("--prescreen-model", default=None,
+                        help="分级评审的预筛模型（可选，启用后仅存疑项升级到--model）")
+    parser.add_argument("--prescreen-base-url", default=None, help="预筛模型API base URL（默认同--base-url）")
+    parser.add_argument("--prescreen-api-key", default=None, help="预筛模型API密钥（默认同--api-key）")
+    parser.add_argument("--cascade-confidence", type=float, default=DEFAULT_CASCADE_CONFIDENCE,
+                        help=f"预筛置信度阈值，低于此值升级到主评审（默认: {DEFAULT_CASCADE_CONFIDENCE}）")
+    parser.add_argument("--cascade-audit-rate", type=float, default=DEFAULT_CASCADE_AUDIT_RATE,
+                        help=f"预筛通过项的抽样审计比例（默认: {DEFAULT_CASCADE_AUDIT_RATE}）")
+    parser.add_argument("--compact", action="store_true",
+                        help="紧凑格式写出结果文件（不缩进），大批量时减小文件体积和写入耗时")
+    parser.add_argument("--judge-cache-dir", default=None,
+                        help="judge请求去重缓存目录：相同请求（模型+messages）复用已有结果，跨进程/跨目录共享")
+    return parser
+
+
+def run_checker(args: argparse.Namespace) -> Optional[Dict]:
+    """执行单个样本的检查并写出结果文件
+
+    Args:
+        args: build_arg_parser() 解析出的参数（批量编排器在进程内构造同样的参数）
+
+    Returns:
+        check_result；无已有结果且无需执行任何检查项时返回None
+
+    Raises:
+        CheckerError: 执行检查或计算分数失败
+    """
+    tracing = bool(args.trace_output or args.profile_output)
+    if not tracing:
+        return _run_checker(args)
+    tracer.start(None, profile=bool(args.profile_output))
+    try:
+        return _run_checker(args)
+    finally:
+        # 检查中途出错时同样写出已记录的span/剖析结果，便于定位出错前的耗时
+        tracer.finish(args.trace_output, args.profile_output, prefix="[Checker]")
+
 
+def _run_checker(args: argparse.Namespace) -> Optional[Dict]:
+    """run_checker 的主体（耗时追踪的开启与输出由 run_checker 负责）"""
     print("[Checker] 加载输入文件...")
     # 加载输入文件
-    with open(args.bench, "r", encoding="utf-8") as f:
-        bench_data = json.load(f)
-    with open(args.result, "r", encoding="utf-8") as f:
-        result_data = json.load(f)
+    # 只解析需要的顶层字段（inline模式下bench与result是同一个大文件，tool_call_list等字段不解析）
+    bench_data = load_fields(args.bench, ["data_id", "check_list"])
+    result_data = load_fields(args.result, ["conversation_history"])
 
     # 准备sample_result（用于checker_execute）
     sample_id = bench_data.get("data_id", "unknown")
+    tracer.sample_id = sample_id
+    setup_logging(args.log_level, args.log_file, sample_id=sample_id)
     # work_dir就是env目录，workspace是其子目录
     workspace_path = str(Path(args.work_dir) / "workspace")
 
@@ -81,8 +212,22 @@ def main():
     model_config = {
         "model_name": args.model,
         "api_base": args.base_url,
-        "api_key": args.api_key
+        "api_key": args.api_key,
+        "prompt_layout": args.prompt_layout,
+        "check_concurrency": args.check_concurrency,
+        "dependency_skip": not args.no_dependency_skip,
     }
+    if args.group_judging:
+        model_config["group_judging"] = True
+        model_config["group_judging_size"] = args.group_judging_size
+    if args.prescreen_model:
+        model_config["cascade"] = {
+            "model_name": args.prescreen_model,
+            "api_base": args.prescreen_base_url or args.base_url,
+            "api_key": args.prescreen_api_key or args.api_key,
+            "confidence_threshold": args.cascade_confidence,
+            "audit_rate": args.cascade_audit_rate,
+        }
 
     # ========== 增量模式处理 ==========
     existing_check_details = {}
@@ -92,13 +237,26 @@ def main():
     if args.existing_result:
         existing_path = Path(args.existing_result)
         if existing_path.exists():
-            with open(existing_path, "r", encoding="utf-8") as f:
-                existing_result_data = json.load(f)
+            existing_result_data = load_check_result(existing_path)
             existing_check_details = existing_result_data.get("check_details", {})
             print(f"[Checker] 增量模式：加载已有结果，包含 {len(existing_check_details)} 个检查项")
         else:
             print(f"[Checker] 警告：--existing-result 文件不存在: {existing_path}，将执行全量检查")
 
+    # 增量recheck：未指定 --existing-result 时以输出文件作为已有结果
+    result_path_for_fingerprints = Path(args.existing_result or args.output)
+    if args.incremental and not args.existing_result and Path(args.output).exists():
+        existing_result_data = load_check_result(args.output)
+        existing_check_details = existing_result_data.get("check_details", {})
+        print(f"[Checker] 增量recheck：加载已有结果 {args.output}，包含 {len(existing_check_details)} 个检查项")
+    previous_fingerprints = {}
+    current_fingerprints = {}
+    if args.incremental:
+        if existing_check_details:
+            previous_fingerprints = load_fingerprints(result_path_for_fingerprints)
+        with tracer.span("fingerprints"):
+            current_fingerprints = compute_fingerprints(check_list, sample_result, model_config)
+
     # 解析 --only-checks（同时支持数字序号和语义化 check_id）
     only_check_indices = None   # 数字序号集合
     only_check_ids = None       # 语义化 check_id 集合
@@ -149,11 +307,37 @@ def main():
             # 全量模式
             checks_to_run.append((i, check_key, check_item))
 
+    # 增量recheck：候选项中指纹未变且已有结果的直接复用
+    incremental_summary = None
+    reused_results = {}
+    if args.incremental:
+        if only_check_indices is not None or only_check_ids is not None:
+            candidates = checks_to_run
+        else:
+            candidates = [(i, key, item) for i, (key, item) in check_index_map.items()]
+        split = diff_fingerprints([key for _, key, _ in candidates], current_fingerprints,
+                                  previous_fingerprints, existing_check_details)
+        reused_results = {key: existing_check_details[key] for key in split["reused"]}
+        checks_to_run = [entry for entry in candidates if entry[1] not in reused_results]
+        incremental_summary = {
+            "reused": len(split["reused"]),
+            "recomputed": len(checks_to_run),
+            "changed": split["changed"],
+            "new": split["new"],
+            "retry": split["retry"],
+        }
+        print(f"[Checker] 增量recheck：复用 {len(split['reused'])} 项，重新执行 {len(checks_to_run)} 项 "
+              f"（指纹变化 {len(split['changed'])} 项，无历史结果/指纹 {len(split['new'])} 项，"
+              f"上次judge失败/检查异常 {len(split['retry'])} 项）")
+        for key in split["changed"][:10]:
+            reasons = changed_inputs(previous_fingerprints[key], current_fingerprints[key])
+            print(f"[Checker]   - {key}: {', '.join(reasons[:5])}{' ...' if len(reasons) > 5 else ''}")
+
     if not checks_to_run:
         if only_check_indices is not None:
             print(f"[Checker] 指定的检查项序号在checklist中均不存在，无需执行")
         else:
-            print(f"[Checker] 所有检查项已有结果，无需执行新检查")
+            print(f"[Checker] 所有检查项已有结果（或输入指纹未变），无需执行新检查")
 
         # 仍然需要用已有结果重新算分（checker可能更新了）
         if existing_result_data:
@@ -166,7 +350,7 @@ def main():
             }
         else:
             print(f"[Checker] 无已有结果且无需执行的检查项，退出")
-            sys.exit(0)
+            return None
     else:
         # 构建只含需要执行项的 check_list
         filtered_check_list = [item for _, _, item in checks_to_run]
@@ -179,19 +363,32 @@ def main():
         print(f"[Checker]   - Workspace: {workspace_path}")
         print(f"[Checker]   - 待执行: {len(checks_to_run)}/{len(check_list)} 项 (IDs: {run_keys})")
         print(f"[Checker]   - Model: {args.model}")
+        if args.check_concurrency > 1:
+            print(f"[Checker]   - Check concurrency: {args.check_concurrency}")
+        if args.group_judging:
+            print(f"[Checker]   - Group judging: ≤{args.group_judging_size} checks/call")
+        if args.prescreen_model:
+            print(f"[Checker]   - Prescreen: {args.prescreen_model} "
+                  f"(confidence≥{args.cascade_confidence}, audit={args.cascade_audit_rate})")
+
+        # 复用的检查项也放进DAG（作为已完成的结果），保留依赖它们的depends_on边
+        if reused_results:
+            dag_check_list = [item for key, item in check_index_map.values()
+                              if key in reused_results or key in run_keys]
+        else:
+            dag_check_list = filtered_check_list
 
         # 执行检查
         try:
-            partial_result = execute_checks(
-                sample_result,
-                filtered_check_list,
-                model_config
-            )
+            with tracer.span("execute_checks", checks=len(filtered_check_list)):
+                partial_result = execute_checks(
+                    sample_result,
+                    dag_check_list,
+                    model_config,
+                    reused_results=reused_results
+                )
         except Exception as e:
-            print(f"[Checker] 错误：执行检查失败: {e}", file=sys.stderr)
-            import traceback
-            traceback.print_exc()
-            sys.exit(1)
+            raise CheckerError(f"执行检查失败: {e}") from e
 
         # execute_checks 现在直接使用 check_id 作为 key，无需重映射
         partial_details = partial_result.get("check_details", {})
@@ -218,8 +415,12 @@ def main():
                     print(f"[Checker] 清理被替代的旧检查项: {old_key}")
             # 也按 subcategory_id 清理（兼容旧 "检查项N" key 的情况）
             # 如果 replaces 中的值匹配某个旧项的 subcategory_id，也删掉
+            # 当前checklist中的检查项不会是被替代的旧项（增量recheck复用的结果需要保留）
+            current_keys = {key for key, _ in check_index_map.values()}
             keys_to_remove = []
             for key, val in merged_details.items():
+                if key in current_keys:
+                    continue
                 if isinstance(val, dict) and val.get("subcategory_id") in replaced_keys:
                     keys_to_remove.append(key)
             for key in keys_to_remove:
@@ -246,27 +447,67 @@ def main():
             capability_taxonomy = yaml.safe_load(f)
 
     try:
-        check_result = calculate_scores(
-            execution_result,
-            capability_taxonomy
-        )
+        with tracer.span("calculate_scores"):
+            check_result = calculate_scores(
+                execution_result,
+                capability_taxonomy
+            )
     except Exception as e:
-        print(f"[Checker] 错误：计算分数失败: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+        raise CheckerError(f"计算分数失败: {e}") from e
+
+    # 分级评审统计（基于合并后的check_details，增量模式下包含已有结果中的路由记录）
+    judge_cascade = summarize_judge_cascade(check_result["check_details"])
+    if judge_cascade:
+        check_result["judge_cascade"] = judge_cascade
+
+    # judge用量汇总（token/耗时/重试/截断，按judge模型拆分），供generate_statistics.py统计开销
+    judge_usage = summarize_judge_usage(check_result["check_details"])
+    if judge_usage:
+        check_result["judge_usage"] = judge_usage
+
+    if incremental_summary:
+        check_result["incremental"] = incremental_summary
 
     # 保存结果
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(check_result, f, ensure_ascii=False, indent=2)
+    dump_json(check_result, output_path, compact=args.compact)
+
+    # 增量模式保存输入指纹：本次执行的检查项用新指纹，沿用的已有结果保留原指纹
+    if args.incremental:
+        executed_keys = {key for _, key, _ in checks_to_run}
+        stored_fingerprints = {}
+        for key in check_result["check_details"]:
+            if key in executed_keys and key in current_fingerprints:
+                stored_fingerprints[key] = current_fingerprints[key]
+            elif key in previous_fingerprints:
+                stored_fingerprints[key] = previous_fingerprints[key]
+        if stored_fingerprints:
+            save_fingerprints(output_path, sample_id, stored_fingerprints)
+
+    # 批次摘要：输出在 <agent_results_dir>/{data_id}_env/ 下时追加一行（摘要失败不影响检查结果）
+    env_dir = output_path.resolve().parent
+    if env_dir.name.endswith("_env"):
+        try:
+            append_summary(env_dir.parent, env_dir.name[:-len("_env")])
+        except (OSError, ValueError) as e:
+            print(f"[Checker] 警告: 写入样本摘要失败: {e}")
 
     print(f"\n[Checker] 检查完成！")
     print(f"[Checker]   - 输出文件: {output_path}")
+    if incremental_summary:
+        print(f"[Checker]   - 增量recheck: 复用 {incremental_summary['reused']} 项, "
+              f"重新执行 {incremental_summary['recomputed']} 项")
+
+    return check_result
+
+
+def print_result_summary(check_result: Dict) -> None:
+    """打印总分、维度分数、judge用量和分级评审摘要"""
+    judge_usage = check_result.get("judge_usage")
+    judge_cascade = check_result.get("judge_cascade")
 
-    # 打印摘要
     overall = check_result["overall_result"]
     print(f"\n[结果] 状态: {overall['status']}")
     print(f"[结果] 总分: {overall['total_score']}/100")
@@ -285,6 +526,37 @@ def main():
             # 普通维度
             print(f"  - {dim_id}: {dim_data['pass_rate']*100:.1f}分 ({dim_data['passed']}/{dim_data['total']})")
 
+    if judge_usage:
+        print(f"\n[Judge用量]")
+        print(f"  - 调用: {judge_usage['calls']} 次 ({judge_usage['checks']} 个检查项), "
+              f"去重复用: {judge_usage.get('dedup_hits', 0)}, "
+              f"重试: {judge_usage['retries']}, 失败: {judge_usage['failed_calls']}, 截断: {judge_usage['truncated_calls']}")
+        print(f"  - Tokens: prompt={judge_usage['prompt_tokens']} (cached={judge_usage['cached_tokens']}), "
+              f"completion={judge_usage['completion_tokens']}")
+        print(f"  - 耗时: 合计 {judge_usage['latency_ms'] / 1000:.1f}s, 单次最长 {judge_usage['max_latency_ms'] / 1000:.1f}s")
+
+    if judge_cascade:
+        totals = judge_cascade["totals"]
+        print(f"\n[分级评审]")
+        print(f"  - 预筛采纳: {totals['prescreen_accepted']}/{totals['checks']}, "
+              f"升级: {totals['escalated']}, 审计: {totals['audited']}")
+        print(f"  - 一致率: {totals['agreement_rate']} ({totals['agreed']}/{totals['compared']})")
+        print(f"  - 节省主评审调用: {totals['primary_calls_saved']} 次 ({totals['input_chars_saved']} 字符)")
+
+
+def main():
+    args = build_arg_parser().parse_args()
+    if args.judge_cache_dir:
+        configure_judge_dedup(cache_dir=args.judge_cache_dir)
+    try:
+        check_result = run_checker(args)
+    except CheckerError as e:
+        print(f"[Checker] 错误：{e}", file=sys.stderr)
+        traceback.print_exception(type(e.__cause__), e.__cause__, e.__cause__.__traceback__)
+        sys.exit(1)
+    if check_result is not None:
+        print_result_summary(check_result)
+
 
 if __name__ == "__main__":
     main()
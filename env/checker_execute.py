@@ -7,7 +7,7 @@
 输入：sample执行结果（conversation_history + workspace文件） + checklist
 输出：execution_result.json（包含pass/fail和grading分数，不含维度聚合统计）
 
-注意：本文件从shortdrama/env/checker.py恢复，支持8种check_types：
+注意：本文件从shortdrama/env/checker.py恢复，支持9种check_types：
   1. entity_attribute_equals (FileSystemChecker)
   2. create_operation_verified (FileSystemChecker)
   3. json_schema (JSONSchemaChecker)
@@ -16,8 +16,12 @@
   6. tool_call_absence (ToolCallAbsenceChecker)
   7. semantic_check (SemanticChecker)
   8. sop_stage_coverage (Gate级SOP执行完整性检查)
+  9. tool_call_order (ToolCallOrderChecker，工具调用时序断言)
 """
 
+import copy
+import functools
+import hashlib
 import json
 import argparse
 import re
@@ -28,6 +32,10 @@ import time
 import glob as glob_module
 import warnings
 import os
+import logging
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
 
 # 过滤Pydantic序列化警告
 warnings.filterwarnings('ignore', category=UserWarning, module='pydantic')
@@ -39,18 +47,339 @@ litellm.suppress_debug_info = True
 litellm.set_verbose = False
 from litellm import completion
 
+from workspace_stats import STATS_FILENAME, lookup_fresh_stats
+from checker_trace import tracer, traced
+from checker_logging import logger, setup_logging
+from tool_call_index import ToolCallIndex, evaluate_order_assertions
+from check_dag import (
+    build_check_dag, run_check_dag, blocking_preconditions, dependency_failure_result, produced_paths
+)
+from character_presence import (
+    CharacterMatcher, scan_presence, character_aliases, extract_frequent_names
+)
+
 
 # =========================================
 # 1. 辅助函数
 # =========================================
 
-def request_llm_with_litellm(messages, model_name, api_base, api_key, max_retries=20):
-    """使用LiteLLM调用模型进行语义判断
+def _usage_field(obj, key):
+    """兼容对象/字典两种形式的usage字段读取"""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, key, None)
+
+
+def extract_usage(usage) -> Dict[str, int]:
+    """从response.usage提取token用量（含prompt缓存命中的token数）
+
+    - OpenAI兼容接口: usage.prompt_tokens_details.cached_tokens
+    - Anthropic风格: usage.cache_read_input_tokens
+    """
+    details = _usage_field(usage, "prompt_tokens_details")
+    cached_tokens = _usage_field(details, "cached_tokens")
+    if cached_tokens is None:
+        cached_tokens = _usage_field(usage, "cache_read_input_tokens")
+    return {
+        "prompt_tokens": int(_usage_field(usage, "prompt_tokens") or 0),
+        "completion_tokens": int(_usage_field(usage, "completion_tokens") or 0),
+        "cached_tokens": int(cached_tokens or 0),
+    }
+
+
+# 截断提示文本（内容超长截断时插入，用于在用量记录中标记truncated）
+TRUNCATION_MARKER = "[中间内容省略，共截断"
+
+# judge请求去重：内存结果缓存最多保留的请求数
+DEFAULT_JUDGE_DEDUP_ENTRIES = 10000
+
+# 当前检查项的judge调用记录（execute_checks逐项设置，request_llm_with_litellm追加）
+# 按线程隔离：检查项并发执行时各自记录自己的调用
+_judge_call_log = threading.local()
+
+
+class JudgeLimiter:
+    """进程内judge调用的全局并发/速率上限（多个样本在同一进程中并发执行时共享）
+
+    只在实际发起请求期间占用并发名额，重试退避等待时释放，避免失败请求挤占吞吐
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, max_rpm: Optional[float] = None):
+        self.max_concurrency = max_concurrency
+        self.max_rpm = max_rpm
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._rate_lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def _wait_rate(self) -> None:
+        if not self.max_rpm:
+            return
+        interval = 60.0 / self.max_rpm
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def __enter__(self):
+        self._wait_rate()
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._semaphore is not None:
+            self._semaphore.release()
+        return False
+
+
+# 默认不限制（单样本CLI的行为不变）；批量编排器通过 configure_judge_limits 设置
+_judge_limiter = JudgeLimiter()
+
+
+def configure_judge_limits(max_concurrency: Optional[int] = None, max_rpm: Optional[float] = None) -> None:
+    """设置进程内所有judge调用共享的并发上限和每分钟请求数上限（None表示不限制）"""
+    global _judge_limiter
+    _judge_limiter = JudgeLimiter(max_concurrency, max_rpm)
+
+
+class JudgeDedup:
+    """judge请求去重：相同请求（模型 + 端点 + messages）只调用一次
+
+    - single-flight: 并发的相同请求等待正在进行的那一次调用，不重复请求
+    - 结果缓存: 已成功的请求直接返回缓存结果（内存LRU；指定 cache_dir 时同时落盘，跨进程复用）
+    - 失败的调用不缓存，等待方各自重新请求
+
+    典型场景：续跑/重试的agent结果被复制到多个eval目录、共享参考产出，workspace文件逐字节相同
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = DEFAULT_JUDGE_DEDUP_ENTRIES):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[str, Dict]" = OrderedDict()
+        self._inflight: Dict[str, threading.Event] = {}
+        self.stats = {"requests": 0, "calls": 0, "inflight_hits": 0, "cache_hits": 0,
+                      "saved_prompt_tokens": 0, "saved_completion_tokens": 0}
+
+    @staticmethod
+    def request_key(messages: List[Dict], model_name: str, api_base: Optional[str]) -> str:
+        payload = json.dumps([model_name, api_base or "", messages], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _lookup(self, key: str) -> Optional[Dict]:
+        """调用方持有 self._lock"""
+        entry = self._results.get(key)
+        if entry is not None:
+            self._results.move_to_end(key)
+            return entry
+        if self.cache_dir is not None:
+            try:
+                with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return None
+            self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: Dict) -> None:
+        self._results[key] = entry
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def acquire(self, key: str):
+        """返回 ("cache", 结果) / ("wait", Event) / ("lead", None)"""
+        with self._lock:
+            self.stats["requests"] += 1
+            entry = self._lookup(key)
+            if entry is not None:
+                self._count_hit("cache_hits", entry)
+                return "cache", entry
+            event = self._inflight.get(key)
+            if event is not None:
+                return "wait", event
+            self._inflight[key] = threading.Event()
+            self.stats["calls"] += 1
+            return "lead", None
+
+    def wait(self, key: str, event: threading.Event) -> Optional[Dict]:
+        """等待进行中的相同请求；领头调用失败时返回None"""
+        event.wait()
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                self._count_hit("inflight_hits", entry)
+            else:
+                # 领头调用失败：等待方自己发起请求
+                self.stats["calls"] += 1
+            return entry
+
+    def _count_hit(self, kind: str, entry: Dict) -> None:
+        self.stats[kind] += 1
+        self.stats["saved_prompt_tokens"] += entry["usage"].get("prompt_tokens", 0)
+        self.stats["saved_completion_tokens"] += entry["usage"].get("completion_tokens", 0)
+
+    def release(self, key: str, entry: Optional[Dict]) -> None:
+        """领头调用结束：成功时写入缓存，唤醒等待方
+
+        落盘失败只记警告（内存缓存照常写入）；无论如何都清除 in-flight 标记并唤醒等待方，
+        否则等待方与之后的相同请求会一直阻塞
+        """
+        try:
+            if entry is not None and self.cache_dir is not None:
+                self._write_disk(key, entry)
+        finally:
+            with self._lock:
+                if entry is not None:
+                    self._remember(key, entry)
+                event = self._inflight.pop(key)
+            event.set()
+
+    def _write_disk(self, key: str, entry: Dict) -> None:
+        path = self._disk_path(key)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("[judge去重] 写入磁盘缓存失败: %s, 错误: %s", path, e)
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def summary(self) -> Dict:
+        """去重统计：dedup_rate = 被去重的请求 / 全部请求"""
+        with self._lock:
+            stats = dict(self.stats)
+        hits = stats["inflight_hits"] + stats["cache_hits"]
+        stats["dedup_rate"] = round(hits / stats["requests"], 4) if stats["requests"] else 0
+        return stats
+
+
+# 默认关闭；批量编排器或 checker.py --judge-cache-dir 通过 configure_judge_dedup 开启
+_judge_dedup: Optional[JudgeDedup] = None
+
+
+def configure_judge_dedup(enabled: bool = True, cache_dir: Optional[str] = None,
+                          max_entries: int = DEFAULT_JUDGE_DEDUP_ENTRIES) -> Optional[JudgeDedup]:
+    """开启/关闭进程内judge请求去重，返回去重器（用于读取统计）"""
+    global _judge_dedup
+    _judge_dedup = JudgeDedup(cache_dir, max_entries) if enabled else None
+    return _judge_dedup
+
+
+def judge_dedup_summary() -> Optional[Dict]:
+    """当前进程的judge请求去重统计，未开启时返回None"""
+    return _judge_dedup.summary() if _judge_dedup is not None else None
+
+
+def start_judge_usage_capture() -> List[Dict]:
+    """开始记录当前线程的judge调用（覆盖之前的记录），返回记录列表"""
+    _judge_call_log.calls = []
+    return _judge_call_log.calls
+
+
+def stop_judge_usage_capture() -> List[Dict]:
+    """停止记录并返回当前线程本次记录的所有judge调用"""
+    calls = getattr(_judge_call_log, "calls", None) or []
+    _judge_call_log.calls = None
+    return calls
+
+
+@contextmanager
+def judge_call_batch(batch_id):
+    """范围内当前线程发起的judge调用记录标记 batch（分组评审按批次归属用量，不依赖调用次数/顺序）"""
+    previous = getattr(_judge_call_log, "batch", None)
+    _judge_call_log.batch = batch_id
+    try:
+        yield
+    finally:
+        _judge_call_log.batch = previous
+
+
+def _log_judge_call(record: Dict) -> None:
+    """追加到当前线程的judge调用记录（未在记录时忽略），在分组批次内时标记batch"""
+    call_log = getattr(_judge_call_log, "calls", None)
+    if call_log is None:
+        return
+    batch = getattr(_judge_call_log, "batch", None)
+    if batch is not None:
+        record["batch"] = batch
+    call_log.append(record)
+
+
+def request_llm_with_litellm(messages, model_name, api_base, api_key, max_retries=20,
+                             usage_out: Optional[Dict] = None):
+    """使用LiteLLM调用模型进行语义判断（开启去重时，相同请求只实际调用一次）
+
+    被去重的请求在judge调用记录中标记 dedup（inflight/cache），不计入 calls 和 token 用量
+    """
+    dedup = _judge_dedup
+    if dedup is None:
+        return _request_llm(messages, model_name, api_base, api_key, max_retries, usage_out)
+
+    formatted_messages = [{"role": msg["role"], "content": msg.get("content", "")} for msg in messages]
+    key = dedup.request_key(formatted_messages, model_name, api_base)
+    state, value = dedup.acquire(key)
+    if state == "wait":
+        value = dedup.wait(key, value)
+        state = "inflight" if value is not None else "fallback"
+    if state in ("cache", "inflight"):
+        _log_judge_call({"model": model_name, "success": True, "dedup": state})
+        if usage_out is not None:
+            usage_out.update({"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0})
+        return True, value["content"]
+    if state == "fallback":
+        return _request_llm(messages, model_name, api_base, api_key, max_retries, usage_out)
+
+    usage = {}
+    entry = None
+    try:
+        success, content = _request_llm(messages, model_name, api_base, api_key, max_retries, usage)
+        if success:
+            entry = {"content": content, "usage": usage}
+    finally:
+        dedup.release(key, entry)
+    if usage_out is not None:
+        usage_out.update(usage)
+    return success, content
+
+
+def _request_llm(messages, model_name, api_base, api_key, max_retries=20,
+                 usage_out: Optional[Dict] = None):
+    """实际的LiteLLM调用（无去重）
     
     重试策略：指数退避 + 随机抖动，base=5s，cap=120s，最多20次
+
+    usage_out: 可选，调用成功时写入 prompt_tokens / completion_tokens / cached_tokens
+    每次调用（无论成功与否）的 token/耗时/重试次数 都会追加到当前judge调用记录中
     """
     import random
 
+    call_record = {
+        "model": model_name,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cached_tokens": 0,
+        "latency_ms": 0,
+        "retries": 0,
+        "success": False,
+        "truncated": any(TRUNCATION_MARKER in (msg.get("content") or "") for msg in messages),
+        "input_chars": sum(len(msg.get("content") or "") for msg in messages),
+    }
+    _log_judge_call(call_record)
+    call_start = time.perf_counter()
+
     if api_base:
         litellm.api_base = api_base
     if api_key:
@@ -65,48 +394,61 @@ def request_llm_with_litellm(messages, model_name, api_base, api_key, max_retrie
 
     for attempt in range(max_retries):
         try:
-            print(f"[LLM调用] 尝试 {attempt + 1}/{max_retries}, model={model_name}", flush=True)
+            logger.debug("[LLM调用] 尝试 %d/%d, model=%s", attempt + 1, max_retries, model_name)
+
+            # 请求内容预览（截断超长内容，仅DEBUG级别时构造）
+            if logger.isEnabledFor(logging.DEBUG):
+                for idx, msg in enumerate(formatted_messages):
+                    content = msg["content"]
+                    if len(content) > 500:
+                        content_preview = content[:250] + f"\n... [省略{len(content)-500}字符] ...\n" + content[-250:]
+                    else:
+                        content_preview = content
+                    logger.debug("[LLM请求] Message %d (%s): %s", idx + 1, msg["role"], content_preview)
+
+            with _judge_limiter, tracer.span("llm.attempt", model=model_name, attempt=attempt + 1):
+                response = completion(
+                    model=model_name,
+                    messages=formatted_messages,
+                    response_format={"type": "json_object"},
+                    api_base=api_base,
+                    api_key=api_key,
+                    custom_llm_provider="openai"
+                )
 
-            # 打印请求内容（截断超长内容）
-            for idx, msg in enumerate(formatted_messages):
-                content = msg["content"]
-                if len(content) > 500:
-                    content_preview = content[:250] + f"\n... [省略{len(content)-500}字符] ...\n" + content[-250:]
+            content = response.choices[0].message.content
+            logger.debug("[LLM调用] 成功")
+            usage = extract_usage(getattr(response, "usage", None))
+            call_record.update(usage)
+            call_record["success"] = True
+            call_record["retries"] = attempt
+            call_record["latency_ms"] = int((time.perf_counter() - call_start) * 1000)
+            if usage_out is not None:
+                usage_out.update(usage)
+
+            # 响应内容预览（截断超长内容，仅DEBUG级别时构造）
+            if logger.isEnabledFor(logging.DEBUG):
+                if len(content) > 1000:
+                    content_preview = content[:500] + f"\n... [省略{len(content)-1000}字符] ...\n" + content[-500:]
                 else:
                     content_preview = content
-                print(f"[LLM请求] Message {idx+1} ({msg['role']}): {content_preview}", flush=True)
-
-            response = completion(
-                model=model_name,
-                messages=formatted_messages,
-                response_format={"type": "json_object"},
-                api_base=api_base,
-                api_key=api_key,
-                custom_llm_provider="openai"
-            )
-
-            content = response.choices[0].message.content
-            print(f"[LLM调用] 成功", flush=True)
-
-            # 打印响应内容（截断超长内容）
-            if len(content) > 1000:
-                content_preview = content[:500] + f"\n... [省略{len(content)-1000}字符] ...\n" + content[-500:]
-            else:
-                content_preview = content
-            print(f"[LLM响应]: {content_preview}", flush=True)
+                logger.debug("[LLM响应]: %s", content_preview)
 
             return True, content
 
         except Exception as e:
             error_msg = str(e)
-            print(f"[LLM调用] 失败 (尝试 {attempt + 1}/{max_retries}): {error_msg}", flush=True)
+            logger.warning("[LLM调用] 失败 (尝试 %d/%d, model=%s): %s", attempt + 1, max_retries, model_name, error_msg)
             if attempt < max_retries - 1:
                 # 指数退避 + 随机抖动: base=5s, cap=120s
                 sleep_time = min(5 * (2 ** attempt) + random.uniform(0, 3), 120)
-                print(f"[LLM调用] 等待 {sleep_time:.1f}s 后重试...", flush=True)
-                time.sleep(sleep_time)
+                logger.warning("[LLM调用] 等待 %.1fs 后重试...", sleep_time)
+                with tracer.span("llm.backoff", seconds=round(sleep_time, 1)):
+                    time.sleep(sleep_time)
                 continue
             else:
+                call_record["retries"] = attempt
+                call_record["latency_ms"] = int((time.perf_counter() - call_start) * 1000)
                 return False, error_msg
 
     return False, "所有重试均失败"
@@ -144,6 +486,34 @@ def safe_json_extract_single(response_text: str) -> Dict:
     raise ValueError(f"无法从响应中提取JSON: {response_text[:200]}")
 
 
+def build_content_prefix(context_info: str, combined_content: str) -> str:
+    """正文在前的稳定prompt前缀（同一样本、同一分析对象的各检查项逐字节一致，便于prompt缓存命中）"""
+    return f"""以下是待评估的内容，评估标准在内容之后给出。
+
+**待评估内容：** ({context_info})
+{combined_content}
+
+"""
+
+
+# 分组评审：每次调用最多合并的检查项数
+DEFAULT_GROUP_JUDGING_SIZE = 8
+
+# 分级评审默认参数
+DEFAULT_CASCADE_CONFIDENCE = 0.8
+DEFAULT_CASCADE_AUDIT_RATE = 0.1
+CASCADE_CONFIDENCE_INSTRUCTION = (
+    "\n\n另外，请在JSON中附加字段 \"confidence\"：0~1之间的小数，"
+    "表示你对matched判断的把握程度（1表示完全确定）。"
+)
+
+
+def _chapter_sort_key(name: str) -> int:
+    """从文件名中提取第一个数字用于章节排序（无数字时排在最前）"""
+    nums = re.findall(r'\d+', name)
+    return int(nums[0]) if nums else 0
+
+
 # =========================================
 # 2. 检查结果格式
 # =========================================
@@ -309,6 +679,7 @@ class FileSystemChecker:
         self.api_base = api_base
         self.api_key = api_key
 
+    @traced("io.json_load")
     def _load_json_file(self, file_path: Path) -> Dict:
         """加载JSON文件，JSON格式错误时保留原始内容供语义检查使用"""
         try:
@@ -407,6 +778,7 @@ class FileSystemChecker:
                 f"文件 {target_id} JSON不合法，LLM响应解析失败: {str(e)}"
             )
 
+    @traced("io.glob")
     def _glob_files(self, pattern: str) -> List[Path]:
         """
         使用glob模式匹配文件（容错处理workspace路径嵌套）
@@ -531,23 +903,18 @@ class FileSystemChecker:
             # 单个文件或目录检查（容错处理workspace路径嵌套）
             file_path = self.work_dir / target_id
 
-            print(f"[DEBUG FileSystemChecker] target_id={target_id}", flush=True)
-            print(f"[DEBUG FileSystemChecker] work_dir={self.work_dir}", flush=True)
-            print(f"[DEBUG FileSystemChecker] file_path={file_path}", flush=True)
-            print(f"[DEBUG FileSystemChecker] file_path.exists()={file_path.exists()}", flush=True)
-            print(f"[DEBUG FileSystemChecker] file_path.absolute()={file_path.absolute()}", flush=True)
+            logger.debug("[DEBUG FileSystemChecker] target_id=%s, work_dir=%s, file_path=%s",
+                         target_id, self.work_dir, file_path)
 
             # 容错逻辑：如果文件不存在且路径以workspace/开头，尝试嵌套路径
             if not file_path.exists() and target_id.startswith("workspace/"):
-                print(f"[DEBUG FileSystemChecker] Trying nested workspace/workspace/ fallback", flush=True)
                 nested_target_id = target_id.replace("workspace/", "workspace/workspace/", 1)
                 nested_file_path = self.work_dir / nested_target_id
-                print(f"[DEBUG FileSystemChecker] nested_file_path={nested_file_path}", flush=True)
-                print(f"[DEBUG FileSystemChecker] nested_file_path.exists()={nested_file_path.exists()}", flush=True)
+                logger.debug("[DEBUG FileSystemChecker] Trying nested fallback: %s", nested_file_path)
                 if nested_file_path.exists():
                     file_path = nested_file_path
                     target_id = nested_target_id
-                    print(f"[DEBUG FileSystemChecker] Using nested path", flush=True)
+                    logger.debug("[DEBUG FileSystemChecker] Using nested path")
 
             # 特殊处理：naming_pattern检查（针对目录）
             if attribute_key == "naming_pattern":
@@ -611,9 +978,8 @@ class FileSystemChecker:
 
             # 特殊处理：_exists或exists检查（兼容两种写法）
             if attribute_key == "_exists" or attribute_key == "exists":
-                print(f"[DEBUG FileSystemChecker] Checking file existence, attribute_key={attribute_key}", flush=True)
-                print(f"[DEBUG FileSystemChecker] file_path (before exists check)={file_path}", flush=True)
-                print(f"[DEBUG FileSystemChecker] file_path.exists()={file_path.exists()}", flush=True)
+                logger.debug("[DEBUG FileSystemChecker] Checking file existence, attribute_key=%s, file_path=%s",
+                             attribute_key, file_path)
                 if file_path.exists():
                     return create_check_item_result(
                         "pass", "文件存在",
@@ -625,8 +991,8 @@ class FileSystemChecker:
                         f"文件 {target_id} 不存在"
                     )
 
-            print(f"[DEBUG FileSystemChecker] Before final exists check: file_path={file_path}, attribute_key={attribute_key}", flush=True)
-            print(f"[DEBUG FileSystemChecker] file_path.exists() at line 526={file_path.exists()}", flush=True)
+            logger.debug("[DEBUG FileSystemChecker] Before final exists check: file_path=%s, attribute_key=%s",
+                         file_path, attribute_key)
             if not file_path.exists():
                 # 检查其他属性时文件不存在，这是依赖失败（依赖于文件存在性检查）
                 result = create_check_item_result(
@@ -793,23 +1159,19 @@ class FileSystemChecker:
             import json
             outline_text = json.dumps(outline_data, ensure_ascii=False)
 
+        # 单次扫描统计所有角色在大纲中的出现次数
+        # 空角色名不参与匹配，按原 `"" in text` 语义视为出现
+        matcher = CharacterMatcher({name: [name] for name in main_names + supporting_names if name},
+                                   overlapping=True)
+        counts = matcher.count(outline_text)
+
         # 检查主角是否在大纲中出现
-        main_found = []
-        main_missing = []
-        for name in main_names:
-            if name in outline_text:
-                main_found.append(name)
-            else:
-                main_missing.append(name)
+        main_found = [name for name in main_names if not name or counts.get(name)]
+        main_missing = [name for name in main_names if name and not counts.get(name)]
 
         # 检查配角是否在大纲中出现
-        supporting_found = []
-        supporting_missing = []
-        for name in supporting_names:
-            if name in outline_text:
-                supporting_found.append(name)
-            else:
-                supporting_missing.append(name)
+        supporting_found = [name for name in supporting_names if counts.get(name)]
+        supporting_missing = [name for name in supporting_names if not counts.get(name)]
 
         # 判断结果：设计了的角色都必须在大纲中出现（不区分主角配角）
         all_missing = main_missing + supporting_missing
@@ -920,17 +1282,29 @@ class FileSystemChecker:
             result["dependency_failure"] = True
             return result
 
-        # 读取所有章节内容
-        all_chapters_text = ""
-        for chapter_file in chapters_files:
-            try:
-                with open(chapter_file, 'r', encoding='utf-8') as f:
-                    all_chapters_text += f.read() + "\n"
-            except Exception as e:
-                # 单个文件读取失败不影响整体
-                pass
+        # 按章节编号排序，逐章流式扫描（不拼接全文）
+        chapters_files = sorted(chapters_files, key=lambda p: _chapter_sort_key(Path(p).name))
+        readable_chapters = 0
 
-        if not all_chapters_text:
+        def _iter_chapters():
+            nonlocal readable_chapters
+            for chapter_file in chapters_files:
+                try:
+                    with open(chapter_file, 'r', encoding='utf-8') as f:
+                        text = f.read()
+                    readable_chapters += 1
+                except Exception:
+                    # 单个文件读取失败不影响整体
+                    text = ""
+                yield Path(chapter_file).name, text
+
+        # 空角色名不参与匹配，按原 `"" in text` 语义视为出现
+        matcher = CharacterMatcher({name: [name] for name in main_names + supporting_names if name},
+                                   overlapping=True)
+        presence = scan_presence(matcher, _iter_chapters())
+
+        # 只有章节全部读取失败才短路；章节文件存在但内容为空时照常判定（角色缺失 → fail）
+        if not readable_chapters:
             result = create_check_item_result(
                 "skip", "前置条件失败（章节内容读取失败）",
                 f"无法读取章节文件内容"
@@ -938,23 +1312,15 @@ class FileSystemChecker:
             result["dependency_failure"] = True
             return result
 
+        presence_summary = presence["characters"]
+
         # 检查主角是否在章节中出现
-        main_found = []
-        main_missing = []
-        for name in main_names:
-            if name in all_chapters_text:
-                main_found.append(name)
-            else:
-                main_missing.append(name)
+        main_found = [name for name in main_names if not name or presence_summary[name]["count"]]
+        main_missing = [name for name in main_names if name and not presence_summary[name]["count"]]
 
         # 检查配角是否在章节中出现
-        supporting_found = []
-        supporting_missing = []
-        for name in supporting_names:
-            if name in all_chapters_text:
-                supporting_found.append(name)
-            else:
-                supporting_missing.append(name)
+        supporting_found = [name for name in supporting_names if presence_summary[name]["count"]]
+        supporting_missing = [name for name in supporting_names if not presence_summary[name]["count"]]
 
         # 判断结果：设计了的角色都必须在正文中出现（不区分主角配角）
         all_missing = main_missing + supporting_missing
@@ -969,7 +1335,7 @@ class FileSystemChecker:
                 details_parts.append(f"配角缺失: {', '.join(supporting_missing)}")
 
         if not all_missing:
-            return create_check_item_result(
+            result = create_check_item_result(
                 "pass", "所有设计角色都在正文中出现",
                 "; ".join(details_parts)
             )
@@ -979,11 +1345,18 @@ class FileSystemChecker:
                 missing_desc.append(f"主角: {', '.join(main_missing)}")
             if supporting_missing:
                 missing_desc.append(f"配角: {', '.join(supporting_missing)}")
-            return create_check_item_result(
+            result = create_check_item_result(
                 "fail", f"部分设计角色未在正文中出现（{'; '.join(missing_desc)}）",
                 "; ".join(details_parts)
             )
 
+        # 附带出场统计（出现次数、出场章节数、首次/最后出场章节）
+        result["character_presence"] = {
+            name: {k: v for k, v in info.items() if k not in ("first_index", "last_index")}
+            for name, info in presence_summary.items()
+        }
+        return result
+
     def _check_attribute_value(self, data: Dict, attribute_key: str, expected_value: Any) -> Dict:
         """检查属性值是否符合预期"""
         # 支持JSONPath语法，如 "hooks[*].length"
@@ -1754,26 +2127,23 @@ class ToolCalledWithParamsChecker:
         """
         self.work_dir = Path(work_dir) if work_dir else None
 
-    def check(self, params: Dict, conversation_history: List[Dict]) -> Dict:
-        """检查工具是否以正确参数被调用"""
+    def check(self, params: Dict, conversation_history) -> Dict:
+        """检查工具是否以正确参数被调用（conversation_history 也可以直接传入 ToolCallIndex）"""
         tool_name = params.get("tool_name")
         expected_params = params.get("expected_params", {})
         min_count = params.get("min_count", 1)
         skip_if_file_not_exists = params.get("skip_if_file_not_exists", False)
 
-        print(f"\n[DEBUG] ToolCalledWithParamsChecker: tool_name={tool_name}", flush=True)
-        print(f"[DEBUG] expected_params={expected_params}", flush=True)
-        print(f"[DEBUG] min_count={min_count}", flush=True)
-        print(f"[DEBUG] skip_if_file_not_exists={skip_if_file_not_exists}", flush=True)
+        logger.debug("[DEBUG] ToolCalledWithParamsChecker: tool_name=%s, expected_params=%s, min_count=%s, "
+                     "skip_if_file_not_exists=%s", tool_name, expected_params, min_count, skip_if_file_not_exists)
 
         # 如果设置了skip_if_file_not_exists，先检查目标文件是否存在
         if skip_if_file_not_exists and self.work_dir:
             file_path = expected_params.get("path", "")
             if file_path:
                 full_path = self.work_dir / file_path
-                print(f"[DEBUG] Checking file existence: {full_path}", flush=True)
                 if not full_path.exists():
-                    print(f"[DEBUG] File not exists, skipping check", flush=True)
+                    logger.debug("[DEBUG] File not exists, skipping check: %s", full_path)
                     return create_check_item_result(
                         "skip", "环境中不存在该文件（skip_if_file_not_exists）",
                         f"文件 {file_path} 在当前环境中不存在，跳过此检查项"
@@ -1781,50 +2151,17 @@ class ToolCalledWithParamsChecker:
 
         param_match_mode = params.get("param_match_mode", "exact")  # exact | contains
 
-        # 从对话历史中查找工具调用
-        matched_count = 0
-        found_calls = []  # 记录找到的所有调用
-        for message in conversation_history:
-            if message.get("role") == "assistant" and "tool_calls" in message:
-                for tool_call in message["tool_calls"]:
-                    if tool_call.get("function", {}).get("name") == tool_name:
-                        arguments = tool_call.get("function", {}).get("arguments", {})
-                        if isinstance(arguments, str):
-                            try:
-                                arguments = json.loads(arguments)
-                            except json.JSONDecodeError:
-                                continue
-
-                        found_calls.append(arguments)
-                        print(f"[DEBUG] Found {tool_name} call with arguments: {arguments}", flush=True)
-
-                        # 检查参数匹配（None作为通配符）
-                        if param_match_mode == "contains":
-                            # 子串匹配：检查参数值中是否包含期望的子串
-                            matched = all(
-                                v is None or str(v).lower() in str(arguments.get(k, "")).lower()
-                                for k, v in expected_params.items()
-                            )
-                        else:
-                            # 精确匹配（默认）
-                            matched = all(
-                                arguments.get(k) == v
-                                for k, v in expected_params.items()
-                                if v is not None
-                            )
+        # 从工具调用索引中查找（每个样本只解析一次conversation_history）
+        tool_index = ToolCallIndex.ensure(conversation_history)
+        found_calls = [call for call in tool_index.calls_of(tool_name) if call.arguments is not None]
+        matched_calls = tool_index.find(tool_name, expected_params, param_match_mode)
+        matched_count = len(matched_calls)
 
-                        print(f"[DEBUG] Matching result: {matched}", flush=True)
-                        if not matched:
-                            print(f"[DEBUG] Mismatch details:", flush=True)
-                            for k, v in expected_params.items():
-                                if v is not None:
-                                    actual_v = arguments.get(k)
-                                    print(f"[DEBUG]   expected[{k}]={v}, actual[{k}]={actual_v}, match={actual_v==v}", flush=True)
-
-                        if matched:
-                            matched_count += 1
-
-        print(f"[DEBUG] Total found {len(found_calls)} calls, matched {matched_count} calls", flush=True)
+        if logger.isEnabledFor(logging.DEBUG):
+            for call in found_calls:
+                logger.debug("[DEBUG] Found %s call with arguments: %s, matched=%s",
+                             tool_name, call.arguments, call in matched_calls)
+        logger.debug("[DEBUG] Total found %d calls, matched %d calls", len(found_calls), matched_count)
 
         if matched_count >= min_count:
             return create_check_item_result(
@@ -1841,17 +2178,16 @@ class ToolCalledWithParamsChecker:
 class ToolCallAbsenceChecker:
     """工具调用缺失检查器"""
 
-    def check(self, params: Dict, conversation_history: List[Dict]) -> Dict:
-        """检查指定的工具是否没有被调用"""
+    def check(self, params: Dict, conversation_history) -> Dict:
+        """检查指定的工具是否没有被调用（conversation_history 也可以直接传入 ToolCallIndex）"""
         forbidden_tools = params.get("forbidden_tools", [])
 
-        called_forbidden_tools = []
-        for message in conversation_history:
-            if message.get("role") == "assistant" and "tool_calls" in message:
-                for tool_call in message["tool_calls"]:
-                    tool_name = tool_call.get("function", {}).get("name", "")
-                    if tool_name in forbidden_tools:
-                        called_forbidden_tools.append(tool_name)
+        tool_index = ToolCallIndex.ensure(conversation_history)
+        forbidden_calls = sorted(
+            (call for tool_name in set(forbidden_tools) for call in tool_index.calls_of(tool_name)),
+            key=lambda call: call.seq
+        )
+        called_forbidden_tools = [call.name for call in forbidden_calls]
 
         if not called_forbidden_tools:
             return create_check_item_result(
@@ -1865,6 +2201,53 @@ class ToolCallAbsenceChecker:
             )
 
 
+class ToolCallOrderChecker:
+    """工具调用时序断言检查器
+
+    params:
+        assertions: [
+            {"type": "before", "before": {事件}, "after": {事件}, "if_after_missing": "skip"},
+            {"type": "at_least_every", "event": {事件}, "marker": {事件}, "k": 3,
+             "require_trailing_marker": false},
+            {"type": "not_after", "trigger": {事件}, "forbidden": {事件}},
+        ]
+        事件: {"tool_name": 工具名或列表, "expected_params": {...}, "param_match_mode": "exact|contains|prefix"}
+
+    所有断言在一次线性遍历中完成评估；任一断言fail则fail，全部skip则skip，否则pass。
+    """
+
+    def check(self, params: Dict, conversation_history) -> Dict:
+        """检查工具调用顺序（conversation_history 也可以直接传入 ToolCallIndex）"""
+        assertions = params.get("assertions", [])
+        if not assertions:
+            return create_check_item_result("skip", "未配置时序断言", "params.assertions为空")
+
+        tool_index = ToolCallIndex.ensure(conversation_history)
+        try:
+            outcomes = evaluate_order_assertions(tool_index, assertions)
+        except ValueError as e:
+            return create_check_item_result("skip", "时序断言配置错误", str(e))
+
+        logger.debug("[DEBUG] ToolCallOrderChecker: %d calls, outcomes=%s", len(tool_index), outcomes)
+
+        lines = [
+            f"[{o['conclusion']}] {o['type']}{'（' + o['description'] + '）' if o['description'] else ''}: {o['detail']}"
+            for o in outcomes
+        ]
+        conclusions = [o["conclusion"] for o in outcomes]
+        if "fail" in conclusions:
+            failed = conclusions.count("fail")
+            result = create_check_item_result(
+                "fail", f"{failed}/{len(outcomes)} 条时序断言不满足", "\n".join(lines)
+            )
+        elif all(c == "skip" for c in conclusions):
+            result = create_check_item_result("skip", "时序断言涉及的工具调用均未发生", "\n".join(lines))
+        else:
+            result = create_check_item_result("pass", "工具调用顺序符合要求", "\n".join(lines))
+        result["assertion_results"] = outcomes
+        return result
+
+
 # =========================================
 # 6. 语义检查器
 # =========================================
@@ -1875,16 +2258,39 @@ class ToolCallAbsenceChecker:
 # =========================================
 
 class SemanticChecker:
-    """语义检查器（支持response和文件字段）"""
+    """语义检查器（支持response和文件字段）
 
-    def __init__(self, work_dir: str, model_name=None, api_base=None, api_key=None):
+    Prompt缓存布局（prompt_layout="content_first"）：
+    - 正文作为稳定前缀放在最前，业务标准和格式说明放在最后
+    - 同一样本的多个检查项共享相同前缀，provider的prompt缓存可以命中
+    - 命中的token数记录在 result["prompt_cache"] 中
+
+    分级评审（cascade_config）：
+    - 先用廉价预筛模型给出 matched + confidence
+    - 仅当预筛判定不通过、置信度低于阈值、或被抽样审计命中时，才升级到主评审模型
+    - 每个检查项的路由结果记录在 result["judge_routing"] 中
+    """
+
+    def __init__(self, work_dir: str, model_name=None, api_base=None, api_key=None,
+                 cascade_config: Optional[Dict] = None, prompt_layout: str = "criteria_first"):
         self.work_dir = Path(work_dir)
         self.model_name = model_name
         self.api_base = api_base
         self.api_key = api_key
-
-    def check(self, params: Dict, result_data: Dict) -> Dict:
+        # prompt_layout: criteria_first（默认，标准在前）| content_first（正文在前作为稳定前缀，便于prompt缓存）
+        self.prompt_layout = prompt_layout
+        # cascade_config: {model_name, api_base, api_key, confidence_threshold, audit_rate}
+        self.cascade_config = cascade_config if cascade_config and cascade_config.get("model_name") else None
+        # 当前检查项（sample_id, check_id），按线程隔离以支持检查项并发执行
+        self._current = threading.local()
+        # 最近一次分组评审的批次（与judge调用一一对应，用于用量归属）
+        self.last_group_batches: List[List[str]] = []
+
+    def check(self, params: Dict, result_data: Dict, check_id: Optional[str] = None) -> Dict:
         """执行语义检查"""
+        # 分级评审的抽样审计按 (sample_id, check_id) 确定性抽样
+        self._current.sample_id = result_data.get("sample_id") if isinstance(result_data, dict) else None
+        self._current.check_id = check_id
         # 智能判断检查类型：
         # 1. 如果有analysis_target，说明要检查文件内容
         # 2. 否则使用target_type参数
@@ -2122,7 +2528,7 @@ class SemanticChecker:
                                         else:
                                             array_details.append(f"元素{idx+1}: 不匹配 (LLM: {reason})")
                                     else:
-                                        print(f"[DEBUG] LLM调用失败: {llm_response}", flush=True)
+                                        logger.warning("[LLM] 调用失败: %s", llm_response)
                                         # LLM失败时fallback到关键词匹配
                                         if any(kw in str(item_value) for kw in expected_keywords):
                                             array_matched_count += 1
@@ -2131,7 +2537,7 @@ class SemanticChecker:
                                             array_details.append(f"元素{idx+1}: 不匹配 (关键词)")
 
                                 except Exception as e:
-                                    print(f"[DEBUG] LLM调用异常: {str(e)}", flush=True)
+                                    logger.warning("[LLM] 调用异常: %s", e)
                                     # 异常时fallback到关键词匹配
                                     if any(kw in str(item_value) for kw in expected_keywords):
                                         array_matched_count += 1
@@ -2242,11 +2648,11 @@ class SemanticChecker:
                             continue  # LLM判断成功，跳过关键词匹配
                         else:
                             # LLM调用失败，打印错误信息
-                            print(f"[DEBUG] LLM调用失败: {llm_response}", flush=True)
+                            logger.warning("[LLM] 调用失败: %s", llm_response)
 
                     except Exception as e:
                         # LLM调用失败，fallback到关键词匹配
-                        print(f"[DEBUG] LLM调用异常: {str(e)}", flush=True)
+                        logger.warning("[LLM] 调用异常: %s", e)
 
                 # Fallback: 关键词匹配（仅在LLM不可用或失败时使用）
                 if any(kw in str(field_value) for kw in expected_keywords):
@@ -2412,19 +2818,32 @@ class SemanticChecker:
                         f"检查了 {len(matched_files)} 个文件; LLM评估: {reason}"
                     )
             else:
-                print(f"[DEBUG] LLM调用失败: {llm_response}", flush=True)
+                logger.warning("[LLM] 调用失败: %s", llm_response)
                 return create_check_item_result(
                     "fail", "LLM调用失败",
                     f"无法评估文件内容: {llm_response}"
                 )
 
         except Exception as e:
-            print(f"[DEBUG] LLM调用异常: {str(e)}", flush=True)
+            logger.warning("[LLM] 调用异常: %s", e)
             return create_check_item_result(
                 "fail", "检查失败",
                 f"检查过程出错: {str(e)}"
             )
 
+    def _workspace_dir_of(self, matched_files: list) -> Path:
+        """返回匹配文件所在的workspace目录（兼容嵌套的workspace/workspace/）"""
+        workspace_dir = self.work_dir / "workspace"
+        nested_dir = workspace_dir / "workspace"
+        if matched_files and nested_dir.exists():
+            try:
+                Path(matched_files[0]).resolve().relative_to(nested_dir.resolve())
+                return nested_dir
+            except ValueError:
+                pass
+        return workspace_dir
+
+    @traced("io.glob")
     def _glob_files_flexible(self, pattern: str) -> list:
         """
         灵活匹配文件，容错文件命名差异
@@ -2490,7 +2909,7 @@ class SemanticChecker:
 
         return matched_files
 
-    def _check_file_content_raw(self, params: Dict) -> Dict:
+    def _check_file_content_raw(self, params: Dict, prepare_only: bool = False) -> Dict:
         """
         使用raw content进行语义检查（解耦版本）
 
@@ -2501,6 +2920,9 @@ class SemanticChecker:
         - 灵活匹配文件名模式（支持episode_*和episode_*_script混用）
 
         适用场景：语义检查（吸引力、动机深度等）+ 字数统计检查
+
+        prepare_only=True 时不调用LLM，返回分组评审所需的内容载荷
+        （含group_key）；无法分组时返回普通检查结果。
         """
         # 兼容两种参数名：file_pattern（旧）和 analysis_target（新）
         file_pattern = params.get("file_pattern") or params.get("analysis_target")
@@ -2510,7 +2932,7 @@ class SemanticChecker:
         # 检查是否是不需要LLM的程序化检查类型
         validation_rules = params.get("validation_rules", [])
         is_word_count_check = False
-        is_programmatic_check = False  # P1-P5程序化检查标志
+        is_programmatic_check = False  # P1-P6程序化检查标志
         programmatic_method = None  # 具体的程序化检查方法名
         expected_range = None
 
@@ -2527,9 +2949,13 @@ class SemanticChecker:
                     "chapter_completion_ratio",
                     "chapter_length_stability",
                     "paragraph_repetition_detection",
+                    "character_presence_timeline",
                 ):
                     is_programmatic_check = True
                     programmatic_method = validation_method
+                    # 角色出场时间线：结论存疑时升级到LLM judge（需配置criteria）
+                    if validation_method == "character_presence_timeline" and llm_judge_criteria:
+                        use_llm = True
                 elif validation_method == "llm_semantic_analysis":
                     # 自动启用LLM
                     if llm_judge_criteria:
@@ -2558,7 +2984,7 @@ class SemanticChecker:
             if matched_files:
                 all_matched_files.extend(matched_files)
 
-        # word_count_range和P1-P5程序化检查不需要LLM
+        # word_count_range和P1-P6程序化检查不需要LLM
         if not is_word_count_check and not is_programmatic_check and (not use_llm or not llm_judge_criteria):
             return create_check_item_result(
                 "fail", "缺少参数", "llm_semantic_analysis方法需要启用LLM并提供llm_judge_criteria"
@@ -2588,6 +3014,9 @@ class SemanticChecker:
             if workspace_dir.exists():
                 actual_items = []
                 for item in workspace_dir.iterdir():
+                    # MCP服务维护的统计索引不参与白名单对比
+                    if item.name == STATS_FILENAME:
+                        continue
                     # 获取相对名称，目录加/后缀
                     if item.is_dir():
                         actual_items.append(item.name + "/")
@@ -2622,40 +3051,35 @@ class SemanticChecker:
                     matched_files = list(chapters_dir.glob("*"))  # fallback
         # ========== 白名单检查结束 ==========
 
+        # 对文件按名称中的数字排序，确保章节顺序正确
+        matched_files = sorted(matched_files, key=lambda p: _chapter_sort_key(Path(p).name))
+        file_names = [Path(file_path).name for file_path in matched_files]
+
+        # 纯数值检查优先使用workspace/.stats.json（size/mtime与磁盘一致时无需重读章节内容）
+        file_stats = None
+        if is_word_count_check or programmatic_method in (
+            "chapter_length_stability",
+            "alternating_repetition_detection",
+        ):
+            file_stats = lookup_fresh_stats(self._workspace_dir_of(matched_files), matched_files)
+
         # 读取所有文件的raw content
         all_contents = []
-        file_names = []
-        for file_path in matched_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    all_contents.append(content)
-                    file_names.append(Path(file_path).name)
-            except Exception as e:
-                return create_check_item_result(
-                    "fail", "文件读取失败",
-                    f"无法读取 {Path(file_path).name}: {str(e)}"
-                )
-
-        # 对文件按名称中的数字排序，确保章节顺序正确
-        import re as _re
-        def _extract_number(name):
-            """从文件名中提取数字用于排序"""
-            nums = _re.findall(r'\d+', name)
-            return int(nums[0]) if nums else 0
-
-        # 将文件名、内容、路径打包后按数字排序
-        sorted_items = sorted(
-            zip(file_names, all_contents, matched_files),
-            key=lambda x: _extract_number(x[0])
-        )
-        file_names = [item[0] for item in sorted_items]
-        all_contents = [item[1] for item in sorted_items]
-        matched_files = [item[2] for item in sorted_items]
+        if file_stats is None:
+            with tracer.span("io.read_files", files=len(matched_files)):
+                for file_path in matched_files:
+                    try:
+                        with open(file_path, 'r', encoding='utf-8') as f:
+                            all_contents.append(f.read())
+                    except Exception as e:
+                        return create_check_item_result(
+                            "fail", "文件读取失败",
+                            f"无法读取 {Path(file_path).name}: {str(e)}"
+                        )
 
         # 合并所有内容（如果有多个文件）
         if len(matched_files) == 1:
-            combined_content = all_contents[0]
+            combined_content = all_contents[0] if all_contents else ""
             context_info = f"文件: {file_names[0]}"
         else:
             combined_content = "\\n\\n=== 文件分隔 ===\\n\\n".join(
@@ -2677,7 +3101,10 @@ class SemanticChecker:
                 )
 
             # 统计所有文件的总字数
-            total_word_count = sum(len(content) for content in all_contents)
+            if file_stats is not None:
+                total_word_count = sum(entry["char_count"] for entry in file_stats)
+            else:
+                total_word_count = sum(len(content) for content in all_contents)
             min_count, max_count = expected_range
 
             # 判断是否在范围内
@@ -2692,11 +3119,18 @@ class SemanticChecker:
                     f"总字数 {total_word_count} 不在范围 [{min_count}, {max_count}] 内; {context_info}"
                 )
 
-        # ========== P1-P5 程序化检查（不使用LLM）==========
+        # ========== P1-P6 程序化检查（不使用LLM）==========
+        prescreen_info = ""
         if is_programmatic_check:
-            return self._execute_programmatic_check(
-                programmatic_method, params, matched_files, all_contents, file_names, context_info
-            )
+            with tracer.span(f"programmatic.{programmatic_method}"):
+                programmatic_result = self._execute_programmatic_check(
+                    programmatic_method, params, matched_files, all_contents, file_names, context_info,
+                    file_stats=file_stats,
+                )
+            # 程序化结论明确（pass/fail）时直接返回，跳过LLM judge；存疑时升级到LLM
+            if not (programmatic_result.pop("escalate_to_llm", False) and use_llm and llm_judge_criteria):
+                return programmatic_result
+            prescreen_info = f"程序化预筛存疑: {programmatic_result.get('details', '')}"
 
         # 长度限制（避免超过LLM上下文）
         # GPT-5.2 context window = 128K tokens ≈ 175K+ 中文字符可用于内容
@@ -2720,13 +3154,27 @@ class SemanticChecker:
                 "fail", "LLM配置缺失", "语义检查需要LLM配置"
             )
 
+        # 如果 criteria 自身已包含结构化输出格式说明（如 flaws 数组），
+        # 不追加通用的简化格式提示，避免覆盖 criteria 的精确输出要求
+        criteria_has_structured_output = (
+            '"flaws"' in llm_judge_criteria or '"flaw_count"' in llm_judge_criteria
+        )
+
+        if prepare_only:
+            # 结构化输出/程序化预筛升级的检查项不参与分组，保持单独评审
+            if criteria_has_structured_output or prescreen_info:
+                return create_check_item_result("skip", "不参与分组评审", "")
+            return {
+                "group_key": tuple(str(p) for p in matched_files),
+                "criteria": llm_judge_criteria,
+                "combined_content": combined_content,
+                "context_info": context_info,
+                "file_count": len(matched_files),
+                "whitelist_check_info": whitelist_check_info,
+            }
+
         try:
             # 构造LLM prompt
-            # 如果 criteria 自身已包含结构化输出格式说明（如 flaws 数组），
-            # 不追加通用的简化格式提示，避免覆盖 criteria 的精确输出要求
-            criteria_has_structured_output = (
-                '"flaws"' in llm_judge_criteria or '"flaw_count"' in llm_judge_criteria
-            )
 
             if criteria_has_structured_output:
                 # criteria 已定义了完整的输出格式（含 flaws 等结构化字段），
@@ -2748,7 +3196,18 @@ class SemanticChecker:
                     f'{{"matched": true/false, "reason": "详细说明评估依据，包括具体的优点或不足"}}'
                 )
 
-            prompt = f"""请评估以下内容是否符合业务标准。
+            if self.prompt_layout == "content_first":
+                prompt_prefix = build_content_prefix(context_info, combined_content)
+                prompt = f"""{prompt_prefix}请评估以上内容是否符合业务标准。
+
+**业务标准：**
+{llm_judge_criteria}
+
+{format_instruction}
+"""
+            else:
+                prompt_prefix = ""
+                prompt = f"""请评估以下内容是否符合业务标准。
 
 **业务标准：**
 {llm_judge_criteria}
@@ -2759,12 +3218,19 @@ class SemanticChecker:
 {format_instruction}
 """
 
-            success, llm_response = request_llm_with_litellm(
-                [{"role": "user", "content": prompt}],
-                self.model_name,
-                self.api_base,
-                self.api_key
-            )
+            # 分级评审：结构化输出（flaws等）的检查项仍直接交给主评审模型
+            routing = None
+            usage = {}
+            if self.cascade_config and not criteria_has_structured_output:
+                success, llm_response, routing = self._judge_with_cascade(prompt, usage_out=usage)
+            else:
+                success, llm_response = request_llm_with_litellm(
+                    [{"role": "user", "content": prompt}],
+                    self.model_name,
+                    self.api_base,
+                    self.api_key,
+                    usage_out=usage
+                )
 
             if success:
                 llm_result = safe_json_extract_single(llm_response)
@@ -2794,22 +3260,251 @@ class SemanticChecker:
                     result["flaw_count"] = flaw_count if flaw_count is not None else len(flaws)
                     result["flaws"] = flaws
 
+                # 程序化预筛存疑后升级的检查，保留预筛证据
+                if prescreen_info:
+                    result["programmatic_prescreen"] = prescreen_info
+
+                if routing:
+                    result["judge_routing"] = routing
+
+                if prompt_prefix:
+                    result["prompt_cache"] = {
+                        "layout": self.prompt_layout,
+                        "prefix_chars": len(prompt_prefix),
+                        "prompt_tokens": usage.get("prompt_tokens", 0),
+                        "cached_tokens": usage.get("cached_tokens", 0),
+                    }
+
                 return result
             else:
-                print(f"[DEBUG] LLM调用失败: {llm_response}", flush=True)
-                return create_check_item_result(
+                logger.warning("[LLM] 调用失败: %s", llm_response)
+                result = create_check_item_result(
                     "fail", "LLM调用失败",
                     f"无法评估内容: {llm_response}"
                 )
+                if routing:
+                    result["judge_routing"] = routing
+                return result
 
         except Exception as e:
-            print(f"[DEBUG] LLM调用异常: {str(e)}", flush=True)
+            logger.warning("[LLM] 调用异常: %s", e)
             return create_check_item_result(
                 "fail", "检查失败",
                 f"检查过程出错: {str(e)}"
             )
 
-    # ========== P1-P5 程序化质量检查 ==========
+    # ========== 分组评审（同一份内容 × 多条业务标准，一次调用）==========
+
+    @staticmethod
+    def is_groupable(params: Dict) -> bool:
+        """只有针对文件内容的纯LLM语义检查可以合并评审"""
+        if "analysis_target" not in params and not params.get("use_raw_content"):
+            return False
+        if not params.get("use_llm_judge") or params.get("paired_check_id"):
+            return False
+        validation_rules = params.get("validation_rules") or [{}]
+        first_rule = validation_rules[0] if isinstance(validation_rules[0], dict) else {}
+        return first_rule.get("validation_method", "llm_semantic_analysis") == "llm_semantic_analysis"
+
+    def check_grouped(self, items: List, max_group_size: int = DEFAULT_GROUP_JUDGING_SIZE) -> Dict[str, Dict]:
+        """分组评审：分析对象（匹配到的文件）相同的检查项合并为一次LLM调用
+
+        Args:
+            items: [(check_id, params), ...]，调用方保证 is_groupable(params)
+            max_group_size: 每次调用最多合并的检查项数
+
+        Returns:
+            {check_id: result}；只包含分组评审成功的检查项，缺失/格式错误的由调用方回退单独评审
+        """
+        self.last_group_batches = []
+        if not self.model_name or not self.api_base or not self.api_key:
+            return {}
+
+        groups: Dict[tuple, List] = {}
+        payloads = {}
+        for check_id, params in items:
+            prepared = self._check_file_content_raw(params, prepare_only=True)
+            if "group_key" not in prepared:
+                continue
+            payloads[check_id] = prepared
+            groups.setdefault(prepared["group_key"], []).append(check_id)
+
+        results = {}
+        for group_ids in groups.values():
+            if len(group_ids) < 2:
+                continue
+            for start in range(0, len(group_ids), max(2, max_group_size)):
+                chunk = group_ids[start:start + max(2, max_group_size)]
+                if len(chunk) < 2:
+                    continue
+                # 批次ID = 在 last_group_batches 中的下标，该批次内的judge调用（含重试/预筛）都带此标记
+                with judge_call_batch(len(self.last_group_batches)):
+                    self.last_group_batches.append(chunk)
+                    results.update(self._judge_group(chunk, payloads))
+        return results
+
+    def _judge_group(self, check_ids: List[str], payloads: Dict[str, Dict]) -> Dict[str, Dict]:
+        """对同一份内容一次性评估多条业务标准，返回按check_id拆分的结果"""
+        shared = payloads[check_ids[0]]
+        criteria_blocks = "\n\n".join(
+            f"### [{check_id}]\n{payloads[check_id]['criteria']}" for check_id in check_ids
+        )
+        keys_example = ", ".join(f'"{check_id}": {{"matched": true/false, "reason": "..."}}' for check_id in check_ids)
+        prompt = f"""{build_content_prefix(shared['context_info'], shared['combined_content'])}请按以下多条业务标准，分别评估以上内容是否符合要求。各条标准独立判断，互不影响。
+
+**业务标准列表：**（共{len(check_ids)}条，ID见方括号）
+{criteria_blocks}
+
+⚠️ 重要说明：
+- 内容可能是JSON格式，也可能不是，请关注语义本身，不要因格式问题影响评估
+- 如果内容被截断，请基于可见部分进行合理推断
+- 重点评估内容质量，而非格式规范
+
+请以JSON对象回复，key为每条业务标准的ID，必须覆盖全部{len(check_ids)}个ID：
+{{{keys_example}}}
+"""
+        print(f"  ↳ 分组评审: {len(check_ids)} 项共享一次调用 ({len(prompt)} 字符): {check_ids}", flush=True)
+        try:
+            success, llm_response = request_llm_with_litellm(
+                [{"role": "user", "content": prompt}],
+                self.model_name,
+                self.api_base,
+                self.api_key
+            )
+            llm_result = safe_json_extract_single(llm_response) if success else {}
+        except Exception as e:
+            logger.warning("[分组评审] 失败，回退单独评审: %s", e)
+            return {}
+
+        results = {}
+        for check_id in check_ids:
+            verdict = llm_result.get(check_id)
+            if not isinstance(verdict, dict) or not isinstance(verdict.get("matched"), bool):
+                continue
+            payload = payloads[check_id]
+            extra_info = f"; {payload['whitelist_check_info']}" if payload["whitelist_check_info"] else ""
+            reason = verdict.get("reason", "")
+            if verdict["matched"]:
+                result = create_check_item_result(
+                    "pass", "内容符合标准 (LLM语义判断-分组模式)",
+                    f"检查了{payload['file_count']}个文件{extra_info}; LLM评估: {reason}"
+                )
+            else:
+                result = create_check_item_result(
+                    "fail", "内容不符合标准 (LLM语义判断-分组模式)",
+                    f"检查了{payload['file_count']}个文件{extra_info}; LLM评估: {reason}"
+                )
+            result["group_judging"] = {
+                "group": check_ids,
+                "group_size": len(check_ids),
+                "prompt_chars": len(prompt),
+            }
+            results[check_id] = result
+
+        missing = [check_id for check_id in check_ids if check_id not in results]
+        if missing:
+            print(f"  ↳ 分组评审结果缺失或格式错误，将单独重跑: {missing}", flush=True)
+        return results
+
+    # ========== 分级评审（预筛模型 → 主评审模型）==========
+
+    def _cascade_audit_sampled(self) -> bool:
+        """按 (sample_id, check_id) 的hash确定性抽样，同一检查项重跑时抽样结果不变"""
+        audit_rate = float(self.cascade_config.get("audit_rate", DEFAULT_CASCADE_AUDIT_RATE))
+        if audit_rate <= 0:
+            return False
+        key = f"{getattr(self._current, 'sample_id', None)}|{getattr(self._current, 'check_id', None)}".encode("utf-8")
+        bucket = int(hashlib.md5(key).hexdigest()[:8], 16) / 0xFFFFFFFF
+        return bucket < audit_rate
+
+    def _judge_with_cascade(self, prompt: str, usage_out: Optional[Dict] = None):
+        """分级评审：预筛模型判定明确通过时直接采用，否则升级到主评审模型
+
+        Returns:
+            (success, llm_response, routing)
+            routing: {route: prescreen|escalated|audit, prescreen_model, prescreen_verdict,
+                      prescreen_confidence, primary_verdict, agreement, escalation_reason,
+                      prompt_chars, primary_calls_saved, input_chars_saved}
+        """
+        cfg = self.cascade_config
+        threshold = float(cfg.get("confidence_threshold", DEFAULT_CASCADE_CONFIDENCE))
+        routing = {
+            "route": "escalated",
+            "prescreen_model": cfg.get("model_name"),
+            "prescreen_verdict": None,
+            "prescreen_confidence": None,
+            "primary_verdict": None,
+            "agreement": None,
+            "escalation_reason": "",
+            "prompt_chars": len(prompt),
+            "primary_calls_saved": 0,
+            "input_chars_saved": 0,
+        }
+
+        pre_usage = {}
+        pre_success, pre_response = request_llm_with_litellm(
+            [{"role": "user", "content": prompt + CASCADE_CONFIDENCE_INSTRUCTION}],
+            cfg.get("model_name"),
+            cfg.get("api_base") or self.api_base,
+            cfg.get("api_key") or self.api_key,
+            max_retries=int(cfg.get("max_retries", 3)),
+            usage_out=pre_usage,
+        )
+
+        pre_result = None
+        if pre_success:
+            try:
+                pre_result = safe_json_extract_single(pre_response)
+            except ValueError:
+                pre_result = None
+
+        if pre_result is None:
+            routing["escalation_reason"] = "预筛调用失败或返回无法解析"
+        else:
+            pre_verdict = pre_result.get("matched")
+            try:
+                confidence = float(pre_result.get("confidence"))
+            except (TypeError, ValueError):
+                confidence = None
+            routing["prescreen_verdict"] = pre_verdict if isinstance(pre_verdict, bool) else None
+            routing["prescreen_confidence"] = confidence
+
+            if pre_verdict is not True:
+                routing["escalation_reason"] = "预筛判定不通过"
+            elif confidence is None or confidence < threshold:
+                routing["escalation_reason"] = f"预筛置信度低于阈值{threshold}"
+            elif self._cascade_audit_sampled():
+                routing["route"] = "audit"
+                routing["escalation_reason"] = "抽样审计"
+            else:
+                routing["route"] = "prescreen"
+                routing["primary_calls_saved"] = 1
+                routing["input_chars_saved"] = len(prompt)
+                print(f"  ↳ 预筛模型 {cfg.get('model_name')} 判定通过 (confidence={confidence:.2f})，跳过主评审", flush=True)
+                if usage_out is not None:
+                    usage_out.update(pre_usage)
+                return True, pre_response, routing
+
+        print(f"  ↳ 升级到主评审模型 {self.model_name}: {routing['escalation_reason']}", flush=True)
+        success, llm_response = request_llm_with_litellm(
+            [{"role": "user", "content": prompt}],
+            self.model_name,
+            self.api_base,
+            self.api_key,
+            usage_out=usage_out
+        )
+        if success:
+            try:
+                primary_verdict = safe_json_extract_single(llm_response).get("matched", False)
+            except ValueError:
+                primary_verdict = None
+            if primary_verdict is not None:
+                routing["primary_verdict"] = bool(primary_verdict)
+                if routing["prescreen_verdict"] is not None:
+                    routing["agreement"] = routing["prescreen_verdict"] == routing["primary_verdict"]
+        return success, llm_response, routing
+
+    # ========== P1-P6 程序化质量检查 ==========
 
     def _execute_programmatic_check(
         self,
@@ -2819,22 +3514,28 @@ class SemanticChecker:
         all_contents: list,
         file_names: list,
         context_info: str,
+        file_stats: Optional[list] = None,
     ) -> Dict:
-        """P1-P5程序化内容质量检查的分发入口。
+        """P1-P6程序化内容质量检查的分发入口。
 
         所有检查纯程序化实现，不调用LLM，检测成本为零。
+        file_stats为workspace/.stats.json中与文件一一对应的统计条目（P2/P4可直接使用，无需读取内容）。
         """
         try:
             if method == "chapter_cloning_detection":
                 return self._check_chapter_cloning(matched_files, all_contents, file_names)
             elif method == "alternating_repetition_detection":
-                return self._check_alternating_repetition(matched_files, all_contents, file_names)
+                sizes = [entry["size"] for entry in file_stats] if file_stats is not None else None
+                return self._check_alternating_repetition(matched_files, all_contents, file_names, sizes=sizes)
             elif method == "chapter_completion_ratio":
                 return self._check_chapter_completion(params, matched_files, file_names)
             elif method == "chapter_length_stability":
-                return self._check_chapter_length_stability(all_contents, file_names)
+                char_counts = [entry["char_count"] for entry in file_stats] if file_stats is not None else None
+                return self._check_chapter_length_stability(all_contents, file_names, char_counts=char_counts)
             elif method == "paragraph_repetition_detection":
                 return self._check_paragraph_repetition(all_contents, file_names)
+            elif method == "character_presence_timeline":
+                return self._check_character_presence_timeline(params, all_contents, file_names)
             else:
                 return create_check_item_result(
                     "skip", f"未知的程序化检查方法: {method}", ""
@@ -2928,7 +3629,7 @@ class SemanticChecker:
         )
 
     def _check_alternating_repetition(
-        self, matched_files: list, all_contents: list, file_names: list
+        self, matched_files: list, all_contents: list, file_names: list, sizes: Optional[list] = None
     ) -> Dict:
         """P2: 交替重复检测（A-B-A-B循环模式）。
 
@@ -2937,12 +3638,13 @@ class SemanticChecker:
         2. 检测是否存在 size_A, size_B 交替出现的模式（容差5%）
         3. 连续交替 >= 3 轮（即6章） → fail
         """
-        if len(all_contents) < 8:
+        if len(file_names) < 8:
             return create_check_item_result(
-                "skip", "章节数不足", f"仅{len(all_contents)}章，跳过交替重复检测（需>=8章）"
+                "skip", "章节数不足", f"仅{len(file_names)}章，跳过交替重复检测（需>=8章）"
             )
 
-        sizes = [len(content.encode("utf-8")) for content in all_contents]
+        if sizes is None:
+            sizes = [len(content.encode("utf-8")) for content in all_contents]
 
         # 从后半部分开始检测（交替重复通常出现在后期）
         half = len(sizes) // 2
@@ -2994,7 +3696,7 @@ class SemanticChecker:
             )
 
         return create_check_item_result(
-            "pass", "未检测到交替重复", f"共{len(all_contents)}章，无A-B-A-B交替模式"
+            "pass", "未检测到交替重复", f"共{len(file_names)}章，无A-B-A-B交替模式"
         )
 
     def _check_chapter_completion(
@@ -3080,7 +3782,7 @@ class SemanticChecker:
         )
 
     def _check_chapter_length_stability(
-        self, all_contents: list, file_names: list
+        self, all_contents: list, file_names: list, char_counts: Optional[list] = None
     ) -> Dict:
         """P4: 章节长度稳定性检测。
 
@@ -3089,13 +3791,14 @@ class SemanticChecker:
         2. 后1/4 < 前1/3 × 0.50 → fail（后段萎缩过半）
         3. 后1/4中任何单章 < 200字 → fail（极端退化）
         """
-        n = len(all_contents)
+        n = len(file_names)
         if n < 6:
             return create_check_item_result(
                 "skip", "章节数不足", f"仅{n}章，跳过长度稳定性检测（需>=6章）"
             )
 
-        char_counts = [len(content) for content in all_contents]
+        if char_counts is None:
+            char_counts = [len(content) for content in all_contents]
 
         # 前1/3
         first_n = max(n // 3, 2)
@@ -3221,6 +3924,138 @@ class SemanticChecker:
             f"同章内重复{intra_count}处, 跨章重复{cross_count}组 (阈值: 同章>=2, 跨章>=5)",
         )
 
+    def _check_character_presence_timeline(
+        self, params: Dict, all_contents: list, file_names: list
+    ) -> Dict:
+        """P6: 角色出场时间线检测（主角中途消失 / 未设计角色喧宾夺主）。
+
+        检测逻辑:
+        1. 从characters.json读取主角（含别名、三字名的名）和配角，构建 章节×角色 出现次数矩阵
+        2. 从正文对话/动作语境中提取characters.json之外的高频人名，一并计入矩阵
+        3. 主角从未出现，或末尾连续缺席 >= max(3, 章节数×disappearance_ratio) 章 → fail
+        4. 未设计角色在后1/3章节的提及数 >= takeover_min_mentions 且超过所有主角、前1/3几乎未出现 → fail
+        5. 末尾缺席>=2章，或未设计角色提及数达到主角的一半 → 存疑，标记escalate_to_llm交给LLM judge
+        6. 其余情况 → pass（跳过LLM judge）
+        """
+        import math
+
+        rule = (params.get("validation_rules") or [{}])[0]
+        disappearance_ratio = rule.get("disappearance_ratio", 0.30)
+        takeover_min_mentions = rule.get("takeover_min_mentions", 20)
+        min_chapters = rule.get("min_chapters", 4)
+
+        def _escalate(reason, details):
+            result = create_check_item_result("skip", reason, details)
+            result["escalate_to_llm"] = True
+            return result
+
+        # 只保留章节文件（analysis_target可能带 + characters.json）
+        chapters = [
+            (name, content) for name, content in zip(file_names, all_contents)
+            if name.endswith(".md")
+        ]
+        n = len(chapters)
+        if n < min_chapters:
+            return _escalate("章节数不足，无法判断出场时间线", f"仅{n}章（需>={min_chapters}章）")
+
+        characters_path = self.work_dir / "workspace" / "characters.json"
+        if not characters_path.exists():
+            characters_path = self.work_dir / "workspace" / "workspace" / "characters.json"
+        characters_data = None
+        if characters_path.exists():
+            try:
+                with open(characters_path, "r", encoding="utf-8") as f:
+                    characters_data = json.load(f)
+            except Exception:
+                characters_data = None
+        if not isinstance(characters_data, dict):
+            return _escalate("characters.json缺失或无法解析", f"路径: {characters_path}")
+
+        main_aliases = {}
+        for char in characters_data.get("main_characters", []) or []:
+            forms = character_aliases(char)
+            if forms:
+                main_aliases[forms[0]] = forms
+        supporting_forms = []
+        for char in characters_data.get("supporting_characters", []) or []:
+            supporting_forms.extend(character_aliases(char))
+        if not main_aliases:
+            return _escalate("characters.json中没有可用的主角名", "main_characters为空或缺少name")
+
+        designed_forms = [f for forms in main_aliases.values() for f in forms] + supporting_forms
+        undesigned = extract_frequent_names(
+            (content for _, content in chapters), designed_forms
+        )
+
+        aliases = dict(main_aliases)
+        for name in undesigned:
+            aliases.setdefault(name, [name])
+        presence = scan_presence(CharacterMatcher(aliases), chapters)
+        matrix = presence["matrix"]
+        summary = presence["characters"]
+
+        window = max(2, n // 3)
+        fail_gap = max(3, math.ceil(n * disappearance_ratio))
+
+        failures = []
+        doubts = []
+        timeline = {}
+        for name in main_aliases:
+            info = summary[name]
+            trailing_absence = n if info["last_index"] is None else n - 1 - info["last_index"]
+            timeline[name] = {
+                "count": info["count"],
+                "chapters_present": info["chapters_present"],
+                "first_chapter": info["first_chapter"],
+                "last_chapter": info["last_chapter"],
+                "trailing_absence": trailing_absence,
+            }
+            if info["count"] == 0:
+                failures.append(f"主角{name}全文未出现")
+            elif trailing_absence >= fail_gap:
+                failures.append(f"主角{name}在{info['last_chapter']}后消失（末尾连续{trailing_absence}章未出现）")
+            elif trailing_absence >= 2:
+                doubts.append(f"主角{name}末尾连续{trailing_absence}章未出现")
+
+        top_main_late = max(sum(matrix[name][-window:]) for name in main_aliases)
+        undesigned_info = {}
+        for name in undesigned:
+            early = sum(matrix[name][:window])
+            late = sum(matrix[name][-window:])
+            undesigned_info[name] = {"early": early, "late": late, "total": summary[name]["count"]}
+            if early > 2:
+                continue
+            if late >= takeover_min_mentions and late > top_main_late:
+                failures.append(
+                    f"未设计角色{name}在后{window}章被提及{late}次，超过所有主角（最高{top_main_late}次）"
+                )
+            elif late >= takeover_min_mentions // 2 and late * 2 >= top_main_late:
+                doubts.append(f"未设计角色{name}在后{window}章被提及{late}次（主角最高{top_main_late}次）")
+
+        details = (
+            f"共{n}章; 主角出场: "
+            + ", ".join(
+                f"{name}({t['chapters_present']}章, {t['first_chapter']}~{t['last_chapter']})"
+                for name, t in timeline.items()
+            )
+        )
+        if undesigned_info:
+            details += "; 未设计高频人名: " + ", ".join(
+                f"{name}(前{window}章{i['early']}次/后{window}章{i['late']}次)"
+                for name, i in undesigned_info.items()
+            )
+
+        if failures:
+            result = create_check_item_result("fail", "; ".join(failures), details)
+        elif doubts:
+            result = _escalate("角色出场模式存疑: " + "; ".join(doubts), details)
+        else:
+            result = create_check_item_result("pass", "主角贯穿全文，无未设计角色喧宾夺主", details)
+        result["character_timeline"] = timeline
+        if undesigned_info:
+            result["undesigned_names"] = undesigned_info
+        return result
+
 
 # =========================================
 # 7. 主执行逻辑
@@ -3370,6 +4205,9 @@ def _check_file_whitelist(check_item: Dict, work_dir: Path) -> Dict:
         # __pycache__ 等Python缓存目录不算违规
         if name == "__pycache__":
             continue
+        # MCP服务维护的统计索引不算违规
+        if name == STATS_FILENAME:
+            continue
         extra_files.append(name)
     
     if extra_files:
@@ -3448,7 +4286,7 @@ def _split_result_by_fixability(original_result: Dict, fixability_filter: str, c
 
 
 def execute_checks(sample_result: Dict, check_list: List[Dict],
-                  model_config: Dict = None) -> Dict:
+                  model_config: Dict = None, reused_results: Optional[Dict[str, Dict]] = None) -> Dict:
     """
     执行所有检查项
 
@@ -3456,6 +4294,8 @@ def execute_checks(sample_result: Dict, check_list: List[Dict],
         sample_result: sample执行结果（包含conversation_history和workspace路径）
         check_list: 检查项列表（来自unified_scenario_design.yaml）
         model_config: LLM配置
+        reused_results: check_id → 直接沿用的已有结果（增量recheck）。对应检查项仍需在check_list中，
+            以保留指向它们的depends_on依赖边；不重新执行，也不出现在返回的check_details中
 
     Returns:
         {
@@ -3479,6 +4319,10 @@ def execute_checks(sample_result: Dict, check_list: List[Dict],
             "error": f"workspace路径不存在: {workspace_path}"
         }
 
+    # 工具调用索引：每个样本只解析一次conversation_history，供所有工具调用类检查查询
+    with tracer.span("tool_call_index"):
+        tool_index = ToolCallIndex(conversation_history)
+
     # 获取workspace的父目录作为work_dir
     # FileSystemChecker等依赖这个路径结构（work_dir/workspace/）
     work_dir = workspace_path.parent
@@ -3493,6 +4337,7 @@ def execute_checks(sample_result: Dict, check_list: List[Dict],
     cross_checker = CrossFileConsistencyChecker(str(work_dir))
     tool_checker = ToolCalledWithParamsChecker(str(work_dir))
     tool_absence_checker = ToolCallAbsenceChecker()
+    tool_order_checker = ToolCallOrderChecker()
     
     # SemanticChecker需要LLM配置
     semantic_checker = None
@@ -3501,7 +4346,9 @@ def execute_checks(sample_result: Dict, check_list: List[Dict],
             str(work_dir),
             model_config.get("model_name"),
             model_config.get("api_base"),
-            model_config.get("api_key")
+            model_config.get("api_key"),
+            cascade_config=model_config.get("cascade"),
+            prompt_layout=model_config.get("prompt_layout") or "criteria_first"
         )
 
     # 篇幅自适应：ULTRA_SHORT 样本跳过不适用的流程类检查项
@@ -3513,98 +4360,368 @@ def execute_checks(sample_result: Dict, check_list: List[Dict],
     }
     is_ultra_short = "ULTRA_SHORT" in sample_id
 
+    # 检查项依赖DAG：前置条件失败的检查项直接产出dependency_failure结果，互不依赖的分支可并发执行
+    dag_nodes, dag_warnings = build_check_dag(check_list)
+    for warning in dag_warnings:
+        logger.warning("[依赖DAG] %s", warning)
+    dependency_skip = model_config.get("dependency_skip", True) if model_config else True
+    check_concurrency = int(model_config.get("check_concurrency") or 1) if model_config else 1
+
     # 执行所有检查
-    check_details = {}
     # 配对检查项缓存：存储共享 LLM judge 调用的原始结果（含完整 flaws）
     # key = paired_check_id 或 check_id，value = 原始 LLM 结果（含 flaws 数组）
     paired_check_cache = {}
+    grouped_results = {}
+    group_candidate_ids = set()
+    group_usage: Dict[str, Dict] = {}  # check_id → 归属到该项的分组评审调用用量
 
-    for i, check_item in enumerate(check_list, 1):
-        # 优先使用语义化 check_id，兜底用位置编号（向后兼容）
-        check_idx = check_item.get("check_id", f"检查项{i}")
+    def _attach_metadata(result: Dict, check_item: Dict) -> Dict:
+        result["description"] = check_item.get("description", "")
+        result["check_type"] = check_item.get("check_type")
+        for key in ["dimension_id", "subcategory_id", "quality_tier", "is_critical"]:
+            if key in check_item:
+                result[key] = check_item[key]
+        return result
+
+    def _run_check(node) -> Dict:
+        check_item = node.item
+        check_idx = node.check_id
         check_type = check_item.get("check_type")
         description = check_item.get("description", "")
-        
-        print(f"\033[1;36m[执行] {check_idx}: {description} ({check_type})...\033[0m", flush=True)
 
-        # 篇幅自适应skip
-        subcategory_id = check_item.get("subcategory_id", "")
-        if is_ultra_short and subcategory_id in ULTRA_SHORT_SKIP_SUBCATEGORIES:
-            result = create_check_item_result(
-                "skip", f"ULTRA_SHORT篇幅不适用", f"subcategory={subcategory_id}"
-            )
-            result["description"] = description
-            result["check_type"] = check_type
-            for key in ["dimension_id", "subcategory_id", "quality_tier", "is_critical"]:
-                if key in check_item:
-                    result[key] = check_item[key]
-            check_details[check_idx] = result
-            print(f"  ⊘ skip (ULTRA_SHORT不适用: {subcategory_id})", flush=True)
-            continue
-
-        # 配对检查项：检查是否有已缓存的共享 LLM 结果可复用
-        params = check_item.get("params", {})
-        paired_check_id = params.get("paired_check_id")
-        fixability_filter = params.get("fixability_filter")
-
-        if paired_check_id and fixability_filter and paired_check_id in paired_check_cache:
-            # 复用已缓存的 LLM 结果，按 fixability_filter 拆分
-            cached_result = paired_check_cache[paired_check_id]
-            result = _split_result_by_fixability(cached_result, fixability_filter, check_idx)
-            print(f"  ↳ 复用配对检查 [{paired_check_id}] 的 LLM 结果，过滤 fixability={fixability_filter}", flush=True)
-        else:
-            # 正常执行检查
-            # 根据check_type分发到对应的checker
-            if check_type == "entity_attribute_equals":
-                result = fs_checker.check_entity_attribute_equals(check_item)
-            elif check_type == "create_operation_verified":
-                result = fs_checker.check_create_operation_verified(check_item)
-            elif check_type == "json_schema":
-                result = schema_checker.check(check_item.get("params", {}))
-            elif check_type == "cross_file_consistency":
-                result = cross_checker.check(check_item.get("params", {}))
-            elif check_type == "tool_called_with_params":
-                result = tool_checker.check(check_item.get("params", {}), conversation_history)
-            elif check_type == "tool_call_absence":
-                result = tool_absence_checker.check(check_item.get("params", {}), conversation_history)
-            elif check_type == "semantic_check":
-                if semantic_checker:
-                    result = semantic_checker.check(check_item.get("params", {}), sample_result)
-                else:
-                    result = create_check_item_result(
-                        "skip", "缺少LLM配置", "semantic_check需要LLM模型配置"
-                    )
-            elif check_type == "file_whitelist_check":
-                result = _check_file_whitelist(check_item, work_dir)
-            elif check_type == "sop_stage_coverage":
-                result = _check_sop_stage_coverage(check_item, work_dir)
-            else:
+        print(f"\033[1;36m[执行] {check_idx}: {description} ({check_type})...\033[0m", flush=True)
+        start_judge_usage_capture()
+        with tracer.span("check", check_id=check_idx, check_type=check_type):
+            # 篇幅自适应skip
+            subcategory_id = check_item.get("subcategory_id", "")
+            if is_ultra_short and subcategory_id in ULTRA_SHORT_SKIP_SUBCATEGORIES:
                 result = create_check_item_result(
-                    "skip", f"不支持的检查类型: {check_type}", ""
+                    "skip", f"ULTRA_SHORT篇幅不适用", f"subcategory={subcategory_id}"
                 )
+                stop_judge_usage_capture()
+                print(f"  ⊘ skip (ULTRA_SHORT不适用: {subcategory_id})", flush=True)
+                return _attach_metadata(result, check_item)
+
+            # 配对检查项：检查是否有已缓存的共享 LLM 结果可复用
+            params = check_item.get("params", {})
+            paired_check_id = params.get("paired_check_id")
+            fixability_filter = params.get("fixability_filter")
+
+            if paired_check_id and fixability_filter and paired_check_id in paired_check_cache:
+                # 复用已缓存的 LLM 结果，按 fixability_filter 拆分
+                cached_result = paired_check_cache[paired_check_id]
+                result = _split_result_by_fixability(cached_result, fixability_filter, check_idx)
+                print(f"  ↳ 复用配对检查 [{paired_check_id}] 的 LLM 结果，过滤 fixability={fixability_filter}", flush=True)
+            else:
+                # 正常执行检查
+                # 根据check_type分发到对应的checker
+                with tracer.span(f"checker.{check_type}"):
+                    if check_type == "entity_attribute_equals":
+                        result = fs_checker.check_entity_attribute_equals(check_item)
+                    elif check_type == "create_operation_verified":
+                        result = fs_checker.check_create_operation_verified(check_item)
+                    elif check_type == "json_schema":
+                        result = schema_checker.check(check_item.get("params", {}))
+                    elif check_type == "cross_file_consistency":
+                        result = cross_checker.check(check_item.get("params", {}))
+                    elif check_type == "tool_called_with_params":
+                        result = tool_checker.check(check_item.get("params", {}), tool_index)
+                    elif check_type == "tool_call_absence":
+                        result = tool_absence_checker.check(check_item.get("params", {}), tool_index)
+                    elif check_type == "tool_call_order":
+                        result = tool_order_checker.check(check_item.get("params", {}), tool_index)
+                    elif check_type == "semantic_check":
+                        if check_idx in grouped_results:
+                            result = grouped_results[check_idx]
+                            print(f"  ↳ 使用分组评审结果", flush=True)
+                        elif semantic_checker:
+                            result = semantic_checker.check(check_item.get("params", {}), sample_result, check_id=check_idx)
+                            if grouped_results and check_idx in group_candidate_ids:
+                                result["group_judging"] = {"fallback": True}
+                        else:
+                            result = create_check_item_result(
+                                "skip", "缺少LLM配置", "semantic_check需要LLM模型配置"
+                            )
+                    elif check_type == "file_whitelist_check":
+                        result = _check_file_whitelist(check_item, work_dir)
+                    elif check_type == "sop_stage_coverage":
+                        result = _check_sop_stage_coverage(check_item, work_dir)
+                    else:
+                        result = create_check_item_result(
+                            "skip", f"不支持的检查类型: {check_type}", ""
+                        )
 
-            # 如果当前检查项是配对检查的一方，缓存完整结果供配对方复用
-            if paired_check_id and fixability_filter:
-                paired_check_cache[check_idx] = result
-                # 对当前项也按 fixability_filter 拆分
-                result = _split_result_by_fixability(result, fixability_filter, check_idx)
+                # 如果当前检查项是配对检查的一方，缓存完整结果供配对方复用
+                if paired_check_id and fixability_filter:
+                    paired_check_cache[check_idx] = result
+                    # 对当前项也按 fixability_filter 拆分
+                    result = _split_result_by_fixability(result, fixability_filter, check_idx)
+
+            # judge调用用量（token/耗时/重试），只记录实际发生了LLM调用的检查项
+            judge_usage = aggregate_judge_calls(stop_judge_usage_capture())
+            shared_usage = group_usage.get(check_idx)
+            if judge_usage or shared_usage:
+                result["judge_usage"] = merge_judge_usage([result.get("judge_usage"), shared_usage, judge_usage])
+                if shared_usage and shared_usage.get("shared_with"):
+                    result["judge_usage"]["shared_with"] = shared_usage["shared_with"]
+
+            return _attach_metadata(result, check_item)
+
+    def _on_blocked(node, blocked_by: List[str], results: Dict[str, Dict]) -> Optional[Dict]:
+        result = dependency_failure_result(node, blocked_by, results, create_check_item_result)
+        if result is None:
+            return None
+        print(f"\033[1;33m[跳过] {node.check_id}: {result['reason']}\033[0m", flush=True)
+        return _attach_metadata(result, node.item)
+
+    # 分组评审（可选）：分析对象相同的LLM语义检查合并为一次调用，缺失/格式错误的项回退单独评审
+    # 先执行文件前置检查（无LLM开销），前置失败的候选项不参与分组评审
+    precomputed = {check_id: result for check_id, result in (reused_results or {}).items()
+                   if check_id in dag_nodes}
+    if semantic_checker and model_config.get("group_judging"):
+        if dependency_skip:
+            for node in dag_nodes.values():
+                if node.check_id not in precomputed and not node.upstream and produced_paths(node.item):
+                    precomputed[node.check_id] = _run_check(node)
+        group_candidates = []
+        for node in dag_nodes.values():
+            check_item = node.item
+            params = check_item.get("params", {})
+            if node.check_id in precomputed:
+                continue
+            if check_item.get("check_type") != "semantic_check" or not SemanticChecker.is_groupable(params):
+                continue
+            if is_ultra_short and check_item.get("subcategory_id", "") in ULTRA_SHORT_SKIP_SUBCATEGORIES:
+                continue
+            if dependency_skip and all(dep in precomputed for dep in node.upstream) \
+                    and blocking_preconditions(node, precomputed):
+                continue
+            group_candidates.append((node.check_id, params))
+        if len(group_candidates) >= 2:
+            print(f"\033[1;36m[分组评审] {len(group_candidates)} 个候选检查项\033[0m", flush=True)
+            start_judge_usage_capture()
+            with tracer.span("judge.grouped", candidates=len(group_candidates)):
+                grouped_results = semantic_checker.check_grouped(
+                    group_candidates,
+                    int(model_config.get("group_judging_size") or DEFAULT_GROUP_JUDGING_SIZE)
+                )
+            group_calls = stop_judge_usage_capture()
+            # 分组调用的用量按调用记录上的批次标记归属，整批记在组内第一个拆分成功的检查项上
+            # （shared_with记录共享的检查项数），避免重复计数；整批都未拆分成功时记在第一项上
+            # （该项会回退单独评审，用量与单独评审的用量合并）。没有批次标记的调用归入第一批
+            batches = semantic_checker.last_group_batches
+            calls_by_batch: Dict[int, List[Dict]] = {}
+            for call in group_calls:
+                batch_id = call.get("batch")
+                calls_by_batch.setdefault(batch_id if batch_id is not None else 0, []).append(call)
+            for batch_id, calls in calls_by_batch.items():
+                if batch_id >= len(batches):
+                    continue
+                group_ids = batches[batch_id]
+                owner = next((check_id for check_id in group_ids if check_id in grouped_results), group_ids[0])
+                for call in calls:
+                    call["shared_with"] = len(group_ids)
+                group_usage[owner] = aggregate_judge_calls(calls)
+        group_candidate_ids = {check_id for check_id, _ in group_candidates}
+
+    # 正文在前的prompt布局：同一分析对象的语义检查连续执行，保持provider端前缀缓存温热
+    # （稳定排序，同组内保持原有相对顺序；输出仍按check_list顺序）
+    execution_order = [(node.position, node.item) for node in dag_nodes.values()]
+    if semantic_checker and semantic_checker.prompt_layout == "content_first":
+        execution_order = _order_checks_for_prefix_cache(execution_order)
+    positions = {node.position: check_id for check_id, node in dag_nodes.items()}
+    priority = [positions[i] for i, _ in execution_order]
+
+    if check_concurrency > 1:
+        print(f"\033[1;36m[依赖DAG] 并发执行，并发数 {check_concurrency}\033[0m", flush=True)
+    check_details = run_check_dag(
+        # 工作线程中的检查项单独剖析（--profile-output，见 checker_trace.Tracer.run_profiled）
+        dag_nodes, priority, functools.partial(tracer.run_profiled, _run_check),
+        on_blocked=_on_blocked if dependency_skip else None,
+        max_workers=check_concurrency,
+        precomputed=precomputed,
+    )
 
-        # 添加元信息
-        result["description"] = description
-        result["check_type"] = check_type
-        
-        # 添加其他元数据字段
-        for key in ["dimension_id", "subcategory_id", "quality_tier", "is_critical"]:
-            if key in check_item:
-                result[key] = check_item[key]
-        
-        check_details[check_idx] = result
+    # 输出按check_list原始顺序排列（沿用的已有结果不计入本次执行）
+    ordered_keys = [item.get("check_id", f"检查项{i}") for i, item in enumerate(check_list, 1)]
+    check_details = {key: check_details[key] for key in ordered_keys
+                     if key in check_details and key not in (reused_results or {})}
 
-    return {
+    execution_result = {
         "sample_id": sample_id,
         "check_timestamp": int(time.time()),
         "check_details": check_details
     }
+    prompt_cache = summarize_prompt_cache(check_details)
+    if prompt_cache:
+        execution_result["prompt_cache"] = prompt_cache
+        print(f"[Prompt缓存] {prompt_cache['calls']} 次调用, 缓存命中 "
+              f"{prompt_cache['cached_tokens']}/{prompt_cache['prompt_tokens']} tokens "
+              f"({prompt_cache['cache_hit_rate']})", flush=True)
+    judge_cascade = summarize_judge_cascade(check_details)
+    if judge_cascade:
+        execution_result["judge_cascade"] = judge_cascade
+    judge_usage = summarize_judge_usage(check_details)
+    if judge_usage:
+        execution_result["judge_usage"] = judge_usage
+    return execution_result
+
+
+JUDGE_USAGE_FIELDS = ("calls", "dedup_hits", "prompt_tokens", "completion_tokens", "cached_tokens",
+                      "latency_ms", "retries", "failed_calls", "truncated_calls", "input_chars")
+
+
+def _sum_judge_calls(calls: List[Dict]) -> Dict:
+    # 被去重的请求没有实际调用，只计入 dedup_hits
+    deduped = sum(1 for c in calls if c.get("dedup"))
+    calls = [c for c in calls if not c.get("dedup")]
+    return {
+        "calls": len(calls),
+        "dedup_hits": deduped,
+        "prompt_tokens": sum(c.get("prompt_tokens", 0) for c in calls),
+        "completion_tokens": sum(c.get("completion_tokens", 0) for c in calls),
+        "cached_tokens": sum(c.get("cached_tokens", 0) for c in calls),
+        "latency_ms": sum(c.get("latency_ms", 0) for c in calls),
+        "max_latency_ms": max((c.get("latency_ms", 0) for c in calls), default=0),
+        "retries": sum(c.get("retries", 0) for c in calls),
+        "failed_calls": sum(1 for c in calls if not c.get("success")),
+        "truncated_calls": sum(1 for c in calls if c.get("truncated")),
+        "input_chars": sum(c.get("input_chars", 0) for c in calls),
+    }
+
+
+def _merge_usage_counters(usages: List[Dict]) -> Dict:
+    merged = {field: sum(u.get(field, 0) for u in usages) for field in JUDGE_USAGE_FIELDS}
+    merged["max_latency_ms"] = max(u.get("max_latency_ms", 0) for u in usages)
+    return merged
+
+
+def aggregate_judge_calls(calls: List[Dict]) -> Optional[Dict]:
+    """把一个检查项内的多次judge调用汇总为judge_usage块，无调用时返回None
+
+    Returns:
+        {calls, dedup_hits, prompt_tokens, completion_tokens, cached_tokens, latency_ms, max_latency_ms,
+         retries, failed_calls, truncated_calls, input_chars, truncated,
+         by_model: {judge模型: 同上计数}, shared_with?: 分组评审时共享该次调用的检查项数}
+    """
+    if not calls:
+        return None
+    usage = _sum_judge_calls(calls)
+    usage["truncated"] = usage["truncated_calls"] > 0
+    by_model = {}
+    for call in calls:
+        by_model.setdefault(call.get("model") or "unknown", []).append(call)
+    usage["by_model"] = {model: _sum_judge_calls(model_calls) for model, model_calls in by_model.items()}
+    shared = [c["shared_with"] for c in calls if c.get("shared_with")]
+    if shared:
+        usage["shared_with"] = max(shared)
+    return usage
+
+
+def merge_judge_usage(usages: List[Optional[Dict]]) -> Optional[Dict]:
+    """合并多个judge_usage块（检查项级 → 样本级 → 批次级）"""
+    usages = [u for u in usages if u]
+    if not usages:
+        return None
+    if len(usages) == 1:
+        return copy.deepcopy(usages[0])
+    merged = _merge_usage_counters(usages)
+    merged["truncated"] = any(u.get("truncated") for u in usages)
+    by_model = {}
+    for usage in usages:
+        for model, counters in usage.get("by_model", {}).items():
+            by_model.setdefault(model, []).append(counters)
+    merged["by_model"] = {model: _merge_usage_counters(entries) for model, entries in by_model.items()}
+    return merged
+
+
+def summarize_judge_usage(check_details: Dict) -> Optional[Dict]:
+    """样本级judge用量汇总（含by_model），未发生LLM调用时返回None"""
+    usages = [
+        detail["judge_usage"] for detail in check_details.values()
+        if isinstance(detail, dict) and detail.get("judge_usage")
+    ]
+    totals = merge_judge_usage(usages)
+    if not totals:
+        return None
+    totals.pop("shared_with", None)
+    totals["checks"] = len(usages)
+    return totals
+
+
+def _order_checks_for_prefix_cache(indexed_checks: List) -> List:
+    """把分析对象相同的语义检查排到一起（按该分析对象首次出现的位置稳定排序）"""
+    first_position = {}
+    keyed = []
+    for position, (i, check_item) in enumerate(indexed_checks):
+        params = check_item.get("params", {})
+        target = params.get("analysis_target") or params.get("file_pattern")
+        if check_item.get("check_type") == "semantic_check" and target:
+            position = first_position.setdefault(target, position)
+        keyed.append((position, i, check_item))
+    keyed.sort(key=lambda entry: entry[0])
+    return [(i, check_item) for _, i, check_item in keyed]
+
+
+def summarize_prompt_cache(check_details: Dict) -> Optional[Dict]:
+    """汇总正文在前布局下的prompt缓存命中情况，未启用时返回None"""
+    entries = [
+        detail["prompt_cache"] for detail in check_details.values()
+        if isinstance(detail, dict) and detail.get("prompt_cache")
+    ]
+    if not entries:
+        return None
+    prompt_tokens = sum(entry.get("prompt_tokens", 0) for entry in entries)
+    cached_tokens = sum(entry.get("cached_tokens", 0) for entry in entries)
+    return {
+        "calls": len(entries),
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "cache_hit_rate": round(cached_tokens / prompt_tokens, 4) if prompt_tokens else None,
+    }
+
+
+def summarize_judge_cascade(check_details: Dict) -> Optional[Dict]:
+    """汇总分级评审的路由情况（按check_id），未启用分级评审时返回None
+
+    Returns:
+        {
+            "by_check": {check_id: {route, prescreen_verdict, prescreen_confidence,
+                                    primary_verdict, agreement, primary_calls_saved, input_chars_saved}},
+            "totals": {checks, prescreen_accepted, escalated, audited, compared, agreed,
+                       agreement_rate, primary_calls_saved, input_chars_saved}
+        }
+    """
+    by_check = {}
+    for check_id, detail in check_details.items():
+        routing = detail.get("judge_routing") if isinstance(detail, dict) else None
+        if not routing:
+            continue
+        by_check[check_id] = {
+            key: routing.get(key)
+            for key in ("route", "prescreen_verdict", "prescreen_confidence", "primary_verdict",
+                        "agreement", "primary_calls_saved", "input_chars_saved")
+        }
+    if not by_check:
+        return None
+
+    routes = [entry["route"] for entry in by_check.values()]
+    compared = [entry["agreement"] for entry in by_check.values() if entry["agreement"] is not None]
+    agreed = sum(1 for a in compared if a)
+    return {
+        "by_check": by_check,
+        "totals": {
+            "checks": len(by_check),
+            "prescreen_accepted": routes.count("prescreen"),
+            "escalated": routes.count("escalated"),
+            "audited": routes.count("audit"),
+            "compared": len(compared),
+            "agreed": agreed,
+            "agreement_rate": round(agreed / len(compared), 4) if compared else None,
+            "primary_calls_saved": sum(entry["primary_calls_saved"] or 0 for entry in by_check.values()),
+            "input_chars_saved": sum(entry["input_chars_saved"] or 0 for entry in by_check.values()),
+        }
+    }
 
 
 # =========================================
@@ -3622,6 +4739,33 @@ def main():
     parser.add_argument("--model-name", default=None, help="LLM模型名称（用于semantic检查）")
     parser.add_argument("--api-base", default=None, help="LLM API base URL")
     parser.add_argument("--api-key", default=None, help="LLM API key")
+    parser.add_argument("--prescreen-model", default=None,
+                       help="分级评审的预筛模型（可选，启用后仅存疑项升级到--model-name）")
+    parser.add_argument("--prescreen-api-base", default=None, help="预筛模型API base URL（默认同--api-base）")
+    parser.add_argument("--prescreen-api-key", default=None, help="预筛模型API key（默认同--api-key）")
+    parser.add_argument("--cascade-confidence", type=float, default=DEFAULT_CASCADE_CONFIDENCE,
+                       help=f"预筛置信度阈值，低于此值升级到主评审（默认: {DEFAULT_CASCADE_CONFIDENCE}）")
+    parser.add_argument("--cascade-audit-rate", type=float, default=DEFAULT_CASCADE_AUDIT_RATE,
+                       help=f"预筛通过项的抽样审计比例（默认: {DEFAULT_CASCADE_AUDIT_RATE}）")
+    parser.add_argument("--group-judging", action="store_true",
+                       help="分组评审：分析对象相同的LLM语义检查合并为一次调用")
+    parser.add_argument("--group-judging-size", type=int, default=DEFAULT_GROUP_JUDGING_SIZE,
+                       help=f"分组评审每次调用最多合并的检查项数（默认: {DEFAULT_GROUP_JUDGING_SIZE}）")
+    parser.add_argument("--check-concurrency", type=int, default=1,
+                       help="互不依赖的检查项并发执行数（默认: 1，串行）")
+    parser.add_argument("--no-dependency-skip", action="store_true",
+                       help="关闭依赖短路：前置检查失败时仍执行依赖它的检查项")
+    parser.add_argument("--prompt-layout", choices=["criteria_first", "content_first"],
+                       default="criteria_first",
+                       help="judge prompt布局：content_first 正文在前作为稳定前缀，便于prompt缓存命中")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                       help="控制台日志级别（默认: INFO，DEBUG输出默认关闭）")
+    parser.add_argument("--log-file", default=None,
+                       help="每样本日志文件（缓冲写入，支持{sample_id}占位符）")
+    parser.add_argument("--trace-output", default=None,
+                       help="耗时追踪输出（*.json 为Chrome trace格式，*.jsonl 为JSON Lines）")
+    parser.add_argument("--profile-output", default=None,
+                       help="cProfile结果输出路径（*.prof）")
     parser.add_argument("--output", required=True,
                        help="输出文件路径（execution_result.json）")
     args = parser.parse_args()
@@ -3631,6 +4775,8 @@ def main():
     with open(args.sample_result, "r", encoding="utf-8") as f:
         sample_result = json.load(f)
 
+    setup_logging(args.log_level, args.log_file, sample_id=sample_result.get("sample_id"))
+
     print(f"[加载] Checklist: {args.checklist}")
     with open(args.checklist, "r", encoding="utf-8") as f:
         checklist_data = json.load(f)
@@ -3645,12 +4791,39 @@ def main():
             "api_key": args.api_key
         }
         print(f"[配置] LLM模型: {args.model_name}")
+        model_config["prompt_layout"] = args.prompt_layout
+        if args.prompt_layout == "content_first":
+            print(f"[配置] Prompt布局: 正文在前（prompt缓存友好）")
+        if args.group_judging:
+            model_config["group_judging"] = True
+            model_config["group_judging_size"] = args.group_judging_size
+            print(f"[配置] 分组评审: 每次最多合并 {args.group_judging_size} 项")
+        if args.prescreen_model:
+            model_config["cascade"] = {
+                "model_name": args.prescreen_model,
+                "api_base": args.prescreen_api_base or args.api_base,
+                "api_key": args.prescreen_api_key or args.api_key,
+                "confidence_threshold": args.cascade_confidence,
+                "audit_rate": args.cascade_audit_rate,
+            }
+            print(f"[配置] 分级评审预筛模型: {args.prescreen_model} "
+                  f"(置信度阈值={args.cascade_confidence}, 审计比例={args.cascade_audit_rate})")
     else:
         print("[警告] 未配置LLM模型，semantic_check将被跳过")
+    model_config["check_concurrency"] = args.check_concurrency
+    model_config["dependency_skip"] = not args.no_dependency_skip
 
     # 执行检查
     print(f"\n\033[1;36m[执行] 开始检查...\033[0m")
-    result = execute_checks(sample_result, check_list, model_config)
+    tracing = bool(args.trace_output or args.profile_output)
+    if tracing:
+        tracer.start(sample_result.get("sample_id"), profile=bool(args.profile_output))
+    try:
+        with tracer.span("execute_checks"):
+            result = execute_checks(sample_result, check_list, model_config)
+    finally:
+        if tracing:
+            tracer.finish(args.trace_output, args.profile_output)
 
     # 保存结果
     output_path = Path(args.output)
@@ -3672,6 +4845,12 @@ def main():
     print(f"[统计] ✗ Fail: {failed} 项")
     print(f"[统计] ⊘ Skip: {skipped} 项")
 
+    cascade_totals = (result.get("judge_cascade") or {}).get("totals")
+    if cascade_totals:
+        print(f"[分级评审] 预筛采纳 {cascade_totals['prescreen_accepted']}/{cascade_totals['checks']} 项, "
+              f"节省主评审调用 {cascade_totals['primary_calls_saved']} 次 "
+              f"({cascade_totals['input_chars_saved']} 字符), 一致率 {cascade_totals['agreement_rate']}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checker日志层
+=============
+
+替代热路径上的 print(..., flush=True) 调试输出：
+- 分级：DEBUG 默认关闭；调试信息使用 logger.debug("... %s", arg) 惰性格式化，
+  关闭时不会构造字符串，也不会为了打印而调用 exists() 等系统调用
+  （需要额外计算的调试信息用 logger.isEnabledFor(logging.DEBUG) 包裹）
+- 控制台：INFO 及以上，输出格式与原 print 一致（仅消息本身）
+- 每样本日志文件（可选）：通过 MemoryHandler 缓冲批量写入，ERROR 级别或缓冲满时才落盘，
+  进程退出时自动flush
+
+用法:
+    from checker_logging import logger, setup_logging
+
+    setup_logging(level="INFO", log_file="logs/{sample_id}.log", sample_id=sample_id)
+    logger.debug("[DEBUG] file_path=%s", file_path)
+"""
+
+import atexit
+import logging
+import logging.handlers
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+LOGGER_NAME = "novel_checker"
+DEFAULT_BUFFER_CAPACITY = 1000
+
+logger = logging.getLogger(LOGGER_NAME)
+
+_console_handler: Optional[logging.Handler] = None
+_file_handler: Optional[logging.handlers.MemoryHandler] = None
+# 批量编排器在同一进程内并发执行多个样本，handler的替换需要串行
+_setup_lock = threading.Lock()
+
+
+def _install_console_handler(level: int) -> None:
+    global _console_handler
+    if _console_handler is not None:
+        logger.removeHandler(_console_handler)
+    _console_handler = logging.StreamHandler(sys.stdout)
+    _console_handler.setFormatter(logging.Formatter("%(message)s"))
+    _console_handler.setLevel(level)
+    logger.addHandler(_console_handler)
+
+
+def flush_logging() -> None:
+    """把缓冲中的日志写入文件"""
+    if _file_handler is not None:
+        _file_handler.flush()
+
+
+def setup_logging(level: str = "INFO", log_file: Optional[str] = None, sample_id: str = None,
+                  file_level: str = "DEBUG", buffer_capacity: int = DEFAULT_BUFFER_CAPACITY) -> None:
+    """配置checker日志
+
+    Args:
+        level: 控制台日志级别（DEBUG/INFO/WARNING/ERROR）
+        log_file: 每样本日志文件路径，支持 {sample_id} 占位符；None 表示不写文件
+        sample_id: 用于填充 log_file 中的占位符
+        file_level: 日志文件记录级别
+        buffer_capacity: 文件日志缓冲条数，缓冲满或出现ERROR时落盘
+    """
+    with _setup_lock:
+        _setup_logging(level, log_file, sample_id, file_level, buffer_capacity)
+
+
+def _setup_logging(level, log_file, sample_id, file_level, buffer_capacity) -> None:
+    global _file_handler
+    console_level = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+    _install_console_handler(console_level)
+
+    if _file_handler is not None:
+        logger.removeHandler(_file_handler)
+        # MemoryHandler.close() 不会关闭目标FileHandler：先落盘缓冲，再关闭目标文件
+        _file_handler.flush()
+        if _file_handler.target is not None:
+            _file_handler.target.close()
+        _file_handler.close()
+        _file_handler = None
+
+    effective_level = console_level
+    if log_file:
+        path = Path(log_file.format(sample_id=sample_id or "unknown"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        target = logging.FileHandler(path, mode="w", encoding="utf-8")
+        target.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        file_log_level = logging.getLevelName(file_level.upper())
+        _file_handler = logging.handlers.MemoryHandler(
+            capacity=buffer_capacity, flushLevel=logging.ERROR, target=target
+        )
+        _file_handler.setLevel(file_log_level)
+        logger.addHandler(_file_handler)
+        effective_level = min(console_level, file_log_level)
+
+    logger.setLevel(effective_level)
+
+
+# 默认：控制台INFO，DEBUG关闭（未调用setup_logging时也生效）
+logger.propagate = False
+logger.setLevel(logging.INFO)
+_install_console_handler(logging.INFO)
+atexit.register(flush_logging)
@@ -15,12 +15,14 @@ v3.0变更（基准60分公式）：
 - 总分 = 内容分×0.7 + 流程规范分×0.3
 """
 
-import json
 import argparse
 import sys
 from typing import Dict, List, Tuple
 from pathlib import Path
 
+from check_result_store import load_check_result
+from json_io import dump_json
+
 
 # =========================================
 # 1. 常量定义
@@ -571,8 +573,7 @@ def main():
 
     # 加载输入文件
     print(f"[加载] Execution Result: {args.execution_result}")
-    with open(args.execution_result, "r", encoding="utf-8") as f:
-        execution_result = json.load(f)
+    execution_result = load_check_result(args.execution_result)
 
     # 加载能力体系配置（可选）
     capability_taxonomy = None
@@ -590,8 +591,7 @@ def main():
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    dump_json(result, output_path)
 
     print(f"\n[完成] 输出文件: {output_path}")
 
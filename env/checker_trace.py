@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checker耗时追踪（span）与性能剖析
+=================================
+
+在 execute_checks 的各个阶段埋点（检查项、检查方法、文件glob/读取/JSON解析、
+每次LLM调用尝试及退避等待），输出：
+- Chrome trace格式（*.json，可在 chrome://tracing 或 Perfetto 中打开）
+  或 JSON Lines（*.jsonl，每行一个span）
+- 按span名称聚合的耗时排行（top time sinks）
+- 可选的 cProfile 结果（*.prof，可用 snakeviz / pstats 查看）
+  Python 3.12 之前 cProfile 只剖析调用 enable() 的线程：检查项并发执行（--check-concurrency）时
+  工作线程中的任务通过 run_profiled() 各自剖析，dump_profile 时与主线程的结果合并
+  （合并结果中主线程的等待时间与工作线程的耗时会同时出现）；3.12 起 cProfile 基于 sys.monitoring，
+  本身覆盖所有线程
+
+未启用时 span() 直接返回空上下文，几乎没有额外开销。
+span的嵌套栈按线程隔离，检查项并发执行时各线程的span分别记录（Chrome trace中按线程分行显示）。
+
+用法:
+    from checker_trace import tracer, traced
+
+    tracer.start(sample_id)
+    with tracer.span("check", check_id="逻辑硬伤"):
+        ...
+    tracer.finish("trace.json", "checker.prof")   # 在finally中调用，出错时也输出
+"""
+
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 3.12 起 cProfile 使用 sys.monitoring（进程级），主线程开启后已覆盖所有线程，且不能再开启第二个
+PROFILER_COVERS_ALL_THREADS = sys.version_info >= (3, 12)
+
+
+class Tracer:
+    """span收集器（单进程单样本使用，支持多线程）"""
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_id = None
+        self._spans: List[Dict[str, Any]] = []
+        self._local = threading.local()
+        self._t0 = 0.0
+        self._profiler: Optional[cProfile.Profile] = None
+        self._thread_profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def start(self, sample_id: str = None, profile: bool = False) -> None:
+        """开始记录（清空之前的span）；profile=True 时同时开启cProfile"""
+        self.enabled = True
+        self.sample_id = sample_id
+        self._spans = []
+        self._local = threading.local()
+        self._t0 = time.perf_counter()
+        self._profiler = None
+        self._thread_profiles = []
+        if profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        """停止记录（已记录的span保留，供write/summary使用）"""
+        if self._profiler is not None:
+            self._profiler.disable()
+        self.enabled = False
+
+    def run_profiled(self, func, *args, **kwargs):
+        """在工作线程中执行func；开启cProfile且主线程剖析覆盖不到该线程时，为这次执行单独剖析"""
+        if (self._profiler is None or PROFILER_COVERS_ALL_THREADS
+                or threading.current_thread() is threading.main_thread()):
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with self._lock:
+                self._thread_profiles.append(profiler)
+
+    def span(self, name: str, **attrs):
+        """耗时区间上下文管理器，支持嵌套"""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, attrs)
+
+    @property
+    def _stack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def _span(self, name: str, attrs: Dict[str, Any]):
+        stack = self._stack
+        record = {
+            "name": name,
+            "start": time.perf_counter() - self._t0,
+            "depth": len(stack),
+            "child_time": 0.0,
+            "tid": threading.get_ident(),
+            "attrs": attrs,
+        }
+        stack.append(record)
+        try:
+            yield record
+        finally:
+            stack.pop()
+            record["duration"] = time.perf_counter() - self._t0 - record["start"]
+            if stack:
+                stack[-1]["child_time"] += record["duration"]
+            self._spans.append(record)
+
+    # ---------- 输出 ----------
+
+    def summary(self, top: int = 15) -> List[Dict[str, Any]]:
+        """按span名称聚合：次数、总耗时、自身耗时（扣除子span），按自身耗时降序"""
+        stats: Dict[str, Dict[str, Any]] = {}
+        for record in self._spans:
+            entry = stats.setdefault(record["name"], {
+                "name": record["name"], "count": 0, "total_s": 0.0, "self_s": 0.0, "max_s": 0.0
+            })
+            entry["count"] += 1
+            entry["total_s"] += record["duration"]
+            entry["self_s"] += record["duration"] - record["child_time"]
+            entry["max_s"] = max(entry["max_s"], record["duration"])
+        ranked = sorted(stats.values(), key=lambda e: e["self_s"], reverse=True)[:top]
+        for entry in ranked:
+            for key in ("total_s", "self_s", "max_s"):
+                entry[key] = round(entry[key], 4)
+        return ranked
+
+    def write(self, output_path) -> None:
+        """写出trace文件：*.jsonl 为JSON Lines，其余为Chrome trace格式（含summary）"""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        spans = sorted(self._spans, key=lambda r: r["start"])
+
+        if output_path.suffix == ".jsonl":
+            with open(output_path, "w", encoding="utf-8") as f:
+                for record in spans:
+                    f.write(json.dumps({
+                        "sample_id": self.sample_id,
+                        "name": record["name"],
+                        "start_s": round(record["start"], 6),
+                        "duration_s": round(record["duration"], 6),
+                        "depth": record["depth"],
+                        **({"attrs": record["attrs"]} if record["attrs"] else {}),
+                    }, ensure_ascii=False, default=str) + "\n")
+        else:
+            pid = os.getpid()
+            events = [{
+                "name": record["name"],
+                "cat": record["name"].split(".")[0],
+                "ph": "X",
+                "ts": round(record["start"] * 1e6, 1),
+                "dur": round(record["duration"] * 1e6, 1),
+                "pid": pid,
+                "tid": record["tid"],
+                "args": record["attrs"],
+            } for record in spans]
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "traceEvents": events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"sample_id": self.sample_id, "summary": self.summary()},
+                }, f, ensure_ascii=False, default=str)
+
+    def dump_profile(self, profile_path) -> None:
+        """写出cProfile结果（需 start(profile=True)），合并工作线程的剖析结果"""
+        if self._profiler is None:
+            return
+        Path(profile_path).parent.mkdir(parents=True, exist_ok=True)
+        if not self._thread_profiles:
+            self._profiler.dump_stats(str(profile_path))
+            return
+        stats = pstats.Stats(self._profiler)
+        for profiler in self._thread_profiles:
+            stats.add(profiler)
+        stats.dump_stats(str(profile_path))
+
+    def profile_coverage(self) -> str:
+        """cProfile结果覆盖的线程范围（随输出路径一起打印）"""
+        if PROFILER_COVERS_ALL_THREADS:
+            return "覆盖所有线程"
+        if self._thread_profiles:
+            return f"主线程 + {len(self._thread_profiles)} 个工作线程任务（合并）"
+        return "仅主线程"
+
+    def finish(self, trace_output=None, profile_output=None, prefix: str = "[耗时分析]") -> None:
+        """停止记录并输出汇总/trace/cProfile（调用方在finally中调用：检查中途出错时同样输出已记录的部分）"""
+        self.stop()
+        self.print_summary()
+        if trace_output:
+            self.write(trace_output)
+            print(f"{prefix}   - 耗时追踪: {trace_output}")
+        if profile_output:
+            self.dump_profile(profile_output)
+            print(f"{prefix}   - cProfile: {profile_output}（{self.profile_coverage()}）")
+
+    def print_summary(self, top: int = 10) -> None:
+        ranked = self.summary(top)
+        if not ranked:
+            return
+        print(f"\n[耗时分析] Top {len(ranked)} (按自身耗时):")
+        for entry in ranked:
+            print(f"  - {entry['name']}: self={entry['self_s']:.2f}s total={entry['total_s']:.2f}s "
+                  f"count={entry['count']} max={entry['max_s']:.2f}s")
+
+
+# 进程内共享的tracer实例
+tracer = Tracer()
+
+
+def traced(name: str):
+    """方法级span装饰器（未启用追踪时只多一次属性判断）"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
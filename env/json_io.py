@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结果文件JSON读写层
+==================
+
+{data_id}.json 含完整 conversation_history / tool_call_list，单个文件可达数十MB，
+而很多调用方只需要 execution_status、model 等顶层字段。
+
+- 后端：优先使用 orjson，其次 pysimdjson，都不可用时回退标准库 json（行为一致，只是更慢）
+  NaN/Infinity：orjson 会把非有限浮点数写成 null，含这类值的对象改用标准库写出 NaN/Infinity
+  （与未安装orjson时一致）；orjson/simdjson 不接受 NaN 字面量，解析失败时回退标准库
+- 部分读取：load_fields(path, ["model", "execution_status"]) 通过mmap扫描顶层结构，
+  只解析需要的字段，其他字段（如对话历史）只跳过不构造对象，取齐即停止扫描
+  （与 scripts/jsonl_index.py 的投影解析相同的做法，这里在字节上进行，不需要先解码整个文件）
+- 写入：dump_json(obj, path, compact=True) 输出紧凑格式，默认仍为 indent=2
+- 压缩：dump_json(obj, path, codec="zstd"/"gzip") 写出压缩文件，文件名不变；
+  读取时按文件头魔数自动识别（zstd需要安装 zstandard，gzip使用标准库），
+  调用方无需区分明文与压缩文件
+
+用法:
+    from json_io import load_json, load_fields, dump_json
+
+    meta = load_fields("eval_xxx/NW_001.json", ["model", "execution_status"])
+    result = load_json("eval_xxx/NW_001.json")
+    dump_json(check_result, "check_result_rev004.json", compact=args.compact)
+"""
+
+import gzip
+import json
+import math
+import mmap
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+try:
+    import orjson
+    BACKEND = "orjson"
+except ImportError:
+    orjson = None
+    try:
+        import simdjson
+        BACKEND = "simdjson"
+    except ImportError:
+        simdjson = None
+        BACKEND = "json"
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODECS = ("zstd", "gzip")
+DEFAULT_CODEC = "zstd" if zstandard is not None else "gzip"
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_GZIP_MAGIC = b'\x1f\x8b'
+
+_WS_RE = re.compile(rb'[ \t\n\r]*')
+_STRING_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]')
+_SCALAR_RE = re.compile(rb'[^,}\]\s]+')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """解析JSON文本（bytes 或 str）"""
+    try:
+        if orjson is not None:
+            return orjson.loads(data)
+        if simdjson is not None:
+            return simdjson.loads(data)
+    except ValueError:
+        # NaN/Infinity 字面量（标准库写出的非有限浮点数）只有标准库能解析；确实非法时由标准库报错
+        pass
+    return json.loads(data)
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """对象中是否含 NaN/Infinity 浮点数"""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    return False
+
+
+def dumps(obj: Any, compact: bool = False) -> str:
+    """序列化为JSON文本（非ASCII字符原样输出）
+
+    compact=False 时与 json.dumps(obj, ensure_ascii=False, indent=2) 格式一致
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (0 if compact else orjson.OPT_INDENT_2)
+        try:
+            data = orjson.dumps(obj, option=option)
+        except TypeError:
+            # orjson不支持的类型（超过64位的整数等）回退标准库
+            data = None
+        # orjson把NaN/Infinity写成null：输出含null时检查一遍，有非有限浮点数则回退标准库
+        if data is not None and (b"null" not in data or not _has_non_finite(obj)):
+            return data.decode("utf-8")
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def detect_codec(head: bytes) -> Optional[str]:
+    """根据文件头魔数判断压缩格式，明文JSON返回None"""
+    if head[:4] == _ZSTD_MAGIC:
+        return "zstd"
+    if head[:2] == _GZIP_MAGIC:
+        return "gzip"
+    return None
+
+
+def file_codec(path: Union[str, Path]) -> Optional[str]:
+    """读取文件头判断压缩格式（用于回写时保持原格式）"""
+    with open(path, "rb") as f:
+        return detect_codec(f.read(4))
+
+
+def decompress(data: bytes) -> bytes:
+    """按魔数解压，明文原样返回"""
+    codec = detect_codec(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("文件为zstd压缩格式，需要安装 zstandard: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    return data
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    """按指定格式压缩（zstd 不可用时报错，由调用方决定是否改用gzip）"""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd压缩需要安装 zstandard: pip install zstandard")
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    raise ValueError(f"未知压缩格式: {codec}（可选: {', '.join(CODECS)}）")
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """完整读取JSON文件（明文或压缩）"""
+    with open(path, "rb") as f:
+        return loads(decompress(f.read()))
+
+
+def dump_json(obj: Any, path: Union[str, Path], compact: bool = False,
+              codec: Optional[str] = None) -> None:
+    """写出JSON文件
+
+    Args:
+        compact: 不缩进、不加空格
+        codec: None 写明文；"zstd"/"gzip" 写压缩文件（压缩时总是紧凑格式）
+    """
+    if codec is None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(dumps(obj, compact=compact))
+        return
+    data = compress(dumps(obj, compact=True).encode("utf-8"), codec)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _skip_value(buf, pos: int) -> int:
+    """跳过buf[pos]开始的一个JSON值，返回值结束位置（不构造Python对象）"""
+    c = buf[pos:pos + 1]
+    if c == b'"':
+        return _STRING_RE.match(buf, pos).end()
+    if c in (b'{', b'['):
+        depth = 0
+        for m in _TOKEN_RE.finditer(buf, pos):
+            tok = m.group()
+            if tok[:1] == b'"':
+                continue
+            depth += 1 if tok in (b'{', b'[') else -1
+            if depth == 0:
+                return m.end()
+        raise ValueError('JSON值未闭合')
+    return _SCALAR_RE.match(buf, pos).end()
+
+
+def project_fields(buf, fields: Iterable[str]) -> Dict[str, Any]:
+    """从JSON对象文本（bytes/mmap）中只解析指定的顶层字段
+
+    Args:
+        buf: UTF-8编码的JSON对象
+        fields: 需要的顶层字段
+
+    Returns:
+        仅包含所需字段（且文件中存在）的dict
+    """
+    wanted = set(fields)
+    result: Dict[str, Any] = {}
+    pos = _WS_RE.match(buf, 0).end()
+    if buf[pos:pos + 3] == b'\xef\xbb\xbf':
+        pos = _WS_RE.match(buf, pos + 3).end()
+    if buf[pos:pos + 1] != b'{':
+        raise ValueError('JSON顶层不是对象')
+    pos = _WS_RE.match(buf, pos + 1).end()
+    if buf[pos:pos + 1] == b'}':
+        return result
+
+    while True:
+        key_end = _STRING_RE.match(buf, pos).end()
+        key = json.loads(buf[pos:key_end])
+        pos = _WS_RE.match(buf, key_end).end()
+        pos = _WS_RE.match(buf, pos + 1).end()  # 跳过':'
+        end = _skip_value(buf, pos)
+        if key in wanted:
+            result[key] = loads(buf[pos:end])
+            if len(result) == len(wanted):
+                return result
+        pos = _WS_RE.match(buf, end).end()
+        if buf[pos:pos + 1] != b',':
+            return result
+        pos = _WS_RE.match(buf, pos + 1).end()
+
+
+def load_fields(path: Union[str, Path], fields: Iterable[str]) -> Dict[str, Any]:
+    """只读取JSON文件中指定的顶层字段（不解析对话历史等大字段）
+
+    压缩文件需要先整体解压，但仍只构造所需字段的对象
+    """
+    with open(path, "rb") as f:
+        if detect_codec(f.read(4)) is not None:
+            f.seek(0)
+            return project_fields(decompress(f.read()), fields)
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法mmap
+            raise ValueError(f"JSON文件为空: {path}")
+        try:
+            return project_fields(buf, fields)
+        finally:
+            buf.close()
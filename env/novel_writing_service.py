@@ -6,14 +6,18 @@
 提供完整的文件系统操作和HITL交互工具。
 """
 
+import fnmatch
 import json
 import os
+import re
 import subprocess
 from pathlib import Path
 from typing import Dict, Any, Annotated, Optional, List, Literal
 from pydantic import Field
 from fastmcp import FastMCP
 
+from workspace_stats import STATS_FILENAME, update_stats, refresh_stats
+
 # 创建MCP服务
 mcp = FastMCP(name="shortdrama_service")
 
@@ -52,6 +56,16 @@ def is_path_safe(path: str) -> bool:
         return False
 
 
+def _update_workspace_stats(written: List[tuple]) -> None:
+    """写入文件后增量更新workspace/.stats.json（失败不影响写入结果）"""
+    if not written:
+        return
+    try:
+        update_stats(os.path.join(WORK_DIR, "workspace"), written)
+    except Exception as e:
+        print(f"Warning: Failed to update workspace stats: {e}")
+
+
 # ==================== 文件系统工具 ====================
 
 @mcp.tool()
@@ -138,6 +152,8 @@ def write_file(
         with open(full_path, 'w', encoding='utf-8') as f:
             f.write(content)
 
+        _update_workspace_stats([(path, content)])
+
         return {
             "status": "success",
             "path": path,
@@ -177,6 +193,7 @@ def write_files(
 
     success_files = []
     failed_files = []
+    written = []
 
     for file_item in files:
         if not isinstance(file_item, dict):
@@ -228,12 +245,15 @@ def write_files(
                 "path": path,
                 "size": len(content)
             })
+            written.append((path, content))
         except Exception as e:
             failed_files.append({
                 "path": path,
                 "error": str(e)
             })
 
+    _update_workspace_stats(written)
+
     total = len(files)
     success_count = len(success_files)
     failed_count = len(failed_files)
@@ -249,15 +269,56 @@ def write_files(
     }
 
 
+def _natural_key(name: str):
+    """自然排序键：chapter_2.md 排在 chapter_10.md 之前"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+def _scan_directory(root: str, recursive: bool) -> List[Dict[str, Any]]:
+    """基于os.scandir扫描目录，复用DirEntry的stat结果"""
+    entries = []
+    stack = [("", root)]
+    while stack:
+        rel_dir, abs_dir = stack.pop()
+        with os.scandir(abs_dir) as it:
+            for entry in it:
+                if entry.name in (STATS_FILENAME, STATS_FILENAME + ".tmp"):
+                    continue
+                rel_name = f"{rel_dir}{entry.name}"
+                if entry.is_dir():
+                    entries.append({"name": rel_name, "type": "directory"})
+                    if recursive:
+                        stack.append((rel_name + "/", entry.path))
+                elif entry.is_file():
+                    entries.append({
+                        "name": rel_name,
+                        "type": "file",
+                        "size": entry.stat().st_size
+                    })
+    return entries
+
+
 @mcp.tool()
 def list_directory(
-    path: Annotated[str, Field(description="目录路径")] = "."
+    path: Annotated[str, Field(description="目录路径")] = ".",
+    recursive: Annotated[bool, Field(description="是否递归列出子目录内容（name为相对路径，如 chapters/chapter_01.md）")] = False,
+    glob: Annotated[Optional[str], Field(description="文件名过滤模式，如 chapter_*.md；包含/时按相对路径匹配")] = None,
+    sort: Annotated[Literal["name", "natural", "size"], Field(description="排序方式：name（字典序）、natural（自然序，章节按编号排列）、size（按大小降序）")] = "name",
+    limit: Annotated[int, Field(description="单页最多返回的条目数（1-1000）")] = 200,
+    cursor: Annotated[Optional[str], Field(description="分页游标，传入上一页返回的next_cursor")] = None
 ) -> Dict[str, Any]:
     """
     列出目录内容
 
+    支持递归、过滤、排序和分页。条目较多时只返回一页，next_cursor不为空表示还有下一页。
+
     Args:
         path: 目录路径，默认为当前目录
+        recursive: 是否递归
+        glob: 文件名过滤模式
+        sort: 排序方式
+        limit: 单页条目数上限
+        cursor: 分页游标
 
     Returns:
         包含文件和目录列表的字典
@@ -288,37 +349,95 @@ def list_directory(
     if not os.path.isdir(full_path):
         return {"error": f"路径不是目录: {path}"}
 
+    if int(limit) <= 0:
+        return {"error": f"无效的limit: {limit}（需为1-1000）"}
+    limit = min(int(limit), 1000)
+    try:
+        offset = int(cursor) if cursor else 0
+    except ValueError:
+        return {"error": f"无效的cursor: {cursor}"}
+    if offset < 0:
+        # 负数游标会从末尾切片，且next_cursor回到0，分页客户端会死循环
+        return {"error": f"无效的cursor: {cursor}"}
+
     try:
-        entries = os.listdir(full_path)
-
-        files = []
-        directories = []
-
-        for entry in entries:
-            entry_path = os.path.join(full_path, entry)
-            if os.path.isfile(entry_path):
-                files.append({
-                    "name": entry,
-                    "type": "file",
-                    "size": os.path.getsize(entry_path)
-                })
-            elif os.path.isdir(entry_path):
-                directories.append({
-                    "name": entry,
-                    "type": "directory"
-                })
+        entries = _scan_directory(full_path, recursive)
+
+        if glob:
+            if "/" in glob:
+                entries = [e for e in entries if fnmatch.fnmatch(e["name"], glob)]
+            else:
+                entries = [e for e in entries if fnmatch.fnmatch(os.path.basename(e["name"]), glob)]
+
+        if sort == "natural":
+            entries.sort(key=lambda e: _natural_key(e["name"]))
+        elif sort == "size":
+            entries.sort(key=lambda e: (-e.get("size", 0), e["name"]))
+        else:
+            entries.sort(key=lambda e: e["name"])
+
+        page = entries[offset:offset + limit]
+        next_offset = offset + len(page)
+
+        files = [e for e in page if e["type"] == "file"]
+        directories = [e for e in page if e["type"] == "directory"]
 
         return {
             "status": "success",
             "path": path,
             "files": files,
             "directories": directories,
-            "total": len(files) + len(directories)
+            "total": len(entries),
+            "returned": len(page),
+            "next_cursor": str(next_offset) if next_offset < len(entries) else None
         }
     except Exception as e:
         return {"error": f"列出目录失败: {str(e)}"}
 
 
+@mcp.tool()
+def get_workspace_stats(
+    path: Annotated[Optional[str], Field(description="只返回该路径前缀下的文件统计（如 chapters/），默认返回全部")] = None
+) -> Dict[str, Any]:
+    """
+    获取workspace文件统计
+
+    返回每个文件的字节数、字符数、中文字符数、段落数和内容hash，以及总计（含章节数和章节总字数）。
+    统计索引在每次写入文件时增量维护，无需用bash wc或逐个read_file统计字数。
+
+    Args:
+        path: 路径前缀过滤，默认返回全部文件
+
+    Returns:
+        包含files（按路径）和totals的字典
+    """
+    if not WORK_DIR:
+        return {"error": "工作目录未初始化"}
+
+    workspace = os.path.join(WORK_DIR, "workspace")
+
+    try:
+        # 刷新索引：兼容bash等方式修改/删除的文件
+        index = refresh_stats(workspace)
+    except Exception as e:
+        return {"error": f"统计workspace失败: {str(e)}"}
+
+    files = {
+        key: {k: v for k, v in entry.items() if k != "mtime_ns"}
+        for key, entry in index["files"].items()
+    }
+    if path and path not in (".", "./"):
+        prefix = path[2:] if path.startswith("./") else path
+        files = {key: entry for key, entry in files.items() if key.startswith(prefix)}
+
+    return {
+        "status": "success",
+        "files": files,
+        "totals": index["totals"],
+        "count": len(files)
+    }
+
+
 @mcp.tool()
 def create_directory(
     path: Annotated[str, Field(description="目录路径")]
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+样本摘要（批次列表秒开）
+========================
+
+viewer 的批次/样本列表、serve_results.sh 的 /api/list 需要每个样本的模型、状态、
+耗时、最新revision得分等少量字段，原来要逐个打开 {data_id}.json 和 check_result。
+这里在每个批次目录下维护一个摘要文件，每个样本一行：
+
+    <agent_results_dir>/sample_summaries.jsonl
+    {"data_id": "NW_001", "model": "...", "execution_status": "success", "execution_time": 812.3,
+     "has_annotation": false, "latest_revision": "rev004", "total_score": 72.0,
+     "quality_status": "Good", "gate_triggered": false, "updated_at": "..."}
+
+- 追加写：checker 写完结果、viewer 保存标注后各追加一行（多个checker并发时单行追加互不覆盖），
+  读取时同一 data_id 以最后一行为准
+- 每行都由 summarize_sample() 从磁盘现状完整生成，重跑旧revision也不会把最新revision覆盖掉
+- 已有批次用 scripts/build_summaries.py 回填（同时压缩掉重复行）
+- 摘要缺失的样本由调用方回退到原来的逐文件读取
+"""
+
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from json_io import dumps, load_fields, loads
+
+SUMMARY_FILE = "sample_summaries.jsonl"
+
+# {data_id}.json 中参与摘要的顶层字段（manual_annotation 只判断是否存在）
+RESULT_FIELDS = ["model", "execution_status", "execution_time", "manual_annotation"]
+
+_REVISION_RE = re.compile(r"rev(\d+)")
+
+
+def summary_path(agent_results_dir: Union[str, Path]) -> Path:
+    return Path(agent_results_dir) / SUMMARY_FILE
+
+
+def latest_check_result_file(env_dir: Path) -> Optional[Path]:
+    """取版本号最大的 check_result_revNNN.json（与viewer相同：按文件名排序），没有时取 check_result.json"""
+    check_files = sorted(
+        (p for p in env_dir.glob("check_result_rev*.json") if not p.name.endswith(".fingerprints.json")),
+        key=lambda p: p.stem,
+        reverse=True,
+    )
+    if check_files:
+        return check_files[0]
+    inline_file = env_dir / "check_result.json"
+    return inline_file if inline_file.exists() else None
+
+
+def summarize_sample(agent_results_dir: Union[str, Path], data_id: str) -> Optional[Dict]:
+    """从 {data_id}.json 和最新的 check_result 生成一行摘要（结果文件不存在时返回None）"""
+    agent_results_dir = Path(agent_results_dir)
+    result_file = agent_results_dir / f"{data_id}.json"
+    if not result_file.exists():
+        return None
+
+    result_data = load_fields(result_file, RESULT_FIELDS)
+    summary = {
+        "data_id": data_id,
+        "model": result_data.get("model", "unknown"),
+        "execution_status": result_data.get("execution_status", "unknown"),
+        "execution_time": result_data.get("execution_time", 0),
+        "has_annotation": "manual_annotation" in result_data,
+        "latest_revision": None,
+        "total_score": None,
+        "quality_status": None,
+        "gate_triggered": None,
+    }
+
+    env_dir = agent_results_dir / f"{data_id}_env"
+    check_file = latest_check_result_file(env_dir) if env_dir.is_dir() else None
+    if check_file is not None:
+        match = _REVISION_RE.search(check_file.stem)
+        summary["latest_revision"] = match.group(0) if match else None
+        try:
+            overall = load_fields(check_file, ["overall_result"]).get("overall_result", {})
+        except (OSError, ValueError) as e:
+            print(f"[Summary] 无法读取 {check_file}: {e}")
+            overall = {}
+        summary["total_score"] = overall.get("total_score")
+        summary["quality_status"] = overall.get("status")
+        summary["gate_triggered"] = bool(overall.get("gate_triggered", False))
+
+    summary["updated_at"] = datetime.now().isoformat(timespec="seconds")
+    return summary
+
+
+def append_summary(agent_results_dir: Union[str, Path], data_id: str) -> Optional[Dict]:
+    """重新生成一个样本的摘要并追加到批次摘要文件"""
+    summary = summarize_sample(agent_results_dir, data_id)
+    if summary is None:
+        return None
+    line = (dumps(summary, compact=True) + "\n").encode("utf-8")
+    # O_APPEND 单次write：并发的checker各自追加一整行
+    fd = os.open(summary_path(agent_results_dir), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+    return summary
+
+
+def load_summaries(agent_results_dir: Union[str, Path]) -> Dict[str, Dict]:
+    """读取批次摘要 {data_id: summary}（文件不存在返回空dict，同一样本后写的行覆盖先写的）"""
+    path = summary_path(agent_results_dir)
+    summaries: Dict[str, Dict] = {}
+    if not path.exists():
+        return summaries
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = loads(line)
+            except ValueError:
+                # 并发追加被中断留下的半行
+                continue
+            if isinstance(row, dict) and row.get("data_id"):
+                summaries[row["data_id"]] = row
+    return summaries
+
+
+def write_summaries(agent_results_dir: Union[str, Path], summaries: Dict[str, Dict]) -> Path:
+    """整体重写批次摘要文件（每个样本一行，按data_id排序）"""
+    path = summary_path(agent_results_dir)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for data_id in sorted(summaries):
+            f.write(dumps(summaries[data_id], compact=True) + "\n")
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工具调用索引
+============
+
+每个样本只遍历一次 conversation_history：解析所有 tool_calls 的 arguments（只做一次json.loads），
+按工具名建立索引，并预先计算参数值的小写字符串（供 contains / prefix 匹配使用）。
+
+tool_called_with_params / tool_call_absence 等检查直接查询索引，复杂度为 O(该工具的调用次数)；
+同时支持顺序查询，例如"先读取 OUTLINE_DESIGN_GUIDE.md，再首次写入 chapters/"。
+
+时序断言（tool_call_order检查使用）：evaluate_order_assertions 对调用序列只做一次线性遍历，
+每条断言维护一个小状态机，支持：
+    before          - A 的首次发生早于 B 的首次发生
+    at_least_every  - 每 K 次 event 之间至少出现一次 marker（如每写K章至少更新一次writing_log.md）
+    not_after       - trigger 首次发生之后不允许再出现 forbidden
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class ToolCall(NamedTuple):
+    """一次工具调用"""
+    seq: int                          # 在整个对话中的调用序号（从0开始）
+    turn: int                         # 所在消息在conversation_history中的下标
+    name: str                         # 工具名
+    arguments: Optional[Dict]         # 解析后的参数（arguments不是合法JSON时为None）
+    lowered: Dict[str, str]           # 参数值的小写字符串形式
+
+
+def _lower_values(arguments: Optional[Dict]) -> Dict[str, str]:
+    if not isinstance(arguments, dict):
+        return {}
+    return {k: str(v).lower() for k, v in arguments.items()}
+
+
+def params_match(call: ToolCall, expected_params: Optional[Dict], mode: str = "exact") -> bool:
+    """判断一次调用的参数是否满足期望（期望值为None表示通配）
+
+    mode:
+        exact    - 参数值完全相等（默认）
+        contains - 不区分大小写的子串匹配
+        prefix   - 不区分大小写的前缀匹配（如 path 以 "chapters/" 开头）
+    """
+    if call.arguments is None:
+        return False
+    if not expected_params:
+        return True
+    if mode == "contains":
+        return all(
+            v is None or str(v).lower() in call.lowered.get(k, "")
+            for k, v in expected_params.items()
+        )
+    if mode == "prefix":
+        return all(
+            v is None or call.lowered.get(k, "").startswith(str(v).lower())
+            for k, v in expected_params.items()
+        )
+    return all(
+        call.arguments.get(k) == v
+        for k, v in expected_params.items()
+        if v is not None
+    )
+
+
+class ToolCallIndex:
+    """按工具名索引的工具调用序列"""
+
+    def __init__(self, conversation_history: Iterable[Dict]):
+        self.calls: List[ToolCall] = []
+        self.by_name: Dict[str, List[ToolCall]] = {}
+        for turn, message in enumerate(conversation_history or []):
+            if message.get("role") != "assistant" or "tool_calls" not in message:
+                continue
+            for tool_call in message.get("tool_calls") or []:
+                function = tool_call.get("function", {}) or {}
+                name = function.get("name", "")
+                arguments = function.get("arguments", {})
+                if isinstance(arguments, str):
+                    try:
+                        arguments = json.loads(arguments)
+                    except json.JSONDecodeError:
+                        arguments = None
+                call = ToolCall(len(self.calls), turn, name, arguments, _lower_values(arguments))
+                self.calls.append(call)
+                self.by_name.setdefault(name, []).append(call)
+
+    @classmethod
+    def ensure(cls, history_or_index) -> "ToolCallIndex":
+        """兼容旧调用方式：传入conversation_history时现场建索引"""
+        if isinstance(history_or_index, cls):
+            return history_or_index
+        return cls(history_or_index)
+
+    def __len__(self) -> int:
+        return len(self.calls)
+
+    def names(self) -> List[str]:
+        return list(self.by_name)
+
+    def calls_of(self, name: str) -> List[ToolCall]:
+        """某个工具的全部调用（按调用顺序）"""
+        return self.by_name.get(name, [])
+
+    def count(self, name: str) -> int:
+        return len(self.by_name.get(name, ()))
+
+    def find(self, name: str, expected_params: Optional[Dict] = None, mode: str = "exact") -> List[ToolCall]:
+        """参数匹配的调用列表（arguments无法解析的调用不参与匹配）"""
+        return [call for call in self.calls_of(name) if params_match(call, expected_params, mode)]
+
+    def first(self, name: str, expected_params: Optional[Dict] = None, mode: str = "exact",
+              after: int = -1) -> Optional[ToolCall]:
+        """第一次（序号大于after的）匹配调用，不存在返回None"""
+        for call in self.calls_of(name):
+            if call.seq > after and params_match(call, expected_params, mode):
+                return call
+        return None
+
+    def precedes(self, before: Dict, after: Dict) -> Tuple[bool, Optional[ToolCall], Optional[ToolCall]]:
+        """顺序查询：before描述的调用是否发生在after描述的调用首次出现之前
+
+        before / after: {"tool_name": ..., "expected_params": {...}, "param_match_mode": "exact"}
+
+        Returns:
+            (是否满足, before的首次匹配调用, after的首次匹配调用)
+            after从未发生时，只要before发生过即视为满足
+        """
+        first_after = self.first(after.get("tool_name"), after.get("expected_params"),
+                                 after.get("param_match_mode", "exact"))
+        first_before = self.first(before.get("tool_name"), before.get("expected_params"),
+                                  before.get("param_match_mode", "exact"))
+        if first_before is None:
+            return False, None, first_after
+        if first_after is None:
+            return True, first_before, None
+        return first_before.seq < first_after.seq, first_before, first_after
+
+
+# ---------- 时序断言 ----------
+
+ORDER_ASSERTION_TYPES = ("before", "at_least_every", "not_after")
+
+
+def spec_matches(call: ToolCall, spec: Dict) -> bool:
+    """调用是否匹配事件描述
+
+    spec: {"tool_name": 工具名或工具名列表, "expected_params": {...}, "param_match_mode": "exact"}
+    """
+    names = spec.get("tool_name")
+    if isinstance(names, str):
+        if call.name != names:
+            return False
+    elif names and call.name not in names:
+        return False
+    return params_match(call, spec.get("expected_params"), spec.get("param_match_mode", "exact"))
+
+
+def describe_spec(spec: Dict) -> str:
+    names = spec.get("tool_name")
+    if isinstance(names, list):
+        names = "|".join(names)
+    params = spec.get("expected_params")
+    return f"{names}({params})" if params else str(names)
+
+
+def _at(call: Optional[ToolCall]) -> Optional[Dict[str, int]]:
+    return {"seq": call.seq, "turn": call.turn} if call is not None else None
+
+
+class _BeforeState:
+    """before: 'before' 事件必须在 'after' 事件首次发生之前出现"""
+
+    def __init__(self, assertion: Dict):
+        self.before = assertion.get("before", {})
+        self.after = assertion.get("after", {})
+        self.if_after_missing = assertion.get("if_after_missing", "skip")
+        self.first_before: Optional[ToolCall] = None
+        self.first_after: Optional[ToolCall] = None
+
+    def feed(self, call: ToolCall) -> bool:
+        """返回True表示状态已确定，不再需要后续调用"""
+        if self.first_before is None and spec_matches(call, self.before):
+            self.first_before = call
+            return False
+        if spec_matches(call, self.after):
+            self.first_after = call
+            return True
+        return False
+
+    def finish(self) -> Tuple[str, str, Dict]:
+        evidence = {"first_before": _at(self.first_before), "first_after": _at(self.first_after)}
+        before, after = describe_spec(self.before), describe_spec(self.after)
+        if self.first_after is None:
+            return (self.if_after_missing, f"{after} 从未发生"
+                    + (f"，{before} 发生于 #{self.first_before.seq}" if self.first_before else ""), evidence)
+        if self.first_before is None:
+            return "fail", f"{after} 首次发生于 #{self.first_after.seq}，此前未发生 {before}", evidence
+        return "pass", f"{before} (#{self.first_before.seq}) 早于 {after} (#{self.first_after.seq})", evidence
+
+
+class _AtLeastEveryState:
+    """at_least_every: 连续 k 次 event 之内必须出现一次 marker"""
+
+    def __init__(self, assertion: Dict):
+        self.event = assertion.get("event", {})
+        self.marker = assertion.get("marker", {})
+        self.k = int(assertion.get("k", 1))
+        self.require_trailing_marker = assertion.get("require_trailing_marker", False)
+        self.since_marker = 0
+        self.events = 0
+        self.markers = 0
+        self.max_gap = 0
+        self.violations: List[int] = []
+
+    def feed(self, call: ToolCall) -> bool:
+        if spec_matches(call, self.marker):
+            self.markers += 1
+            self.since_marker = 0
+        elif spec_matches(call, self.event):
+            self.events += 1
+            self.since_marker += 1
+            self.max_gap = max(self.max_gap, self.since_marker)
+            if self.since_marker == self.k + 1:
+                self.violations.append(call.seq)
+        return False
+
+    def finish(self) -> Tuple[str, str, Dict]:
+        evidence = {"events": self.events, "markers": self.markers, "max_gap": self.max_gap,
+                    "violations_at": self.violations}
+        event, marker = describe_spec(self.event), describe_spec(self.marker)
+        if self.events == 0:
+            return "skip", f"{event} 从未发生", evidence
+        if self.violations:
+            return ("fail", f"连续 {self.max_gap} 次 {event} 之间未出现 {marker}（要求每 {self.k} 次至少一次），"
+                    f"首次违反于 #{self.violations[0]}", evidence)
+        if self.require_trailing_marker and self.since_marker > 0:
+            return "fail", f"最后 {self.since_marker} 次 {event} 之后未出现 {marker}", evidence
+        return "pass", f"{self.events} 次 {event} 中，{marker} 出现 {self.markers} 次，最大间隔 {self.max_gap}", evidence
+
+
+class _NotAfterState:
+    """not_after: trigger 首次发生之后不允许出现 forbidden"""
+
+    def __init__(self, assertion: Dict):
+        self.trigger = assertion.get("trigger", {})
+        self.forbidden = assertion.get("forbidden", {})
+        self.first_trigger: Optional[ToolCall] = None
+        self.first_forbidden: Optional[ToolCall] = None
+
+    def feed(self, call: ToolCall) -> bool:
+        if self.first_trigger is None:
+            if spec_matches(call, self.trigger):
+                self.first_trigger = call
+            return False
+        if spec_matches(call, self.forbidden):
+            self.first_forbidden = call
+            return True
+        return False
+
+    def finish(self) -> Tuple[str, str, Dict]:
+        evidence = {"first_trigger": _at(self.first_trigger), "first_forbidden": _at(self.first_forbidden)}
+        trigger, forbidden = describe_spec(self.trigger), describe_spec(self.forbidden)
+        if self.first_trigger is None:
+            return "pass", f"{trigger} 从未发生", evidence
+        if self.first_forbidden is not None:
+            return ("fail", f"{trigger} (#{self.first_trigger.seq}) 之后仍出现 {forbidden} "
+                    f"(#{self.first_forbidden.seq})", evidence)
+        return "pass", f"{trigger} (#{self.first_trigger.seq}) 之后未出现 {forbidden}", evidence
+
+
+_ORDER_STATES = {
+    "before": _BeforeState,
+    "at_least_every": _AtLeastEveryState,
+    "not_after": _NotAfterState,
+}
+
+
+def evaluate_order_assertions(index: ToolCallIndex, assertions: List[Dict]) -> List[Dict[str, Any]]:
+    """单次线性遍历调用序列，评估所有时序断言
+
+    Returns:
+        与assertions一一对应的 [{"type", "description", "conclusion", "detail", "evidence"}]
+        conclusion 为 pass / fail / skip
+    """
+    states = []
+    for assertion in assertions:
+        state_cls = _ORDER_STATES.get(assertion.get("type"))
+        if state_cls is None:
+            raise ValueError(f"未知的时序断言类型: {assertion.get('type')}，可选: {list(ORDER_ASSERTION_TYPES)}")
+        states.append(state_cls(assertion))
+
+    active = list(states)
+    for call in index.calls:
+        if not active:
+            break
+        active = [state for state in active if not state.feed(call)]
+
+    results = []
+    for assertion, state in zip(assertions, states):
+        conclusion, detail, evidence = state.finish()
+        results.append({
+            "type": assertion.get("type"),
+            "description": assertion.get("description", ""),
+            "conclusion": conclusion,
+            "detail": detail,
+            "evidence": evidence,
+        })
+    return results
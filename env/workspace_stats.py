@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+workspace统计索引
+=================
+
+维护 workspace/.stats.json：记录每个文件的字节数、字符数、中文字符数、段落数、
+内容hash以及mtime，并汇总总计。
+
+- MCP服务（novel_writing_service.py）在每次 write_file / write_files 后增量更新
+- checker 的纯数值检查（word_count_range、章节长度稳定性、交替重复）优先读取索引，
+  索引中记录的 size/mtime 与磁盘一致时无需重新读取章节内容
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# 索引文件名（位于workspace根目录，file_whitelist_check会豁免此文件）
+STATS_FILENAME = ".stats.json"
+STATS_VERSION = 1
+
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+_PARAGRAPH_SPLIT_RE = re.compile(r'\n\s*\n')
+
+
+def compute_content_stats(content: str) -> Dict[str, Any]:
+    """计算单个文件内容的统计信息（不含mtime）"""
+    encoded = content.encode("utf-8")
+    paragraphs = [p for p in _PARAGRAPH_SPLIT_RE.split(content) if p.strip()]
+    return {
+        "size": len(encoded),
+        "char_count": len(content),
+        "cjk_count": len(_CJK_RE.findall(content)),
+        "paragraph_count": len(paragraphs),
+        "hash": hashlib.md5(encoded).hexdigest(),
+    }
+
+
+def _empty_index() -> Dict[str, Any]:
+    return {"version": STATS_VERSION, "files": {}, "totals": {}}
+
+
+def _recompute_totals(index: Dict[str, Any]) -> None:
+    files = index.get("files", {})
+    chapter_keys = [k for k in files if k.startswith("chapters/")]
+    index["totals"] = {
+        "file_count": len(files),
+        "chapter_count": len(chapter_keys),
+        "size": sum(f.get("size", 0) for f in files.values()),
+        "char_count": sum(f.get("char_count", 0) for f in files.values()),
+        "cjk_count": sum(f.get("cjk_count", 0) for f in files.values()),
+        "paragraph_count": sum(f.get("paragraph_count", 0) for f in files.values()),
+        "chapter_char_count": sum(files[k].get("char_count", 0) for k in chapter_keys),
+        "chapter_cjk_count": sum(files[k].get("cjk_count", 0) for k in chapter_keys),
+    }
+
+
+def load_stats(workspace_dir) -> Dict[str, Any]:
+    """加载workspace/.stats.json，不存在或损坏时返回空索引"""
+    stats_file = Path(workspace_dir) / STATS_FILENAME
+    if not stats_file.exists():
+        return _empty_index()
+    try:
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if not isinstance(index, dict) or index.get("version") != STATS_VERSION:
+            return _empty_index()
+        index.setdefault("files", {})
+        index.setdefault("totals", {})
+        return index
+    except Exception:
+        return _empty_index()
+
+
+def save_stats(workspace_dir, index: Dict[str, Any]) -> None:
+    """原子写入workspace/.stats.json"""
+    stats_file = Path(workspace_dir) / STATS_FILENAME
+    tmp_file = stats_file.with_name(STATS_FILENAME + ".tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, stats_file)
+
+
+def _stat_entry(full_path: Path, content: str) -> Dict[str, Any]:
+    entry = compute_content_stats(content)
+    st = full_path.stat()
+    # 以磁盘实际字节数为准（size/mtime用于新鲜度校验）
+    entry["size"] = st.st_size
+    entry["mtime_ns"] = st.st_mtime_ns
+    return entry
+
+
+def update_stats(workspace_dir, written: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+    """写入文件后增量更新索引
+
+    Args:
+        workspace_dir: workspace目录
+        written: [(相对workspace的路径, 写入的内容), ...]
+
+    Returns:
+        更新后的索引
+    """
+    workspace_dir = Path(workspace_dir)
+    index = load_stats(workspace_dir)
+    files = index["files"]
+    for rel_path, content in written:
+        key = Path(os.path.normpath(rel_path)).as_posix()
+        if key == STATS_FILENAME:
+            continue
+        full_path = workspace_dir / key
+        if not full_path.is_file():
+            files.pop(key, None)
+            continue
+        files[key] = _stat_entry(full_path, content)
+    _recompute_totals(index)
+    save_stats(workspace_dir, index)
+    return index
+
+
+def refresh_stats(workspace_dir) -> Dict[str, Any]:
+    """校验并刷新整个索引：删除已不存在的文件，重新统计被外部修改（如bash）的文件"""
+    workspace_dir = Path(workspace_dir)
+    index = load_stats(workspace_dir)
+    files = index["files"]
+    seen = set()
+    for root, dirs, names in os.walk(workspace_dir):
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        for name in names:
+            if name in (STATS_FILENAME, STATS_FILENAME + ".tmp"):
+                continue
+            full_path = Path(root) / name
+            key = full_path.relative_to(workspace_dir).as_posix()
+            seen.add(key)
+            entry = files.get(key)
+            st = full_path.stat()
+            if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                continue
+            try:
+                with open(full_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except (UnicodeDecodeError, OSError):
+                files.pop(key, None)
+                continue
+            files[key] = _stat_entry(full_path, content)
+    for key in list(files):
+        if key not in seen:
+            del files[key]
+    _recompute_totals(index)
+    save_stats(workspace_dir, index)
+    return index
+
+
+def lookup_fresh_stats(workspace_dir, file_paths: List) -> Optional[List[Dict[str, Any]]]:
+    """按顺序返回file_paths对应的索引条目
+
+    仅当所有文件都在索引中且size/mtime与磁盘一致时返回列表，否则返回None
+    （调用方应回退到读取文件内容）。
+    """
+    workspace_dir = Path(workspace_dir)
+    if not (workspace_dir / STATS_FILENAME).exists():
+        return None
+    files = load_stats(workspace_dir)["files"]
+    if not files:
+        return None
+    result = []
+    for file_path in file_paths:
+        full_path = Path(file_path)
+        try:
+            key = full_path.resolve().relative_to(workspace_dir.resolve()).as_posix()
+            st = full_path.stat()
+        except (ValueError, OSError):
+            return None
+        entry = files.get(key)
+        if not entry or entry.get("size") != st.st_size or entry.get("mtime_ns") != st.st_mtime_ns:
+            return None
+        result.append(entry)
+    return result
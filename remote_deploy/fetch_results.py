@@ -17,6 +17,10 @@ import io
 import urllib.request
 import urllib.error
 
+# 结果文件可能经 scripts/pack_results.py 压缩，通过 env/json_io 透明读写
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "env"))
+from json_io import dump_json, dumps, file_codec, load_json  # noqa: E402
+
 # 默认配置
 DEFAULT_HOST = "10.25.70.163"
 DEFAULT_PORT = 9090
@@ -72,8 +76,7 @@ def patch_env_dir(target_dir):
     for f in sorted(glob.glob(os.path.join(target_dir, "*.json"))):
         if os.path.basename(f) == "execution_report.json":
             continue
-        with open(f, "r", encoding="utf-8") as fh:
-            d = json.load(fh)
+        d = load_json(f)
         env_dir = d.get("env_dir", "")
         if not env_dir or local_base in env_dir:
             continue
@@ -83,9 +86,13 @@ def patch_env_dir(target_dir):
         idx = env_dir.find("evaluation_outputs/")
         if idx >= 0:
             d["env_dir"] = os.path.join(local_base, env_dir[idx:])
-            with open(f, "w", encoding="utf-8") as fh:
-                json.dump(d, fh, ensure_ascii=False, indent=2)
-                fh.write("\n")
+            codec = file_codec(f)
+            if codec is None:
+                with open(f, "w", encoding="utf-8") as fh:
+                    fh.write(dumps(d))
+                    fh.write("\n")
+            else:
+                dump_json(d, f, codec=codec)
             patched += 1
     if patched:
         print(f"  ✓ 已修补 {patched} 个文件的 env_dir 路径")
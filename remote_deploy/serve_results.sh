@@ -71,10 +71,16 @@ import os
 import tarfile
 import json
 import urllib.parse
+import sys
 
 PORT = $PORT
 ROOT = '$NOVEL_DIR'
 
+# 结果文件可能经 scripts/pack_results.py 压缩，通过 env/json_io 透明读取
+sys.path.insert(0, os.path.join(ROOT, 'env'))
+from json_io import decompress, load_fields
+from sample_summary import load_summaries
+
 class EnhancedHandler(http.server.SimpleHTTPRequestHandler):
 
     def do_GET(self):
@@ -94,13 +100,16 @@ class EnhancedHandler(http.server.SimpleHTTPRequestHandler):
                     if os.path.isdir(full):
                         json_files = [f for f in os.listdir(full)
                                       if f.endswith('.json') and f != 'execution_report.json']
+                        # 优先读批次摘要 sample_summaries.jsonl，缺失的样本再读结果文件
+                        summaries = load_summaries(full)
                         success = 0
                         for jf in json_files:
                             try:
-                                with open(os.path.join(full, jf)) as fh:
-                                    data = json.load(fh)
-                                    if data.get('execution_status') == 'success':
-                                        success += 1
+                                data = summaries.get(jf[:-len('.json')])
+                                if data is None:
+                                    data = load_fields(os.path.join(full, jf), ['execution_status'])
+                                if data.get('execution_status') == 'success':
+                                    success += 1
                             except:
                                 pass
                         result.append({
@@ -153,7 +162,7 @@ class EnhancedHandler(http.server.SimpleHTTPRequestHandler):
             self._json_response(files)
             return
 
-        # /api/file/<path> -- 读取任意文件（文本）
+        # /api/file/<path> -- 读取任意文件（文本，压缩文件返回解压后的内容）
         if raw_path.startswith('api/file/'):
             rel = raw_path[len('api/file/'):]
             filepath = os.path.normpath(os.path.join(ROOT, rel))
@@ -164,8 +173,8 @@ class EnhancedHandler(http.server.SimpleHTTPRequestHandler):
                 self.send_error(404, f'File not found: {rel}')
                 return
             try:
-                with open(filepath, 'r', errors='replace') as f:
-                    content = f.read()
+                with open(filepath, 'rb') as f:
+                    content = decompress(f.read()).decode('utf-8', errors='replace')
                 self._json_response({
                     'path': rel,
                     'size': os.path.getsize(filepath),
@@ -20,6 +20,13 @@ python scripts/analysis/generate_statistics.py \
     --eval-dir eval_dsv1_20260214_014809_claude-opus-4-6 \
     --output-dir ./analysis_opus
 
+附带judge单价估算开销（可选，单价为 USD / 1M tokens）：
+python scripts/analysis/generate_statistics.py \
+    --eval-dir evaluation_outputs/eval_dsv1_20260214_014809_claude-opus-4-6 \
+    --judge-pricing judge_pricing.json \
+    --output-dir ./analysis_opus
+# judge_pricing.json: {"gpt-5.2": {"input": 1.25, "cached_input": 0.125, "output": 10.0}}
+
 指定revision版本：
 python scripts/analysis/generate_statistics.py \
     --eval-dir evaluation_outputs/eval_dsv1_20260214_014809_claude-opus-4-6 \
@@ -29,6 +36,7 @@ python scripts/analysis/generate_statistics.py \
 
 import json
 import argparse
+import math
 import re
 import sys
 import os
@@ -37,6 +45,10 @@ from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "env"))
+from json_io import load_fields, load_json, loads
+from check_result_store import hydrate_check_result, load_check_result
+
 try:
     import urllib.request
     import urllib.error
@@ -69,11 +81,22 @@ class RemoteReader:
             with urllib.request.urlopen(url, timeout=60) as resp:
                 data = json.loads(resp.read().decode("utf-8"))
                 content = data.get("content", "")
-                return json.loads(content)
+                return loads(content)
         except Exception as e:
             print(f"  警告: 无法读取文件 {path}: {e}")
             return None
 
+    def read_json_fields(self, path: str, fields: List[str]) -> Optional[Dict]:
+        """读取JSON文件的指定顶层字段（远程API只能整文件读取）"""
+        data = self.read_json(path)
+        if data is None:
+            return None
+        return {key: data[key] for key in fields if key in data}
+
+    def read_check_result(self, path: str) -> Optional[Dict]:
+        """读取check_result（紧凑格式时再读取批次目录下的检查项元数据字典）"""
+        return hydrate_check_result(self.read_json(path), path, self.read_json)
+
 
 class LocalReader:
     """读取本地文件系统"""
@@ -101,8 +124,29 @@ class LocalReader:
         if not full_path.exists():
             return None
         try:
-            with open(full_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return load_json(full_path)
+        except Exception as e:
+            print(f"  警告: 无法读取文件 {full_path}: {e}")
+            return None
+
+    def read_check_result(self, path: str) -> Optional[Dict]:
+        """读取check_result（明文/压缩/紧凑格式均可）"""
+        full_path = self.base_dir / path
+        if not full_path.exists():
+            return None
+        try:
+            return load_check_result(full_path)
+        except Exception as e:
+            print(f"  警告: 无法读取文件 {full_path}: {e}")
+            return None
+
+    def read_json_fields(self, path: str, fields: List[str]) -> Optional[Dict]:
+        """只读取JSON文件的指定顶层字段（不解析对话历史等大字段）"""
+        full_path = self.base_dir / path
+        if not full_path.exists():
+            return None
+        try:
+            return load_fields(full_path, fields)
         except Exception as e:
             print(f"  警告: 无法读取文件 {full_path}: {e}")
             return None
@@ -126,10 +170,11 @@ class NWStatisticsAnalyzer:
         "content_quality": "内容创作质量"
     }
 
-    def __init__(self, reader, eval_dir: str, revision: str = None):
+    def __init__(self, reader, eval_dir: str, revision: str = None, judge_pricing: Dict = None):
         self.reader = reader
         self.eval_dir = eval_dir
         self.revision = revision  # e.g. "rev008", None = auto-detect latest
+        self.judge_pricing = judge_pricing or {}  # judge模型 -> {input, cached_input, output} (USD / 1M tokens)
         self.model_name = self._extract_model_name()
 
         # 数据容器
@@ -155,7 +200,8 @@ class NWStatisticsAnalyzer:
         check_files = []
         for entry in env_entries:
             name = entry["name"]
-            if name.startswith("check_result") and name.endswith(".json"):
+            # 跳过旧版增量recheck指纹文件 check_result*.fingerprints.json
+            if name.startswith("check_result") and name.endswith(".json") and not name.endswith(".fingerprints.json"):
                 check_files.append(name)
 
         if not check_files:
@@ -210,7 +256,7 @@ class NWStatisticsAnalyzer:
 
         for sample_id in sorted(sample_ids):
             # 检查 execution_status
-            sample_json = self.reader.read_json(f"{eval_path}/{sample_id}.json")
+            sample_json = self.reader.read_json_fields(f"{eval_path}/{sample_id}.json", ["execution_status"])
             if sample_json is None:
                 continue
 
@@ -231,7 +277,7 @@ class NWStatisticsAnalyzer:
                 continue
 
             check_result_path = f"{eval_path}/{env_dir}/{check_filename}"
-            check_result = self.reader.read_json(check_result_path)
+            check_result = self.reader.read_check_result(check_result_path)
 
             if check_result is None:
                 print(f"  警告: {sample_id} 无法读取 {check_filename}")
@@ -531,8 +577,104 @@ class NWStatisticsAnalyzer:
 
         return result
 
+    def analyze_judge_usage(self) -> Dict:
+        """Judge开销统计：按check_id、按judge模型聚合token/耗时/重试/截断（依赖check_result中的judge_usage）"""
+        counter_fields = ["calls", "dedup_hits", "prompt_tokens", "completion_tokens", "cached_tokens",
+                          "latency_ms", "retries", "failed_calls", "truncated_calls"]
+
+        def new_bucket():
+            bucket = {field: 0 for field in counter_fields}
+            bucket.update({"samples": 0, "max_latency_ms": 0, "estimated_cost": 0.0, "latencies": []})
+            return bucket
+
+        by_check = defaultdict(new_bucket)
+        by_judge_model = defaultdict(new_bucket)
+        totals = new_bucket()
+        sample_latencies = []
+
+        for sample_id, cr in self.check_results.items():
+            sample_latency = 0
+            has_usage = False
+            for check_name, detail in cr.get("check_details", {}).items():
+                usage = detail.get("judge_usage")
+                if not usage:
+                    continue
+                has_usage = True
+                cost = self._estimate_judge_cost(usage.get("by_model", {}))
+                for bucket in (by_check[check_name], totals):
+                    for field in counter_fields:
+                        bucket[field] += usage.get(field, 0)
+                    bucket["max_latency_ms"] = max(bucket["max_latency_ms"], usage.get("max_latency_ms", 0))
+                    bucket["estimated_cost"] += cost
+                by_check[check_name]["samples"] += 1
+                by_check[check_name]["latencies"].append(usage.get("latency_ms", 0))
+                sample_latency += usage.get("latency_ms", 0)
+
+                for judge_model, counters in usage.get("by_model", {}).items():
+                    bucket = by_judge_model[judge_model]
+                    for field in counter_fields:
+                        bucket[field] += counters.get(field, 0)
+                    bucket["max_latency_ms"] = max(bucket["max_latency_ms"], counters.get("max_latency_ms", 0))
+                    bucket["estimated_cost"] += self._estimate_judge_cost({judge_model: counters})
+            if has_usage:
+                totals["samples"] += 1
+                sample_latencies.append(sample_latency)
+
+        if totals["samples"] == 0:
+            return {}
+
+        def finalize(bucket):
+            latencies = bucket.pop("latencies")
+            calls = bucket["calls"]
+            bucket["mean_latency_ms_per_call"] = round(bucket["latency_ms"] / calls) if calls else 0
+            bucket["cache_hit_rate"] = (round(bucket["cached_tokens"] / bucket["prompt_tokens"], 4)
+                                        if bucket["prompt_tokens"] else 0)
+            bucket["estimated_cost"] = round(bucket["estimated_cost"], 4)
+            if latencies:
+                bucket["p95_latency_ms"] = self._percentile(latencies, 0.95)
+            return bucket
+
+        return {
+            "model_under_test": self.model_name,
+            "pricing_available": bool(self.judge_pricing),
+            "totals": finalize(totals),
+            "per_sample": {
+                "mean_prompt_tokens": round(totals["prompt_tokens"] / totals["samples"]),
+                "mean_latency_ms": round(sum(sample_latencies) / len(sample_latencies)),
+                "p95_latency_ms": self._percentile(sample_latencies, 0.95),
+                "mean_estimated_cost": round(totals["estimated_cost"] / totals["samples"], 4),
+            },
+            "by_check": dict(sorted(
+                ((k, finalize(v)) for k, v in by_check.items()),
+                key=lambda x: (x[1]["estimated_cost"], x[1]["prompt_tokens"]), reverse=True
+            )),
+            "by_judge_model": {k: finalize(v) for k, v in sorted(by_judge_model.items())},
+        }
+
+    def _estimate_judge_cost(self, by_model: Dict) -> float:
+        """按judge单价估算开销（USD），未配置单价的模型计为0"""
+        cost = 0.0
+        for judge_model, counters in by_model.items():
+            price = self.judge_pricing.get(judge_model)
+            if not price:
+                continue
+            cached = counters.get("cached_tokens", 0)
+            uncached = max(counters.get("prompt_tokens", 0) - cached, 0)
+            cost += (uncached * price.get("input", 0)
+                     + cached * price.get("cached_input", price.get("input", 0))
+                     + counters.get("completion_tokens", 0) * price.get("output", 0)) / 1_000_000
+        return cost
+
     # -- 辅助方法 -------------------------------------------------------
 
+    def _percentile(self, values: List[float], q: float) -> float:
+        """最近秩百分位数"""
+        if not values:
+            return 0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
     def _parse_sample_id(self, sample_id: str) -> Dict:
         """解析sample_id中的各维度信息
         
@@ -606,6 +748,7 @@ class NWStatisticsAnalyzer:
         subcategories = self.analyze_subcategories()
         by_writing_params = self.analyze_by_writing_params()
         failure_details = self.extract_failure_details()
+        judge_usage = self.analyze_judge_usage()
 
         # 确定使用了哪些revision
         revisions_used = set(self.check_revision_used.values())
@@ -625,6 +768,8 @@ class NWStatisticsAnalyzer:
             "by_writing_params": by_writing_params,
             "failure_details": failure_details
         }
+        if judge_usage:
+            report["judge_usage"] = judge_usage
 
         output_file.parent.mkdir(parents=True, exist_ok=True)
         with open(output_file, "w", encoding="utf-8") as f:
@@ -776,6 +921,43 @@ class NWStatisticsAnalyzer:
                     lines.append(f"  - 原因: {case['reason'][:150]}")
                     lines.append(f"")
 
+        # -- Judge开销统计 --
+        ju = report.get("judge_usage", {})
+        if ju:
+            jt = ju["totals"]
+            ps = ju["per_sample"]
+            cost_enabled = ju.get("pricing_available")
+            lines.append(f"## 6. Judge开销统计")
+            lines.append(f"")
+            lines.append(f"- **被测模型**: `{ju['model_under_test']}` ({jt['samples']} 个样本有judge用量记录)")
+            lines.append(f"- **调用**: {jt['calls']} 次 (去重复用 {jt['dedup_hits']} 次), 重试 {jt['retries']} 次, 失败 {jt['failed_calls']} 次, 截断 {jt['truncated_calls']} 次")
+            lines.append(f"- **Tokens**: prompt {jt['prompt_tokens']:,} (缓存命中 {jt['cache_hit_rate']*100:.1f}%), completion {jt['completion_tokens']:,}")
+            lines.append(f"- **每样本**: 平均 {ps['mean_prompt_tokens']:,} prompt tokens, 平均耗时 {ps['mean_latency_ms']/1000:.1f}s, P95 {ps['p95_latency_ms']/1000:.1f}s")
+            if cost_enabled:
+                lines.append(f"- **估算开销**: ${jt['estimated_cost']:.2f} (每样本 ${ps['mean_estimated_cost']:.4f})")
+            lines.append(f"")
+
+            lines.append(f"### 按检查项（按开销/tokens降序）")
+            lines.append(f"")
+            lines.append(f"| 检查项 | 样本数 | 调用 | Prompt Tokens | 缓存命中 | Completion | 平均单次耗时 | P95耗时 | 重试 | 截断 | 估算开销 |")
+            lines.append(f"|--------|--------|------|---------------|----------|------------|--------------|---------|------|------|----------|")
+            for check_name, b in ju["by_check"].items():
+                cost = f"${b['estimated_cost']:.4f}" if cost_enabled else "-"
+                lines.append(f"| {check_name} | {b['samples']} | {b['calls']} | {b['prompt_tokens']:,} | {b['cache_hit_rate']*100:.1f}% | "
+                             f"{b['completion_tokens']:,} | {b['mean_latency_ms_per_call']/1000:.1f}s | {b.get('p95_latency_ms', 0)/1000:.1f}s | "
+                             f"{b['retries']} | {b['truncated_calls']} | {cost} |")
+            lines.append(f"")
+
+            lines.append(f"### 按Judge模型")
+            lines.append(f"")
+            lines.append(f"| Judge模型 | 调用 | Prompt Tokens | 缓存命中 | Completion | 平均单次耗时 | 最长耗时 | 估算开销 |")
+            lines.append(f"|-----------|------|---------------|----------|------------|--------------|----------|----------|")
+            for judge_model, b in ju["by_judge_model"].items():
+                cost = f"${b['estimated_cost']:.4f}" if cost_enabled else "-"
+                lines.append(f"| {judge_model} | {b['calls']} | {b['prompt_tokens']:,} | {b['cache_hit_rate']*100:.1f}% | "
+                             f"{b['completion_tokens']:,} | {b['mean_latency_ms_per_call']/1000:.1f}s | {b['max_latency_ms']/1000:.1f}s | {cost} |")
+            lines.append(f"")
+
         # 写入文件
         output_file.parent.mkdir(parents=True, exist_ok=True)
         with open(output_file, "w", encoding="utf-8") as f:
@@ -790,8 +972,15 @@ def main():
     parser.add_argument("--output-dir", required=True, help="输出目录")
     parser.add_argument("--remote-url", default=None, help="远程HTTP API地址 (如 http://10.25.70.163:9090)")
     parser.add_argument("--revision", default=None, help="指定check_result的revision版本 (如 rev008)，默认自动选最新")
+    parser.add_argument("--judge-pricing", default=None,
+                        help="judge模型单价JSON文件（USD / 1M tokens），用于估算Judge开销")
     args = parser.parse_args()
 
+    judge_pricing = None
+    if args.judge_pricing:
+        with open(args.judge_pricing, "r", encoding="utf-8") as f:
+            judge_pricing = json.load(f)
+
     # 选择reader
     if args.remote_url:
         print(f"使用远程模式: {args.remote_url}")
@@ -807,7 +996,7 @@ def main():
         print(f"使用本地模式")
 
     # 创建分析器
-    analyzer = NWStatisticsAnalyzer(reader, args.eval_dir, revision=args.revision)
+    analyzer = NWStatisticsAnalyzer(reader, args.eval_dir, revision=args.revision, judge_pricing=judge_pricing)
     analyzer.load_data()
 
     if not analyzer.check_results:
@@ -10,10 +10,14 @@
    - 如果失败原因是".hitl_context.json"被当作额外文件，改成pass
 """
 
-import json
 import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "env"))
+from check_result_store import load_check_result  # noqa: E402
+from json_io import dump_json, file_codec  # noqa: E402
+
 # v2新增的5个skill文件
 V2_SKILL_FILES = [
     "data_pools/skills/RECIPE_KNOWLEDGE.md",
@@ -27,8 +31,9 @@ def fix_check_result(check_result_path: Path):
     """修复单个check_result文件"""
     env_dir = check_result_path.parent
     
-    with open(check_result_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # 紧凑格式（scripts/pack_results.py）还原后才有 subcategory_id
+    codec = file_codec(check_result_path)
+    data = load_check_result(check_result_path)
     
     modified = False
     check_details = data.get("check_details", {})
@@ -80,8 +85,8 @@ def fix_check_result(check_result_path: Path):
         # 重新计算统计数据
         recalculate_stats(data)
         
-        with open(check_result_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 保持原压缩格式，检查项元数据写回内联
+        dump_json(data, check_result_path, codec=codec)
         return True
     
     return False
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+批量recheck编排器（Python版 batch_recheck.sh + recheck_with_new_checklist.sh）
+
+与shell版本的区别：
+- 进程内直接调用 checker.run_checker，不再为每个样本启动 python checker.py
+- 所有目录 × 样本共用一个样本并发池（--concurrency），不再受目录级并行限制
+- judge调用共享全局并发上限（--judge-concurrency）和可选速率上限（--judge-rpm），
+  让judge端点按配置的速率保持饱和，而不是被目录数/样本串行卡住
+- judge请求去重（默认开启）：不同目录中逐字节相同的workspace产生的相同请求只调用一次，
+  并发的相同请求等待同一次调用，已完成的从结果缓存返回；--judge-cache-dir 落盘跨批次复用
+- 模型名从目录名解析改为正则（与 batch_recheck.sh 的 MODEL_NAME_SED 等价）
+- 每个样本的输出（含检查项并发线程中的输出）写入独立日志文件
+
+checklist来源模式与shell版本一致：
+  1. inline（默认）：check_list 内嵌在样本 JSON 中
+  2. revision：从 check_definitions/check_revisions/rev_NNN/ 读取（--revision）
+  3. samples：从样本 JSONL 文件提取 check_list（--samples，优先于revision）
+
+judge端点按模型名选择（与 recheck_with_new_checklist.sh 相同的规则），密钥从环境变量读取：
+  ernie-*  → 千帆（QIANFAN_API_KEY），glm-* → 智谱（ZHIPU_API_KEY），其他 → 内部API（JUDGE_API_KEY）
+  也可用 --base-url / --api-key 直接指定
+
+用法示例:
+    # inline模式，16个样本并发，judge最多12路并发
+    python scripts/batch_recheck.py --concurrency 16 --judge-concurrency 12
+
+    # revision模式 + resume
+    python scripts/batch_recheck.py --revision 004 --resume
+
+    # 只重跑指定检查项（在已有结果上覆盖）
+    python scripts/batch_recheck.py --revision 004 --only-checks '场景数量合理,内容单元密度'
+
+    # dry-run 预览将要处理的样本
+    python scripts/batch_recheck.py --revision 004 --pattern '*claude*' --dry-run
+"""
+import argparse
+import contextvars
+import io
+import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SCENARIO_ROOT = SCRIPT_DIR.parent
+ENV_DIR = SCENARIO_ROOT / "env"
+EVAL_OUTPUTS_DIR = SCENARIO_ROOT / "evaluation_outputs"
+REVISIONS_DIR = SCENARIO_ROOT / "check_definitions" / "check_revisions"
+
+sys.path.insert(0, str(ENV_DIR))
+
+from checker import CheckerError, build_arg_parser, run_checker  # noqa: E402
+from checker_execute import configure_judge_dedup, configure_judge_limits  # noqa: E402
+from extract_bench_from_revision import extract_bench as extract_bench_from_revision  # noqa: E402
+from extract_bench_from_sample import extract_bench as extract_bench_from_sample  # noqa: E402
+
+# ==================== 场景配置区（与 batch_recheck.sh 保持一致） ====================
+DEFAULT_PATTERN = "eval_dsv*"
+MODEL_NAME_RE = re.compile(r"eval_dsv\d*_\d*_\d*_")
+# ===================================================================================
+
+# 与 recheck_with_new_checklist.sh 一致：这些json不是agent结果
+NON_RESULT_PREFIXES = ("summary_", "temp_")
+NON_RESULT_NAMES = ("execution_report",)
+TEMP_BENCH_NAME = "temp_bench_recheck.json"
+
+# 模型名前缀 → (API端点, 密钥环境变量)
+JUDGE_ENDPOINTS = (
+    ("ernie-", "https://qianfan.baidubce.com/v2", "QIANFAN_API_KEY"),
+    ("glm-", "https://open.bigmodel.cn/api/paas/v4", "ZHIPU_API_KEY"),
+    ("", "http://yy.dbh.baidu-int.com/v1", "JUDGE_API_KEY"),
+)
+MODEL_ALIASES = {"ernie-5.0": "ernie-5.0-thinking-preview"}
+
+
+# ==================== 每样本输出路由 ====================
+
+_sample_log = contextvars.ContextVar("sample_log", default=None)
+
+
+class _SampleOutputRouter(io.TextIOBase):
+    """按当前上下文把 stdout/stderr 写入对应样本的日志文件
+
+    checker 的检查项并发线程由 run_check_dag 在调用方上下文中执行，因此输出同样会被路由
+    """
+
+    def __init__(self, default):
+        self._default = default
+
+    def write(self, s):
+        stream = _sample_log.get() or self._default
+        return stream.write(s)
+
+    def flush(self):
+        stream = _sample_log.get() or self._default
+        stream.flush()
+
+    def writable(self):
+        return True
+
+
+# ==================== 作业枚举 ====================
+
+def model_name_of(dir_name):
+    return MODEL_NAME_RE.sub("", dir_name, count=1)
+
+
+def resolve_judge_endpoint(model, base_url=None, api_key=None):
+    """按模型名选择judge端点（规则同 recheck_with_new_checklist.sh）
+
+    Returns:
+        (模型名, API端点, 密钥)
+    """
+    model = MODEL_ALIASES.get(model, model)
+    for prefix, default_base, key_env in JUDGE_ENDPOINTS:
+        if model.startswith(prefix):
+            return model, base_url or default_base, api_key or os.environ.get(key_env, "")
+    return model, base_url, api_key
+
+
+def output_file_name(args):
+    """与 recheck_with_new_checklist.sh 相同的输出文件名规则"""
+    suffix = args.output_suffix
+    if not suffix and args.revision and not args.samples:
+        suffix = f"_rev{args.revision}"
+    return f"check_result{suffix}.json"
+
+
+def collect_jobs(eval_dirs, args):
+    """展开 (eval目录, 样本) 作业；返回 (jobs, skipped)"""
+    output_name = output_file_name(args)
+    rerun_existing = args.add or args.only_checks or args.incremental
+    jobs, skipped = [], []
+    for eval_dir in eval_dirs:
+        agent_results_dir = eval_dir / "execution" if (eval_dir / "execution").is_dir() else eval_dir
+        for result_json in sorted(agent_results_dir.glob("*.json")):
+            sample_id = result_json.stem
+            if sample_id.startswith(NON_RESULT_PREFIXES) or sample_id in NON_RESULT_NAMES:
+                continue
+            if args.data_id and sample_id != args.data_id:
+                continue
+            env_dir = agent_results_dir / f"{sample_id}_env"
+            job = {
+                "eval_dir": eval_dir.name,
+                "sample_id": sample_id,
+                "result_json": result_json.resolve(),
+                "env_dir": env_dir.resolve(),
+                "output": env_dir.resolve() / output_name,
+            }
+            if not env_dir.is_dir():
+                skipped.append((job, "env目录不存在"))
+            elif not (env_dir / "checker.py").is_file():
+                skipped.append((job, "checker.py不存在"))
+            elif args.resume and job["output"].exists() and not rerun_existing:
+                skipped.append((job, f"已存在 {output_name}"))
+            else:
+                jobs.append(job)
+    return jobs, skipped
+
+
+# ==================== 单样本执行 ====================
+
+def prepare_bench(job, args):
+    """构造bench.json路径；revision/samples模式同时部署judge_criteria/environment文件"""
+    if not args.samples and not args.revision:
+        return job["result_json"]
+    temp_bench = job["env_dir"] / TEMP_BENCH_NAME
+    if args.samples:
+        code = extract_bench_from_sample(args.samples, job["sample_id"], str(temp_bench),
+                                         deploy_env_dir=str(job["env_dir"]))
+    else:
+        revision_dir = REVISIONS_DIR / f"rev_{args.revision}"
+        code = extract_bench_from_revision(str(revision_dir / "checklist.jsonl"), job["sample_id"],
+                                           str(temp_bench),
+                                           criteria_dir=str(revision_dir / "judge_criteria"),
+                                           env_dir=str(job["env_dir"]))
+    if code != 0:
+        raise CheckerError("构造bench.json失败")
+    return temp_bench
+
+
+def checker_argv(job, bench, args, endpoint):
+    model, base_url, api_key = endpoint
+    argv = [
+        "--bench", str(bench),
+        "--result", str(job["result_json"]),
+        "--model", model,
+        "--base-url", base_url,
+        "--api-key", api_key,
+        "--output", str(job["output"]),
+        "--work-dir", str(job["env_dir"]),
+        "--check-concurrency", str(args.check_concurrency),
+        "--prompt-layout", args.prompt_layout,
+    ]
+    if args.group_judging:
+        argv.append("--group-judging")
+    if args.compact:
+        argv.append("--compact")
+    # 增量模式：与 recheck_with_new_checklist.sh 相同的 --existing-result 传递规则
+    has_existing = job["output"].exists()
+    if args.add and has_existing:
+        argv += ["--existing-result", str(job["output"])]
+    if args.incremental:
+        argv.append("--incremental")
+    if args.only_checks:
+        argv += ["--only-checks", args.only_checks]
+        if not args.add and has_existing:
+            argv += ["--existing-result", str(job["output"])]
+    return argv
+
+
+def run_job(job, args, endpoint, log_dir):
+    """执行单个样本，输出写入 <log_dir>/<eval目录>/<样本>.log；返回 (是否成功, 耗时秒)"""
+    log_file = log_dir / job["eval_dir"] / f"{job['sample_id']}.log"
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    start = time.time()
+    with open(log_file, "w", encoding="utf-8", buffering=1) as log:
+        token = _sample_log.set(log)
+        bench = None
+        try:
+            bench = prepare_bench(job, args)
+            checker_args = build_arg_parser().parse_args(checker_argv(job, bench, args, endpoint))
+            run_checker(checker_args)
+            ok = True
+        except Exception:
+            traceback.print_exc(file=log)
+            ok = False
+        finally:
+            if bench is not None and bench != job["result_json"]:
+                bench.unlink(missing_ok=True)
+            _sample_log.reset(token)
+    return ok, time.time() - start
+
+
+# ==================== 主流程 ====================
+
+def main():
+    parser = argparse.ArgumentParser(description="批量recheck编排器（进程内执行，全局judge并发预算）")
+    parser.add_argument("--revision", default=None, help="checklist revision编号（如 003）。不指定则使用inline模式")
+    parser.add_argument("--samples", default=None, help="从样本JSONL提取check_list（samples模式，优先于revision）")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN, help=f"eval目录匹配模式（默认 {DEFAULT_PATTERN}）")
+    parser.add_argument("--model", default="gpt-5.2", help="judge模型名称（默认 gpt-5.2）")
+    parser.add_argument("--base-url", default=None, help="judge API端点（默认按模型名选择）")
+    parser.add_argument("--api-key", default=None, help="judge API密钥（默认从环境变量读取）")
+    parser.add_argument("--resume", action="store_true", help="跳过已有结果的样本")
+    parser.add_argument("--dry-run", action="store_true", help="只显示将要处理的样本")
+    parser.add_argument("--data-id", default=None, help="仅处理指定data_id的样本")
+    parser.add_argument("--output-suffix", default="", help="覆盖自动后缀（默认 _revNNN）")
+    parser.add_argument("--only-checks", default=None,
+                        help="只执行指定检查项（逗号分隔，支持语义ID，也兼容数字序号）")
+    parser.add_argument("--add", action="store_true", help="增量模式：在已有结果上增跑新检查项")
+    parser.add_argument("--incremental", action="store_true", help="增量recheck：只重跑输入指纹变化的检查项")
+    parser.add_argument("--concurrency", type=int, default=8, help="同时执行的样本数（所有目录共享，默认 8）")
+    parser.add_argument("--judge-concurrency", type=int, default=8,
+                        help="同时在途的judge请求数上限（所有样本共享，默认 8）")
+    parser.add_argument("--judge-rpm", type=float, default=None, help="judge请求每分钟上限（默认不限制）")
+    parser.add_argument("--no-judge-dedup", action="store_true", help="关闭judge请求去重")
+    parser.add_argument("--judge-cache-dir", default=None,
+                        help="judge请求去重缓存目录（落盘，跨批次/跨进程复用；默认只在内存中缓存）")
+    parser.add_argument("--check-concurrency", type=int, default=1,
+                        help="单个样本内互不依赖的检查项并发数（默认 1）")
+    parser.add_argument("--prompt-layout", choices=["criteria_first", "content_first"], default="criteria_first",
+                        help="judge prompt布局（同 checker.py --prompt-layout）")
+    parser.add_argument("--group-judging", action="store_true", help="分组评审（同 checker.py --group-judging）")
+    parser.add_argument("--compact", action="store_true", help="紧凑格式写出结果文件（同 checker.py --compact）")
+    parser.add_argument("--log-dir", default=None, help="日志目录（默认 logs/batch_recheck_<模式>_<时间>）")
+    args = parser.parse_args()
+
+    if args.revision and not args.samples and not (REVISIONS_DIR / f"rev_{args.revision}").is_dir():
+        print(f"错误: revision 目录不存在: {REVISIONS_DIR / f'rev_{args.revision}'}")
+        sys.exit(1)
+    if args.samples and not Path(args.samples).is_file():
+        print(f"错误: 样本文件不存在: {args.samples}")
+        sys.exit(1)
+
+    eval_dirs = sorted(p for p in EVAL_OUTPUTS_DIR.glob(args.pattern) if p.is_dir())
+    if not eval_dirs:
+        print(f"错误: 未找到匹配 '{args.pattern}' 的目录在 {EVAL_OUTPUTS_DIR}")
+        sys.exit(1)
+
+    if args.samples:
+        mode, checklist_desc = "samples", f"samples模式（从 {args.samples} 提取）"
+    elif args.revision:
+        mode, checklist_desc = f"rev{args.revision}", f"rev_{args.revision}"
+    else:
+        mode, checklist_desc = "inline", "inline模式（内嵌在样本JSON中）"
+    endpoint = resolve_judge_endpoint(args.model, args.base_url, args.api_key)
+    jobs, skipped = collect_jobs(eval_dirs, args)
+
+    print("==========================================")
+    print("  Batch Recheck")
+    print("==========================================")
+    print(f"Checklist:     {checklist_desc}")
+    print(f"Judge 模型:    {endpoint[0]} @ {endpoint[1]}")
+    print(f"样本并发:      {args.concurrency}")
+    print(f"Judge并发上限: {args.judge_concurrency}" + (f", {args.judge_rpm:g} rpm" if args.judge_rpm else ""))
+    print(f"Judge去重:     {'关闭' if args.no_judge_dedup else (args.judge_cache_dir or '内存缓存')}")
+    print(f"Resume:        {args.resume}")
+    print(f"Add模式:       {args.add}")
+    print(f"增量recheck:   {args.incremental}")
+    print(f"指定检查项:    {args.only_checks or '全部'}")
+    print(f"目录模式:      {args.pattern}")
+    print("")
+    print(f"将处理 {len(eval_dirs)} 个目录，{len(jobs)} 个样本（跳过 {len(skipped)} 个）:")
+    for eval_dir in eval_dirs:
+        count = sum(1 for job in jobs if job["eval_dir"] == eval_dir.name)
+        print(f"  - {eval_dir.name}  [{model_name_of(eval_dir.name)}]  {count} 个样本")
+    print("")
+
+    if args.dry_run:
+        print("[DRY RUN] 以下样本将被执行:")
+        for job in jobs:
+            print(f"  {job['eval_dir']}/{job['sample_id']} -> {job['output'].name}")
+        for job, reason in skipped:
+            print(f"  ⏭️  {job['eval_dir']}/{job['sample_id']}: {reason}")
+        print("")
+        print("[DRY RUN] 结束。去掉 --dry-run 实际执行。")
+        return
+
+    if not endpoint[1] or not endpoint[2]:
+        print("错误: 未配置judge端点或密钥（--base-url/--api-key 或对应环境变量）")
+        sys.exit(1)
+
+    log_dir = Path(args.log_dir) if args.log_dir else \
+        SCENARIO_ROOT / "logs" / f"batch_recheck_{mode}_{time.strftime('%Y%m%d_%H%M%S')}"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    print(f"日志目录: {log_dir}")
+    print("")
+
+    configure_judge_limits(args.judge_concurrency, args.judge_rpm)
+    dedup = configure_judge_dedup(enabled=not args.no_judge_dedup, cache_dir=args.judge_cache_dir)
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = _SampleOutputRouter(real_stdout), _SampleOutputRouter(real_stderr)
+
+    stats = {eval_dir.name: {"ok": 0, "fail": 0, "skip": 0} for eval_dir in eval_dirs}
+    for job, reason in skipped:
+        stats[job["eval_dir"]]["skip"] += 1
+    batch_start = time.time()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency), thread_name_prefix="sample") as pool:
+            futures = {pool.submit(run_job, job, args, endpoint, log_dir): job for job in jobs}
+            for finished, future in enumerate(as_completed(futures), 1):
+                job = futures[future]
+                ok, elapsed = future.result()
+                stats[job["eval_dir"]]["ok" if ok else "fail"] += 1
+                tag = "✅" if ok else "❌"
+                print(f"[{finished}/{len(jobs)}] {tag} {model_name_of(job['eval_dir'])}/{job['sample_id']} "
+                      f"- {elapsed:.0f}s")
+    finally:
+        sys.stdout, sys.stderr = real_stdout, real_stderr
+
+    total_ok = sum(s["ok"] for s in stats.values())
+    total_fail = sum(s["fail"] for s in stats.values())
+    print("")
+    print("==========================================")
+    print("  Batch Recheck 汇总")
+    print("==========================================")
+    print(f"总计:  {len(jobs)} 个样本（{len(eval_dirs)} 个目录），耗时 {time.time() - batch_start:.0f}s")
+    print(f"成功:  {total_ok}")
+    print(f"失败:  {total_fail}")
+    print(f"跳过:  {len(skipped)}")
+    if dedup is not None:
+        d = dedup.summary()
+        print(f"Judge: {d['requests']} 次请求, 实际调用 {d['calls']} 次, 等待在途 {d['inflight_hits']} 次, "
+              f"缓存命中 {d['cache_hits']} 次 (去重率 {d['dedup_rate'] * 100:.1f}%, "
+              f"节省 {d['saved_prompt_tokens']:,} prompt tokens)")
+    print(f"日志:  {log_dir}")
+    print("")
+    print("各目录详情:")
+    for eval_dir in eval_dirs:
+        s = stats[eval_dir.name]
+        status = "FAIL" if s["fail"] else "DONE"
+        print(f"  {'[' + status + ']':<6} {model_name_of(eval_dir.name):<30}  "
+              f"check: {s['ok']} ok / {s['fail']} fail / {s['skip']} skip")
+    print("")
+
+    if total_fail:
+        print(f"⚠️  有 {total_fail} 个样本执行失败，请检查日志。")
+        sys.exit(1)
+    print("全部完成。")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 # 批量运行 recheck_with_new_checklist.sh，对所有匹配的 eval 目录执行评测
 #
 # 支持并行执行多个模型目录（--parallel N），每个目录内部仍然串行处理样本。
+# 需要按样本粒度并行、或多台机器分片执行时，使用 scripts/recheck_queue.py（作业队列 + 租约）。
+# 单机进程内执行（样本级并发 + 全局judge并发预算）使用 scripts/batch_recheck.py，参数与本脚本一致。
 # 支持 --resume 模式，跳过已有结果的样本。
 # 支持 --pattern 过滤目录。
 # 支持 --dry-run 模式，只显示将要执行的命令，不实际执行。
@@ -47,6 +49,7 @@ DATA_ID=""          # 可选：仅处理指定样本
 OUTPUT_SUFFIX=""    # 可选：覆盖自动生成的后缀
 ONLY_CHECKS=""      # 增量模式：只执行指定检查项
 ADD_MODE=false      # 增量模式：在已有结果上增跑新检查项
+INCREMENTAL=false   # 增量recheck：只重跑输入指纹发生变化的检查项
 SAMPLES_FILE=""     # samples模式：从样本JSONL提取check_list（优先于inline）
 
 # 解析参数
@@ -92,6 +95,10 @@ while [[ $# -gt 0 ]]; do
             ADD_MODE=true
             shift
             ;;
+        --incremental)
+            INCREMENTAL=true
+            shift
+            ;;
         --samples)
             SAMPLES_FILE="$2"
             shift 2
@@ -112,6 +119,7 @@ while [[ $# -gt 0 ]]; do
             echo "  --output-suffix <s>   覆盖自动后缀（默认 _revNNN）"
             echo "  --only-checks <ids>   只执行指定检查项（逗号分隔，支持语义ID如'场景数量合理,音效BGM覆盖'，也兼容数字序号如'33,35,36'）"
             echo "  --add                 增量模式：在已有结果上增跑新检查项"
+            echo "  --incremental         增量recheck：只重跑输入指纹（文件/标准/对话hash）变化的检查项"
             echo "  --samples <file>      从样本JSONL提取check_list（samples模式，优先于inline）"
             echo "  -h, --help            显示帮助"
             echo ""
@@ -209,6 +217,7 @@ echo "Judge 模型:  $MODEL"
 echo "并行数:      $PARALLEL"
 echo "Resume:      $RESUME"
 echo "Add模式:     $ADD_MODE"
+echo "增量recheck: $INCREMENTAL"
 echo "指定检查项:  ${ONLY_CHECKS:-全部}"
 echo "目录模式:    $PATTERN"
 echo ""
@@ -253,6 +262,9 @@ if [ "$DRY_RUN" = true ]; then
         if [ "$ADD_MODE" = true ]; then
             cmd="$cmd --add"
         fi
+        if [ "$INCREMENTAL" = true ]; then
+            cmd="$cmd --incremental"
+        fi
         echo "  $cmd"
     done
     echo ""
@@ -322,6 +334,9 @@ run_single_dir() {
     if [ "$ADD_MODE" = true ]; then
         cmd+=(--add)
     fi
+    if [ "$INCREMENTAL" = true ]; then
+        cmd+=(--incremental)
+    fi
 
     # 执行，输出写入日志
     if "${cmd[@]}" >> "$log_file" 2>&1; then
@@ -341,7 +356,7 @@ run_single_dir() {
 
 # 导出函数和变量供子进程使用（parallel 模式需要）
 export -f run_single_dir
-export RECHECK_SCRIPT REVISION MODEL RESUME DATA_ID OUTPUT_SUFFIX ONLY_CHECKS ADD_MODE INLINE_FLAG SAMPLES_FILE MODEL_NAME_SED
+export RECHECK_SCRIPT REVISION MODEL RESUME DATA_ID OUTPUT_SUFFIX ONLY_CHECKS ADD_MODE INCREMENTAL INLINE_FLAG SAMPLES_FILE MODEL_NAME_SED
 
 TOTAL=${#DIRS[@]}
 SUCCESS=0
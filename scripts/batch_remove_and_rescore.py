@@ -16,6 +16,7 @@ from pathlib import Path
 # 添加 env/ 到路径，以便导入 checker_score
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "env"))
 from checker_score import calculate_scores
+from check_result_store import load_check_result
 
 
 def process_one_file(filepath: Path, subcategory_to_remove: str, dry_run: bool = False) -> dict:
@@ -25,8 +26,8 @@ def process_one_file(filepath: Path, subcategory_to_remove: str, dry_run: bool =
     Returns:
         {"path": str, "removed_keys": list, "old_score": float, "new_score": float}
     """
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # 紧凑格式（scripts/pack_results.py）还原后才有 subcategory_id；写回为明文
+    data = load_check_result(filepath)
     
     check_details = data.get("check_details", {})
     old_score = data.get("overall_result", {}).get("total_score", None)
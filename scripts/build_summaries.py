@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+回填/压缩批次样本摘要 sample_summaries.jsonl
+
+checker 每次写完结果会向批次目录的 sample_summaries.jsonl 追加一行（见 env/sample_summary.py）。
+本脚本用于：
+  - 已有批次（摘要机制之前跑的结果、fetch_results.py 下载的旧结果）生成摘要
+  - 压缩追加产生的重复行（每个样本只保留一行）
+  - 手工改动结果文件后重新生成
+整体重写摘要文件，不要与同一批次上正在运行的checker同时执行（期间追加的行会丢失，重跑本脚本即可恢复）。
+
+用法:
+    python scripts/build_summaries.py                       # evaluation_outputs 下所有目录
+    python scripts/build_summaries.py --pattern 'eval_dsv2*'
+    python scripts/build_summaries.py --missing-only        # 只为摘要中缺失的样本生成
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SCENARIO_ROOT = SCRIPT_DIR.parent
+EVAL_OUTPUTS_DIR = SCENARIO_ROOT / "evaluation_outputs"
+
+sys.path.insert(0, str(SCENARIO_ROOT / "env"))
+
+from pack_results import iter_agent_results_dirs, iter_conversation_files  # noqa: E402
+from sample_summary import SUMMARY_FILE, load_summaries, summarize_sample, write_summaries  # noqa: E402
+
+
+def build_dir(agent_results_dir: Path, missing_only: bool):
+    """返回 (样本数, 新生成数)"""
+    existing = load_summaries(agent_results_dir)
+    data_ids = [path.stem for path in iter_conversation_files(agent_results_dir)]
+    summaries = {}
+    generated = 0
+    for data_id in data_ids:
+        if missing_only and data_id in existing:
+            summaries[data_id] = existing[data_id]
+            continue
+        summary = summarize_sample(agent_results_dir, data_id)
+        if summary is not None:
+            summaries[data_id] = summary
+            generated += 1
+    if summaries:
+        write_summaries(agent_results_dir, summaries)
+    return len(data_ids), generated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f"回填/压缩批次样本摘要 {SUMMARY_FILE}")
+    parser.add_argument("--eval-outputs", default=str(EVAL_OUTPUTS_DIR), help="evaluation_outputs 目录")
+    parser.add_argument("--pattern", default="*", help="评测目录匹配模式（默认全部）")
+    parser.add_argument("--missing-only", action="store_true", help="已有摘要的样本不重新生成，只压缩重复行")
+    args = parser.parse_args()
+
+    eval_outputs_dir = Path(args.eval_outputs)
+    dirs = list(iter_agent_results_dirs(eval_outputs_dir, args.pattern))
+    if not dirs:
+        print(f"[错误] 未找到匹配的评测目录: {eval_outputs_dir / args.pattern}")
+        sys.exit(1)
+
+    total_samples, total_generated = 0, 0
+    for agent_results_dir in dirs:
+        count, generated = build_dir(agent_results_dir, args.missing_only)
+        total_samples += count
+        total_generated += generated
+        if count:
+            print(f"  {str(agent_results_dir.relative_to(eval_outputs_dir)):<60} {count:>5} 个样本  新生成 {generated}")
+
+    print(f"\n[完成] {len(dirs)} 个目录，{total_samples} 个样本，新生成 {total_generated} 条摘要")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,9 +35,13 @@ import json
 import argparse
 import os
 import glob
+import sys
 import time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "env"))
+from check_result_store import load_check_result  # noqa: E402
+
 
 # rev003 → rev004 的映射表
 # key = rev003 序号, value = rev004 序号
@@ -69,8 +73,7 @@ def convert_single(env_dir: str, dry_run: bool = False) -> bool:
         print(f'  跳过（已有rev004）: {os.path.basename(env_dir)}')
         return True
     
-    with open(rev003_path, 'r', encoding='utf-8') as f:
-        rev003 = json.load(f)
+    rev003 = load_check_result(rev003_path)
     
     old_details = rev003.get('check_details', {})
     new_details = {}
@@ -14,6 +14,8 @@ import os
 import shutil
 import argparse
 
+from jsonl_index import JsonlIndex
+
 
 def deploy_criteria_files(criteria_dir, env_dir):
     """将 revision 的 judge_criteria 文件部署到 _env 目录
@@ -52,15 +54,8 @@ def extract_bench(checklist_file, data_id, output_file, criteria_dir=None, env_d
         env_dir: 可选，部署 criteria 的目标 _env 目录
     """
     try:
-        # 先加载所有条目，建立索引
-        entries = {}
-        with open(checklist_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                entry = json.loads(line)
-                entries[entry.get('data_id')] = entry
+        # 通过旁路偏移索引随机读取，不再加载全部条目
+        entries = JsonlIndex(checklist_file)
 
         # 精确匹配
         matched_entry = entries.get(data_id)
@@ -2,6 +2,7 @@
 """
 从样本文件中提取指定data_id的bench数据
 支持将environment中的文件部署到指定目录（用于recheck场景）
+支持去重样本（environment为blob引用），自动从blobs/目录还原
 """
 import json
 import sys
@@ -9,6 +10,43 @@ import os
 import base64
 import argparse
 
+from jsonl_index import JsonlIndex
+
+
+def resolve_environment_blobs(environment, blob_dir):
+    """将去重样本中的blob引用还原为内联content
+
+    去重格式（sample_generator --dedup-environment）: [{path, type, blob, size}, ...]
+    blob_dir/<blob> 为文件原始字节；binary类型还原为base64编码，与内联格式一致
+    """
+    if not environment:
+        return environment
+
+    resolved = []
+    for entry in environment:
+        blob = entry.get('blob')
+        if not blob:
+            resolved.append(entry)
+            continue
+
+        blob_file = os.path.join(blob_dir, blob)
+        if not os.path.exists(blob_file):
+            raise FileNotFoundError(f'blob不存在: {blob_file}（path={entry.get("path")}）')
+        with open(blob_file, 'rb') as f:
+            data = f.read()
+
+        if entry.get('type') == 'binary':
+            content = base64.b64encode(data).decode('ascii')
+        else:
+            content = data.decode('utf-8')
+        resolved.append({
+            'path': entry.get('path', ''),
+            'type': entry.get('type', 'file'),
+            'content': content
+        })
+
+    return resolved
+
 
 def deploy_environment_files(environment, deploy_dir):
     """将environment中的文件部署到指定目录
@@ -48,7 +86,7 @@ def deploy_environment_files(environment, deploy_dir):
     return deployed_count
 
 
-def extract_bench(samples_file, data_id, output_file, deploy_env_dir=None):
+def extract_bench(samples_file, data_id, output_file, deploy_env_dir=None, blob_dir=None):
     """从样本文件中提取指定data_id的bench数据
 
     Args:
@@ -56,45 +94,50 @@ def extract_bench(samples_file, data_id, output_file, deploy_env_dir=None):
         data_id: 要提取的data_id
         output_file: 输出bench.json路径
         deploy_env_dir: 可选，将environment文件部署到此目录
+        blob_dir: 去重样本的blob目录，默认为样本文件同级的blobs/
     """
+    if blob_dir is None:
+        blob_dir = os.path.join(os.path.dirname(os.path.abspath(samples_file)), 'blobs')
+
     try:
-        # 读取样本文件（使用errors='replace'处理无效字符）
-        with open(samples_file, 'r', encoding='utf-8', errors='replace') as f:
-            for line in f:
-                if line.strip():
-                    sample = json.loads(line)
-                    if sample.get('data_id') == data_id:
-                        environment = sample.get('environment', {})
-
-                        # 构造bench.json
-                        bench = {
-                            'data_id': sample['data_id'],
-                            'check_list': sample['check_list'],
-                            'environment': environment,
-                            'query': sample.get('query', ''),
-                            'system': sample.get('system', '')
-                        }
-
-                        # 使用ensure_ascii=True避免Unicode编码问题
-                        with open(output_file, 'w', encoding='utf-8') as out:
-                            json.dump(bench, out, ensure_ascii=True, indent=2)
-
-                        print(f'✓ 成功提取 {data_id} 的bench数据', file=sys.stderr)
-
-                        # 部署environment文件到_env目录
-                        if deploy_env_dir and environment:
-                            deployed = deploy_environment_files(
-                                environment, deploy_env_dir
-                            )
-                            print(
-                                f'✓ 已部署 {deployed} 个environment文件到 {deploy_env_dir}',
-                                file=sys.stderr
-                            )
-
-                        return 0
-
-        print(f'错误: 未找到data_id={data_id}的样本', file=sys.stderr)
-        return 1
+        # 通过旁路偏移索引随机读取（无效字符按replace处理），只解析bench需要的字段
+        sample = JsonlIndex(samples_file).get(
+            data_id, fields=['data_id', 'check_list', 'environment', 'query', 'system']
+        )
+        if sample is None:
+            print(f'错误: 未找到data_id={data_id}的样本', file=sys.stderr)
+            return 1
+
+        environment = resolve_environment_blobs(
+            sample.get('environment', {}), blob_dir
+        )
+
+        # 构造bench.json
+        bench = {
+            'data_id': sample['data_id'],
+            'check_list': sample['check_list'],
+            'environment': environment,
+            'query': sample.get('query', ''),
+            'system': sample.get('system', '')
+        }
+
+        # 使用ensure_ascii=True避免Unicode编码问题
+        with open(output_file, 'w', encoding='utf-8') as out:
+            json.dump(bench, out, ensure_ascii=True, indent=2)
+
+        print(f'✓ 成功提取 {data_id} 的bench数据', file=sys.stderr)
+
+        # 部署environment文件到_env目录
+        if deploy_env_dir and environment:
+            deployed = deploy_environment_files(
+                environment, deploy_env_dir
+            )
+            print(
+                f'✓ 已部署 {deployed} 个environment文件到 {deploy_env_dir}',
+                file=sys.stderr
+            )
+
+        return 0
 
     except Exception as e:
         print(f'错误: {e}', file=sys.stderr)
@@ -108,11 +151,13 @@ def main():
     parser.add_argument('--output', required=True, help='输出文件路径')
     parser.add_argument('--deploy-env-dir', default=None,
                         help='将environment文件部署到此目录（用于recheck时补充_env中缺失的文件）')
+    parser.add_argument('--blob-dir', default=None,
+                        help='去重样本（--dedup-environment）的blob目录，默认为样本文件同级的blobs/')
 
     args = parser.parse_args()
 
     return extract_bench(args.samples, args.data_id, args.output,
-                         deploy_env_dir=args.deploy_env_dir)
+                         deploy_env_dir=args.deploy_env_dir, blob_dir=args.blob_dir)
 
 
 if __name__ == '__main__':
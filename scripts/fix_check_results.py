@@ -7,10 +7,14 @@
 3. 中文值改英文
 """
 
-import json
 import glob
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "env"))
+from check_result_store import load_check_result  # noqa: E402
+from json_io import dump_json, file_codec  # noqa: E402
+
 
 def fix_check_result(data: dict) -> dict:
     """修复单个check_result数据"""
@@ -53,7 +57,8 @@ def main():
     # 查找所有check_result文件
     eval_dir = "/Users/feixiaoxu01/Documents/agents/agent_auto_evaluation/universal_scenario_framework/tmp_scenarios/novel_writing_alchemist/evaluation_outputs/eval_v2_20260205_132400_claude-opus-4-5-20251101"
 
-    check_files = glob.glob(f"{eval_dir}/*_env/check_result*.json")
+    check_files = [p for p in glob.glob(f"{eval_dir}/*_env/check_result*.json")
+                   if not p.endswith(".fingerprints.json")]
 
     print(f"找到 {len(check_files)} 个check_result文件")
 
@@ -62,16 +67,15 @@ def main():
 
     for file_path in check_files:
         try:
-            # 读取文件
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # 读取文件（紧凑格式还原检查项元数据）
+            codec = file_codec(file_path)
+            data = load_check_result(file_path)
 
             # 修复数据
             fixed_data = fix_check_result(data)
 
-            # 写回文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(fixed_data, f, ensure_ascii=False, indent=2)
+            # 写回文件（保持原压缩格式，检查项元数据写回内联）
+            dump_json(fixed_data, file_path, codec=codec)
 
             print(f"✅ {Path(file_path).parent.name}/{Path(file_path).name}")
             success_count += 1
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+JSONL随机访问层（样本文件 / check_revisions的checklist.jsonl）
+
+- 旁路索引: <file>.idx.json 记录 data_id → (字节偏移, 长度)，源文件大小/mtime变化时自动重建
+- 随机访问: 通过mmap直接切出目标行，不再逐行json.loads整个文件
+- 投影解析: 只解析需要的顶层字段，跳过system/environment等大字段，取齐即停止扫描
+
+用法:
+    index = JsonlIndex("design_v2/samples/eval_dsv2.jsonl")
+    sample = index.get("NW_CLEAR_SHORT_SWEET_001")
+    for rec in index.iter_records(fields=["data_id", "query"]):
+        ...
+"""
+import json
+import mmap
+import os
+import re
+import sys
+from json.decoder import scanstring
+
+INDEX_SUFFIX = '.idx.json'
+INDEX_VERSION = 2  # v2: 重复key保留第一条
+
+_DECODER = json.JSONDecoder()
+_WS_RE = re.compile(r'[ \t\n\r]*')
+_STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]')
+_SCALAR_RE = re.compile(r'[^,}\]\s]+')
+
+
+def _skip_value(s, pos):
+    """跳过s[pos]开始的一个JSON值，返回值结束位置（不构造Python对象）"""
+    c = s[pos]
+    if c == '"':
+        return _STRING_RE.match(s, pos).end()
+    if c in '{[':
+        depth = 0
+        for m in _TOKEN_RE.finditer(s, pos):
+            tok = m.group()
+            if tok[0] == '"':
+                continue
+            depth += 1 if tok in '{[' else -1
+            if depth == 0:
+                return m.end()
+        raise ValueError('JSON值未闭合')
+    return _SCALAR_RE.match(s, pos).end()
+
+
+def project_fields(line, fields):
+    """只解析JSON对象中指定的顶层字段
+
+    Args:
+        line: 一行JSON对象文本
+        fields: 需要的顶层字段集合（None表示全部解析）
+
+    Returns:
+        仅包含所需字段的dict
+    """
+    if fields is None:
+        return json.loads(line)
+
+    wanted = set(fields)
+    result = {}
+    pos = _WS_RE.match(line, 0).end()
+    if line[pos] != '{':
+        raise ValueError('JSONL行不是对象')
+    pos = _WS_RE.match(line, pos + 1).end()
+    if line[pos] == '}':
+        return result
+
+    while True:
+        key, pos = scanstring(line, pos + 1)
+        pos = _WS_RE.match(line, pos).end()
+        pos = _WS_RE.match(line, pos + 1).end()  # 跳过':'
+        if key in wanted:
+            result[key], pos = _DECODER.raw_decode(line, pos)
+            if len(result) == len(wanted):
+                return result
+        else:
+            pos = _skip_value(line, pos)
+        pos = _WS_RE.match(line, pos).end()
+        if line[pos] == '}':
+            return result
+        pos = _WS_RE.match(line, pos + 1).end()  # 跳过','
+
+
+class JsonlIndex:
+    """带旁路偏移索引的JSONL文件"""
+
+    def __init__(self, path, key='data_id'):
+        self.path = os.path.abspath(path)
+        self.key = key
+        self.index_path = self.path + INDEX_SUFFIX
+        self._key_re = re.compile(rb'"' + re.escape(key.encode('utf-8')) + rb'"\s*:\s*"((?:[^"\\]|\\.)*)"')
+        self._offsets = None
+
+    # ---------- 索引 ----------
+
+    def _source_signature(self):
+        st = os.stat(self.path)
+        return st.st_size, st.st_mtime_ns
+
+    def _extract_key(self, line):
+        """从行首附近提取key（data_id通常是第一个字段），失败时回退完整解析"""
+        m = self._key_re.search(line, 0, 4096)
+        if m:
+            return json.loads(b'"' + m.group(1) + b'"')
+        return json.loads(line).get(self.key)
+
+    def build(self):
+        """扫描源文件建立偏移索引，并尽量写入旁路索引文件"""
+        offsets = {}
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                length = len(line)
+                if line.strip():
+                    key = self._extract_key(line)
+                    if key is not None:
+                        # 重复的key保留第一条（与逐行查找的行为一致）
+                        offsets.setdefault(key, (offset, length))
+                offset += length
+
+        size, mtime_ns = self._source_signature()
+        # 先写临时文件再原子替换，崩溃或并发读取时不会看到截断的索引
+        tmp_path = f'{self.index_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': INDEX_VERSION,
+                    'key': self.key,
+                    'source_size': size,
+                    'source_mtime_ns': mtime_ns,
+                    'offsets': offsets,
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # 只读目录时只使用内存索引
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        self._offsets = offsets
+        return offsets
+
+    @property
+    def offsets(self):
+        """data_id → (offset, length)，旁路索引过期时自动重建"""
+        if self._offsets is not None:
+            return self._offsets
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                size, mtime_ns = self._source_signature()
+                if (meta.get('version') == INDEX_VERSION and meta.get('key') == self.key
+                        and meta.get('source_size') == size
+                        and meta.get('source_mtime_ns') == mtime_ns):
+                    self._offsets = {k: tuple(v) for k, v in meta['offsets'].items()}
+                    return self._offsets
+            except (OSError, ValueError, KeyError):
+                pass
+        return self.build()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __contains__(self, key):
+        return key in self.offsets
+
+    def keys(self):
+        """按文件顺序返回所有key"""
+        return list(self.offsets)
+
+    # ---------- 读取 ----------
+
+    def get(self, key, fields=None):
+        """按key随机读取一条记录（不存在返回None）"""
+        loc = self.offsets.get(key)
+        if loc is None:
+            return None
+        offset, length = loc
+        with open(self.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                line = mm[offset:offset + length].decode('utf-8', errors='replace')
+        return project_fields(line, fields)
+
+    def iter_records(self, fields=None):
+        """按文件顺序流式读取所有记录（可只解析部分字段）"""
+        with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if line.strip():
+                    yield project_fields(line, fields)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='JSONL旁路索引工具')
+    parser.add_argument('file', help='JSONL文件路径')
+    parser.add_argument('--key', default='data_id', help='索引字段（默认: data_id）')
+    parser.add_argument('--get', metavar='ID', help='按key读取一条记录')
+    parser.add_argument('--fields', help='只输出这些顶层字段（逗号分隔）')
+    args = parser.parse_args()
+
+    index = JsonlIndex(args.file, key=args.key)
+    fields = args.fields.split(',') if args.fields else None
+    if args.get:
+        record = index.get(args.get, fields=fields)
+        if record is None:
+            print(f'错误: 未找到 {args.key}={args.get}', file=sys.stderr)
+            return 1
+        print(json.dumps(record, ensure_ascii=False, indent=2))
+    else:
+        index.build()
+        print(f'✓ 已建立索引: {len(index)} 条 → {index.index_path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评测结果紧凑存储：打包 / 解包
+
+check_result_revNNN.json（indent=2，每个检查项重复保存 description/dimension_id/
+subcategory_id/check_type）和对话日志 {data_id}.json 以明文保存，8个revision × 全部批次
+打包下载（fetch_results.py）时体积主要来自这两类文件。
+
+pack:
+  - check_result*.json：检查项元数据提取到 <agent_results_dir>/_check_meta/check_meta_revNNN.json
+    （per-revision字典，按内容哈希引用），结果本身紧凑序列化并压缩
+  - {data_id}.json 对话日志：原样压缩（解包后逐字节还原）
+  - 文件名保持不变，读取方（checker / checker_score / viewer / 统计脚本）通过
+    json_io / check_result_store 按文件头自动识别，明文与压缩文件可以混用
+unpack:
+  - 还原为 indent=2 明文格式，删除 _check_meta 字典
+
+压缩格式：zstd（需要 pip install zstandard）或 gzip（标准库），默认有zstandard时用zstd。
+--codec none 只做元数据归一化，不压缩。
+
+注意：各 {data_id}_env/ 下部署的是执行时的 checker.py 副本，旧副本不识别压缩文件；
+已打包的批次用 scripts/batch_recheck.py（使用仓库 env/ 下的checker）重跑，或先 unpack。
+
+用法:
+    python scripts/pack_results.py pack --pattern 'eval_dsv*'
+    python scripts/pack_results.py pack --pattern '*claude*' --codec gzip --dry-run
+    python scripts/pack_results.py unpack --pattern 'eval_dsv2_20260101*'
+"""
+
+import argparse
+import os
+import posixpath
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SCENARIO_ROOT = SCRIPT_DIR.parent
+EVAL_OUTPUTS_DIR = SCENARIO_ROOT / "evaluation_outputs"
+
+sys.path.insert(0, str(SCENARIO_ROOT / "env"))
+
+from check_result_store import (  # noqa: E402
+    CHECK_META_DIR, clear_meta_cache, is_packed, load_check_result, meta_file_for, pack_check_result,
+)
+from json_io import CODECS, DEFAULT_CODEC, compress, decompress, detect_codec, dumps, load_json  # noqa: E402
+
+# 与 batch_recheck.py 一致：这些json不是agent结果
+NON_RESULT_PREFIXES = ("summary_", "temp_")
+NON_RESULT_NAMES = ("execution_report",)
+
+
+def write_atomic(path: Path, data: bytes):
+    """先写临时文件再替换，避免中断时留下半个文件"""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def encode(obj, codec):
+    """序列化：codec为None时紧凑明文，否则压缩"""
+    data = dumps(obj, compact=True).encode("utf-8")
+    return compress(data, codec) if codec else data
+
+
+def iter_agent_results_dirs(eval_outputs_dir: Path, pattern: str):
+    for eval_dir in sorted(eval_outputs_dir.glob(pattern)):
+        if not eval_dir.is_dir():
+            continue
+        yield eval_dir / "execution" if (eval_dir / "execution").is_dir() else eval_dir
+
+
+def iter_conversation_files(agent_results_dir: Path):
+    for path in sorted(agent_results_dir.glob("*.json")):
+        if path.stem.startswith(NON_RESULT_PREFIXES) or path.stem in NON_RESULT_NAMES:
+            continue
+        yield path
+
+
+def iter_check_result_files(agent_results_dir: Path):
+    for path in sorted(agent_results_dir.glob("*_env/check_result*.json")):
+        # 跳过旧版增量recheck指纹文件 check_result_revNNN.fingerprints.json（现为 fingerprints_revNNN.json）
+        if path.name.endswith(".fingerprints.json"):
+            continue
+        yield path
+
+
+def pack_dir(agent_results_dir: Path, codec, include_conversations: bool, dry_run: bool):
+    """打包一个批次目录，返回 (处理文件数, 原大小, 新大小)"""
+    count, before, after = 0, 0, 0
+
+    # 1. check_result：先在内存中生成紧凑结果和字典，字典落盘后再替换结果文件
+    meta_tables = {}
+    packed_files = []
+    for path in iter_check_result_files(agent_results_dir):
+        meta_path = meta_file_for(path)
+        if meta_path not in meta_tables:
+            meta_tables[meta_path] = load_json(meta_path) if meta_path.exists() else {}
+        check_result = load_check_result(path)
+        meta_rel = posixpath.join("..", CHECK_META_DIR, meta_path.name)
+        data = encode(pack_check_result(check_result, meta_tables[meta_path], meta_rel), codec)
+        before += path.stat().st_size
+        after += len(data)
+        packed_files.append((path, data))
+
+    for meta_path, table in meta_tables.items():
+        data = dumps(table, compact=True).encode("utf-8")
+        after += len(data) - (meta_path.stat().st_size if meta_path.exists() else 0)
+        if not dry_run:
+            meta_path.parent.mkdir(exist_ok=True)
+            write_atomic(meta_path, data)
+    for path, data in packed_files:
+        if not dry_run:
+            write_atomic(path, data)
+        count += 1
+
+    # 2. 对话日志：整文件压缩，不改动内容
+    if include_conversations and codec:
+        for path in iter_conversation_files(agent_results_dir):
+            raw = path.read_bytes()
+            if detect_codec(raw) == codec:
+                continue
+            data = compress(decompress(raw), codec)
+            before += len(raw)
+            after += len(data)
+            if not dry_run:
+                write_atomic(path, data)
+            count += 1
+
+    return count, before, after
+
+
+def unpack_dir(agent_results_dir: Path, dry_run: bool):
+    """解包一个批次目录，返回 (处理文件数, 原大小, 新大小)"""
+    count, before, after = 0, 0, 0
+
+    for path in iter_check_result_files(agent_results_dir):
+        raw = path.read_bytes()
+        if detect_codec(raw) is None and not is_packed(load_json(path)):
+            continue
+        data = dumps(load_check_result(path)).encode("utf-8")
+        before += len(raw)
+        after += len(data)
+        if not dry_run:
+            write_atomic(path, data)
+        count += 1
+
+    for path in iter_conversation_files(agent_results_dir):
+        raw = path.read_bytes()
+        if detect_codec(raw) is None:
+            continue
+        data = decompress(raw)
+        before += len(raw)
+        after += len(data)
+        if not dry_run:
+            write_atomic(path, data)
+        count += 1
+
+    # 所有结果都已还原为明文，字典不再被引用
+    meta_dir = agent_results_dir / CHECK_META_DIR
+    if meta_dir.is_dir():
+        for meta_path in meta_dir.glob("check_meta*.json"):
+            before += meta_path.stat().st_size
+            if not dry_run:
+                meta_path.unlink()
+        if not dry_run and not any(meta_dir.iterdir()):
+            meta_dir.rmdir()
+
+    return count, before, after
+
+
+def format_mb(size):
+    return f"{size / 1024 / 1024:.1f}MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="评测结果紧凑存储：打包 / 解包")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("pack", help="归一化检查项元数据并压缩结果文件")
+    p.add_argument("--codec", default=DEFAULT_CODEC, choices=list(CODECS) + ["none"],
+                   help=f"压缩格式（默认 {DEFAULT_CODEC}；none 只做元数据归一化）")
+    p.add_argument("--no-conversations", action="store_true", help="不压缩对话日志 {data_id}.json")
+
+    u = sub.add_parser("unpack", help="还原为 indent=2 明文格式")
+
+    for sp in (p, u):
+        sp.add_argument("--eval-outputs", default=str(EVAL_OUTPUTS_DIR), help="evaluation_outputs 目录")
+        sp.add_argument("--pattern", default="eval_dsv*", help="评测目录匹配模式（默认 eval_dsv*）")
+        sp.add_argument("--dry-run", action="store_true", help="只统计大小，不写入文件")
+
+    args = parser.parse_args()
+
+    eval_outputs_dir = Path(args.eval_outputs)
+    dirs = list(iter_agent_results_dirs(eval_outputs_dir, args.pattern))
+    if not dirs:
+        print(f"[错误] 未找到匹配的评测目录: {eval_outputs_dir / args.pattern}")
+        sys.exit(1)
+
+    codec = None
+    if args.command == "pack":
+        codec = None if args.codec == "none" else args.codec
+        print(f"[Pack] {len(dirs)} 个目录，压缩格式: {codec or '无'}"
+              f"{'，不含对话日志' if args.no_conversations else ''}")
+    else:
+        print(f"[Unpack] {len(dirs)} 个目录")
+    if args.dry_run:
+        print("[模式] DRY RUN — 不会修改文件")
+
+    total_count, total_before, total_after = 0, 0, 0
+    for agent_results_dir in dirs:
+        if args.command == "pack":
+            count, before, after = pack_dir(agent_results_dir, codec, not args.no_conversations, args.dry_run)
+        else:
+            count, before, after = unpack_dir(agent_results_dir, args.dry_run)
+        clear_meta_cache()
+        total_count += count
+        total_before += before
+        total_after += after
+        name = agent_results_dir.relative_to(eval_outputs_dir)
+        print(f"  {str(name):<60} {count:>5} 个文件  {format_mb(before)} → {format_mb(after)}")
+
+    print(f"\n[完成] 共 {total_count} 个文件: {format_mb(total_before)} → {format_mb(total_after)}")
+
+
+if __name__ == "__main__":
+    main()
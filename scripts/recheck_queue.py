@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+分片式recheck作业队列（多worker / 多机器）
+
+batch_recheck.sh --parallel N 只在单机上按模型目录并行，目录内部串行处理样本。
+本脚本把 (eval目录, 样本, revision) 展开为独立作业写入一个SQLite作业库，
+任意数量的worker（可在多台共享存储的机器上）按租约领取作业并执行，吞吐随worker数线性扩展。
+
+- 租约: worker领取作业时写入 lease_expires，后台心跳线程定期续约；
+  worker崩溃/断网后租约过期，作业会被其他worker重新领取（attempts 计数，超过上限标记failed）
+- 完成时校验 worker_id，租约已被他人接管的作业不会被旧worker覆盖状态
+- 同一样本 (eval目录, 样本) 的作业串行执行：recheck_with_new_checklist.sh 在 <样本>_env/ 下写固定的
+  temp_bench_recheck.json 并部署judge_criteria，不同revision的作业并发会互相覆盖/删除
+- 每个作业仍然通过 recheck_with_new_checklist.sh --data-id 执行（复用bench构造/API端点选择逻辑），
+  日志写入 logs/recheck_queue/<作业库名>/<eval目录>/<样本>.log
+- 作业库使用 rollback journal（不使用WAL，WAL不支持网络文件系统），所有写操作为短事务
+
+用法:
+    # 1. 入队：所有模型目录 × 样本 × revision
+    python scripts/recheck_queue.py enqueue --db logs/rev004.db --revision 003 --revision 004 --resume
+
+    # 2. 在一台或多台机器上启动worker（每个worker 4 路并发）
+    python scripts/recheck_queue.py work --db logs/rev004.db --concurrency 4
+
+    # 3. 实时进度
+    python scripts/recheck_queue.py status --db logs/rev004.db --watch 10
+
+    # 失败作业重新入队
+    python scripts/recheck_queue.py retry --db logs/rev004.db
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SCENARIO_ROOT = SCRIPT_DIR.parent
+EVAL_OUTPUTS_DIR = SCENARIO_ROOT / "evaluation_outputs"
+RECHECK_SCRIPT = SCRIPT_DIR / "recheck_with_new_checklist.sh"
+
+# 与 batch_recheck.sh 的场景配置区保持一致
+DEFAULT_PATTERN = "eval_dsv*"
+MODEL_NAME_RE = re.compile(r"eval_dsv\d*_\d*_\d*_")
+
+DEFAULT_LEASE_SECONDS = 600
+DEFAULT_HEARTBEAT_SECONDS = 30
+DEFAULT_MAX_ATTEMPTS = 3
+
+# 与 recheck_with_new_checklist.sh 一致：这些json不是agent结果
+NON_RESULT_PREFIXES = ("summary_", "temp_")
+NON_RESULT_NAMES = ("execution_report",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    eval_dir TEXT NOT NULL,
+    agent_results_dir TEXT NOT NULL,
+    sample_id TEXT NOT NULL,
+    revision TEXT NOT NULL DEFAULT '',
+    output_suffix TEXT NOT NULL DEFAULT '',
+    options TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker_id TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    exit_code INTEGER,
+    log_file TEXT,
+    UNIQUE (eval_dir, sample_id, revision, output_suffix)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, lease_expires);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    concurrency INTEGER NOT NULL,
+    lease_seconds INTEGER NOT NULL DEFAULT 600,
+    started_at REAL NOT NULL,
+    last_heartbeat REAL NOT NULL,
+    stopped_at REAL
+);
+"""
+
+
+# ==================== 作业库 ====================
+
+def connect(db_path):
+    """打开作业库（每个线程使用独立连接）"""
+    conn = sqlite3.connect(str(db_path), timeout=60, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.execute("PRAGMA busy_timeout=60000")
+    return conn
+
+
+def init_db(db_path):
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = connect(db_path)
+    conn.executescript(SCHEMA)
+    # 旧作业库的workers表没有 lease_seconds 列
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(workers)")}
+    if "lease_seconds" not in columns:
+        conn.execute(f"ALTER TABLE workers ADD COLUMN lease_seconds INTEGER NOT NULL DEFAULT {DEFAULT_LEASE_SECONDS}")
+    return conn
+
+
+class Transaction:
+    """BEGIN IMMEDIATE 写事务：领取作业时先拿写锁，避免两个worker领到同一作业"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+# ==================== 入队 ====================
+
+def output_suffix_for(revision, output_suffix):
+    """与 recheck_with_new_checklist.sh 相同的输出后缀规则"""
+    if output_suffix:
+        return output_suffix
+    return f"_rev{revision}" if revision else ""
+
+
+def find_samples(agent_results_dir, data_id=None):
+    """目录下可recheck的样本（存在 <样本>_env/checker.py 的agent结果）"""
+    samples = []
+    for result_json in sorted(agent_results_dir.glob("*.json")):
+        name = result_json.stem
+        if name.startswith(NON_RESULT_PREFIXES) or name in NON_RESULT_NAMES:
+            continue
+        if data_id and name != data_id:
+            continue
+        if (agent_results_dir / f"{name}_env" / "checker.py").is_file():
+            samples.append(name)
+    return samples
+
+
+def cmd_enqueue(args):
+    if args.samples and args.revision:
+        print("错误: --samples 与 --revision 不能同时指定")
+        return 1
+    if args.samples and not Path(args.samples).is_file():
+        print(f"错误: 样本文件不存在: {args.samples}")
+        return 1
+    revisions = args.revision or [""]
+    for revision in revisions:
+        if revision and not (SCENARIO_ROOT / "check_definitions" / "check_revisions" / f"rev_{revision}").is_dir():
+            print(f"错误: revision 目录不存在: rev_{revision}")
+            return 1
+
+    eval_dirs = sorted(p for p in EVAL_OUTPUTS_DIR.glob(args.pattern) if p.is_dir())
+    if not eval_dirs:
+        print(f"错误: 未找到匹配 '{args.pattern}' 的目录在 {EVAL_OUTPUTS_DIR}")
+        return 1
+
+    options = {
+        "model": args.model,
+        "samples": str(Path(args.samples).resolve()) if args.samples else "",
+        "only_checks": args.only_checks or "",
+        "add": args.add,
+        "incremental": args.incremental,
+    }
+    conn = init_db(args.db)
+    now = time.time()
+    added = skipped = reset = 0
+    with Transaction(conn):
+        for eval_dir in eval_dirs:
+            agent_results_dir = eval_dir / "execution" if (eval_dir / "execution").is_dir() else eval_dir
+            samples = find_samples(agent_results_dir, args.data_id)
+            for revision in revisions:
+                suffix = output_suffix_for(revision, args.output_suffix)
+                for sample_id in samples:
+                    output_file = agent_results_dir / f"{sample_id}_env" / f"check_result{suffix}.json"
+                    if args.resume and output_file.exists() and not (args.add or args.only_checks or args.incremental):
+                        skipped += 1
+                        continue
+                    cur = conn.execute(
+                        "INSERT OR IGNORE INTO jobs (eval_dir, agent_results_dir, sample_id, revision, "
+                        "output_suffix, options, enqueued_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (eval_dir.name, str(agent_results_dir), sample_id, revision, suffix,
+                         json.dumps(options, ensure_ascii=False), now),
+                    )
+                    if cur.rowcount:
+                        added += 1
+                    elif args.reset:
+                        conn.execute(
+                            "UPDATE jobs SET status='pending', options=?, attempts=0, worker_id=NULL, "
+                            "lease_expires=NULL, exit_code=NULL WHERE eval_dir=? AND sample_id=? "
+                            "AND revision=? AND output_suffix=?",
+                            (json.dumps(options, ensure_ascii=False), eval_dir.name, sample_id, revision, suffix),
+                        )
+                        reset += 1
+
+    print(f"[Queue] 作业库: {args.db}")
+    print(f"[Queue] 扫描 {len(eval_dirs)} 个目录 × {len(revisions)} 个revision")
+    print(f"[Queue] 新增 {added} 个作业，重置 {reset} 个，resume跳过 {skipped} 个")
+    print_summary(conn)
+    return 0
+
+
+# ==================== Worker ====================
+
+def build_command(job):
+    """作业 → recheck_with_new_checklist.sh 单样本命令"""
+    options = json.loads(job["options"])
+    cmd = [
+        "bash", str(RECHECK_SCRIPT),
+        "--agent-results", job["agent_results_dir"],
+        "--data-id", job["sample_id"],
+        "--model", options["model"],
+    ]
+    if job["revision"]:
+        cmd += ["--revision", job["revision"]]
+    elif options.get("samples"):
+        cmd += ["--samples", options["samples"]]
+    else:
+        cmd += ["--inline"]
+    if job["output_suffix"]:
+        cmd += ["--output-suffix", job["output_suffix"]]
+    if options.get("only_checks"):
+        cmd += ["--only-checks", options["only_checks"]]
+    if options.get("add"):
+        cmd += ["--add"]
+    if options.get("incremental"):
+        cmd += ["--incremental"]
+    return cmd
+
+
+class Worker:
+    """领取并执行作业；concurrency 个执行线程 + 1 个心跳线程"""
+
+    def __init__(self, db_path, concurrency, lease_seconds, heartbeat_seconds, max_attempts, log_root):
+        self.db_path = db_path
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_attempts = max_attempts
+        self.log_root = log_root
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.done = 0
+        self.failed = 0
+
+    def claim(self, conn):
+        """领取一个作业：pending 或租约过期的 running；超过重试上限的过期作业标记failed
+
+        同一样本已有租约有效的作业在执行时不领取该样本的其他作业
+        """
+        now = time.time()
+        with Transaction(conn):
+            conn.execute(
+                "UPDATE jobs SET status='failed', worker_id=NULL, lease_expires=NULL, finished_at=? "
+                "WHERE status='running' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            job = conn.execute(
+                "SELECT * FROM jobs j WHERE (j.status='pending' OR (j.status='running' AND j.lease_expires < ?)) "
+                "AND NOT EXISTS (SELECT 1 FROM jobs r WHERE r.eval_dir=j.eval_dir AND r.sample_id=j.sample_id "
+                "AND r.id != j.id AND r.status='running' AND r.lease_expires >= ?) "
+                "ORDER BY j.attempts, j.id LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if job is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status='running', worker_id=?, lease_expires=?, attempts=attempts+1, "
+                "started_at=? WHERE id=?",
+                (self.worker_id, now + self.lease_seconds, now, job["id"]),
+            )
+        return job
+
+    def finish(self, conn, job, exit_code, log_file):
+        """写回结果；租约已被其他worker接管时不覆盖"""
+        if exit_code == 0:
+            status = "done"
+        else:
+            status = "pending" if job["attempts"] + 1 < self.max_attempts else "failed"
+        with Transaction(conn):
+            cur = conn.execute(
+                "UPDATE jobs SET status=?, worker_id=NULL, lease_expires=NULL, finished_at=?, "
+                "exit_code=?, log_file=? WHERE id=? AND worker_id=? AND status='running'",
+                (status, time.time(), exit_code, str(log_file), job["id"], self.worker_id),
+            )
+        return status if cur.rowcount else "lost"
+
+    def heartbeat(self):
+        conn = connect(self.db_path)
+        while not self.stop_event.wait(self.heartbeat_seconds):
+            now = time.time()
+            try:
+                with Transaction(conn):
+                    conn.execute(
+                        "UPDATE jobs SET lease_expires=? WHERE worker_id=? AND status='running'",
+                        (now + self.lease_seconds, self.worker_id),
+                    )
+                    conn.execute("UPDATE workers SET last_heartbeat=? WHERE worker_id=?",
+                                 (now, self.worker_id))
+            except sqlite3.OperationalError as e:
+                # 共享存储短暂不可用：下个周期重试，租约时长应远大于心跳间隔
+                print(f"[Worker] 心跳失败: {e}")
+        conn.close()
+
+    def run_job(self, job):
+        log_file = self.log_root / job["eval_dir"] / f"{job['sample_id']}{job['output_suffix']}.log"
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        cmd = build_command(job)
+        start = time.time()
+        with open(log_file, "a", encoding="utf-8") as log:
+            log.write(f"\n===== {time.strftime('%Y-%m-%d %H:%M:%S')} worker={self.worker_id} "
+                      f"attempt={job['attempts'] + 1} =====\n")
+            log.flush()
+            try:
+                exit_code = subprocess.call(cmd, stdout=log, stderr=subprocess.STDOUT, cwd=str(SCENARIO_ROOT))
+            except OSError as e:
+                log.write(f"启动失败: {e}\n")
+                exit_code = -1
+        return exit_code, log_file, time.time() - start
+
+    def has_pending(self, conn):
+        return conn.execute("SELECT 1 FROM jobs WHERE status='pending' LIMIT 1").fetchone() is not None
+
+    def slot(self, slot_index):
+        conn = connect(self.db_path)
+        while not self.stop_event.is_set():
+            job = self.claim(conn)
+            if job is None:
+                # 剩余的pending作业都在等同一样本的作业完成：稍后再领取
+                if self.has_pending(conn) and not self.stop_event.wait(self.heartbeat_seconds):
+                    continue
+                break
+            label = f"{job['eval_dir']}/{job['sample_id']}{job['output_suffix']}"
+            print(f"[START] [{slot_index}] {label} (attempt {job['attempts'] + 1})")
+            exit_code, log_file, elapsed = self.run_job(job)
+            status = self.finish(conn, job, exit_code, log_file)
+            with self.lock:
+                if status == "done":
+                    self.done += 1
+                elif status == "failed":
+                    self.failed += 1
+            tag = {"done": "DONE", "pending": "RETRY", "failed": "FAIL", "lost": "LOST"}[status]
+            print(f"[{tag}]{' ' * (5 - len(tag))} [{slot_index}] {label} - {elapsed:.0f}s")
+        conn.close()
+
+    def run(self):
+        conn = init_db(self.db_path)
+        now = time.time()
+        with Transaction(conn):
+            conn.execute(
+                "INSERT INTO workers (worker_id, host, pid, concurrency, lease_seconds, started_at, last_heartbeat) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.worker_id, socket.gethostname(), os.getpid(), self.concurrency, self.lease_seconds, now, now),
+            )
+        print(f"[Worker] {self.worker_id} 启动，并发 {self.concurrency}，租约 {self.lease_seconds}s")
+
+        heartbeat_thread = threading.Thread(target=self.heartbeat, daemon=True)
+        heartbeat_thread.start()
+        slots = [threading.Thread(target=self.slot, args=(i + 1,)) for i in range(self.concurrency)]
+        for t in slots:
+            t.start()
+        try:
+            for t in slots:
+                t.join()
+        except KeyboardInterrupt:
+            # 不再领取新作业；正在执行的作业跑完后退出（强制退出时租约过期后由其他worker接管）
+            print("\n[Worker] 收到中断，等待正在执行的作业完成...")
+            self.stop_event.set()
+            for t in slots:
+                t.join()
+        self.stop_event.set()
+        heartbeat_thread.join()
+
+        with Transaction(conn):
+            conn.execute("UPDATE workers SET stopped_at=? WHERE worker_id=?", (time.time(), self.worker_id))
+        print(f"[Worker] {self.worker_id} 结束：完成 {self.done}，失败 {self.failed}")
+        print_summary(conn)
+        return 1 if self.failed else 0
+
+
+def cmd_work(args):
+    if not Path(args.db).exists():
+        print(f"错误: 作业库不存在: {args.db}（先执行 enqueue）")
+        return 1
+    if args.lease <= args.heartbeat * 2:
+        print(f"错误: --lease ({args.lease}s) 必须大于两倍 --heartbeat ({args.heartbeat}s)")
+        return 1
+    log_root = Path(args.log_dir) if args.log_dir else SCENARIO_ROOT / "logs" / "recheck_queue" / Path(args.db).stem
+    worker = Worker(args.db, args.concurrency, args.lease, args.heartbeat, args.max_attempts, log_root)
+    return worker.run()
+
+
+# ==================== 进度 / 重试 ====================
+
+def print_summary(conn, by_dir=False):
+    now = time.time()
+    counts = {row["status"]: row["n"] for row in
+              conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")}
+    expired = conn.execute("SELECT COUNT(*) FROM jobs WHERE status='running' AND lease_expires < ?",
+                           (now,)).fetchone()[0]
+    total = sum(counts.values())
+    done = counts.get("done", 0)
+    print(f"[Queue] 总计 {total} | 完成 {done} | 执行中 {counts.get('running', 0)}"
+          f"（租约过期 {expired}） | 待执行 {counts.get('pending', 0)} | 失败 {counts.get('failed', 0)}")
+
+    # 最近10分钟的完成速率估算剩余时间
+    recent = conn.execute("SELECT COUNT(*) FROM jobs WHERE status='done' AND finished_at > ?",
+                          (now - 600,)).fetchone()[0]
+    remaining = counts.get("pending", 0) + counts.get("running", 0)
+    if recent and remaining:
+        rate = recent / 600
+        print(f"[Queue] 速率 {rate * 60:.1f} 个/分钟，预计剩余 {remaining / rate / 60:.0f} 分钟")
+
+    workers = conn.execute(
+        "SELECT w.worker_id, w.concurrency, w.lease_seconds, w.last_heartbeat, "
+        "(SELECT COUNT(*) FROM jobs j WHERE j.worker_id = w.worker_id AND j.status='running') AS running "
+        "FROM workers w WHERE w.stopped_at IS NULL ORDER BY w.started_at"
+    ).fetchall()
+    for w in workers:
+        age = now - w["last_heartbeat"]
+        state = "活跃" if age < w["lease_seconds"] else "失联"
+        print(f"  - {w['worker_id']:<40} {state}  执行中 {w['running']}/{w['concurrency']}  心跳 {age:.0f}s 前")
+
+    if by_dir:
+        print("")
+        print("各目录详情:")
+        rows = conn.execute(
+            "SELECT eval_dir, SUM(status='done') AS done, SUM(status='running') AS running, "
+            "SUM(status='pending') AS pending, SUM(status='failed') AS failed, COUNT(*) AS total "
+            "FROM jobs GROUP BY eval_dir ORDER BY eval_dir"
+        ).fetchall()
+        for row in rows:
+            model_name = MODEL_NAME_RE.sub("", row["eval_dir"], count=1)
+            print(f"  {model_name:<30}  {row['done']}/{row['total']} done, {row['running']} running, "
+                  f"{row['pending']} pending, {row['failed']} failed")
+
+
+def cmd_status(args):
+    if not Path(args.db).exists():
+        print(f"错误: 作业库不存在: {args.db}")
+        return 1
+    conn = init_db(args.db)
+    while True:
+        if args.watch:
+            print(f"\n===== {time.strftime('%H:%M:%S')} =====")
+        print_summary(conn, by_dir=args.by_dir)
+        if args.failed:
+            for row in conn.execute("SELECT eval_dir, sample_id, output_suffix, attempts, exit_code, log_file "
+                                    "FROM jobs WHERE status='failed' ORDER BY eval_dir, sample_id"):
+                print(f"  ❌ {row['eval_dir']}/{row['sample_id']}{row['output_suffix']} "
+                      f"(attempts={row['attempts']}, exit={row['exit_code']}) {row['log_file'] or ''}")
+        if not args.watch:
+            return 0
+        pending = conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'running')").fetchone()[0]
+        if not pending:
+            return 0
+        time.sleep(args.watch)
+
+
+def cmd_retry(args):
+    conn = connect(args.db)
+    with Transaction(conn):
+        cur = conn.execute("UPDATE jobs SET status='pending', attempts=0, exit_code=NULL WHERE status='failed'")
+    print(f"[Queue] 重新入队 {cur.rowcount} 个失败作业")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="分片式recheck作业队列（多worker/多机器）")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("enqueue", help="展开 (eval目录, 样本, revision) 作业写入作业库")
+    p.add_argument("--db", required=True, help="作业库路径（多机器时放在共享存储上）")
+    p.add_argument("--revision", action="append", help="checklist revision编号，可重复指定；不指定则inline模式")
+    p.add_argument("--samples", default=None, help="samples模式：从样本JSONL提取check_list（不能与--revision同时指定）")
+    p.add_argument("--pattern", default=DEFAULT_PATTERN, help=f"eval目录匹配模式（默认 {DEFAULT_PATTERN}）")
+    p.add_argument("--model", default="gpt-5.2", help="judge模型名称")
+    p.add_argument("--data-id", default=None, help="仅处理指定data_id的样本")
+    p.add_argument("--output-suffix", default="", help="覆盖自动后缀（默认 _revNNN）")
+    p.add_argument("--only-checks", default=None, help="只执行指定检查项（逗号分隔）")
+    p.add_argument("--add", action="store_true", help="在已有结果上增跑新检查项")
+    p.add_argument("--incremental", action="store_true", help="只重跑输入指纹变化的检查项")
+    p.add_argument("--resume", action="store_true", help="跳过已有结果文件的样本")
+    p.add_argument("--reset", action="store_true", help="已存在的作业重置为pending（使用本次的选项）")
+    p.set_defaults(func=cmd_enqueue)
+
+    p = sub.add_parser("work", help="领取并执行作业")
+    p.add_argument("--db", required=True)
+    p.add_argument("--concurrency", type=int, default=1, help="本worker同时执行的作业数")
+    p.add_argument("--lease", type=int, default=DEFAULT_LEASE_SECONDS, help="租约时长（秒）")
+    p.add_argument("--heartbeat", type=int, default=DEFAULT_HEARTBEAT_SECONDS, help="心跳续约间隔（秒）")
+    p.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS, help="单个作业最大尝试次数")
+    p.add_argument("--log-dir", default=None, help="作业日志目录（默认 logs/recheck_queue/<作业库名>）")
+    p.set_defaults(func=cmd_work)
+
+    p = sub.add_parser("status", help="进度汇总")
+    p.add_argument("--db", required=True)
+    p.add_argument("--watch", type=int, default=0, help="每N秒刷新一次，直到全部完成")
+    p.add_argument("--by-dir", action="store_true", help="按eval目录显示进度")
+    p.add_argument("--failed", action="store_true", help="列出失败作业及日志路径")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("retry", help="失败作业重新入队")
+    p.add_argument("--db", required=True)
+    p.set_defaults(func=cmd_retry)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
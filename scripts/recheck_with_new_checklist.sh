@@ -21,6 +21,7 @@ DATA_ID=""           # 可选，仅处理指定样本
 RESUME=false         # 新增：resume模式，跳过已有结果的样本
 ONLY_CHECKS=""       # 增量模式：只执行指定检查项（支持语义ID如'逻辑硬伤'，也兼容数字序号如'33,35,36'）
 ADD_MODE=false       # 增量模式：在已有结果上增跑新检查项
+INCREMENTAL=false    # 增量recheck：只重跑输入指纹（文件/标准/对话hash）发生变化的检查项
 INLINE_MODE=false    # inline模式：check_list内嵌在样本JSON中，bench=result
 
 # 解析参数
@@ -66,6 +67,10 @@ while [[ $# -gt 0 ]]; do
             ADD_MODE=true
             shift
             ;;
+        --incremental)
+            INCREMENTAL=true
+            shift
+            ;;
         --inline)
             INLINE_MODE=true
             shift
@@ -95,6 +100,7 @@ if [ -z "$AGENT_RESULTS_DIR" ]; then
     echo "    --revision <revision编号，如 003> \\"
     echo "    [--resume] \\"
     echo "    [--add] \\"
+    echo "    [--incremental] \\"
     echo "    [--only-checks <检查项ID，如 '逻辑硬伤,章节克隆检测' 或 33,35,36>] \\"
     echo "    [--model <模型名，默认gpt-5.2>] \\"
     echo "    [--data-id <仅处理指定样本>]"
@@ -240,6 +246,7 @@ echo "模型: $MODEL"
 echo "API端点: $API_BASE"
 echo "Resume模式: $RESUME"
 echo "Add模式: $ADD_MODE"
+echo "增量recheck: $INCREMENTAL"
 echo "指定检查项: ${ONLY_CHECKS:-全部}"
 echo ""
 
@@ -289,7 +296,7 @@ for result_json in "$AGENT_RESULTS_DIR"/*.json; do
     fi
 
     # Resume模式：检查输出文件是否已存在（--add和--only-checks模式下不跳过）
-    if [ "$RESUME" = true ] && [ -f "$env_dir/$output_file" ] && [ "$ADD_MODE" = false ] && [ -z "$ONLY_CHECKS" ]; then
+    if [ "$RESUME" = true ] && [ -f "$env_dir/$output_file" ] && [ "$ADD_MODE" = false ] && [ -z "$ONLY_CHECKS" ] && [ "$INCREMENTAL" = false ]; then
         echo "⏭️  $basename: 已存在 $output_file，跳过"
         SKIPPED_COUNT=$((SKIPPED_COUNT + 1))
         continue
@@ -351,6 +358,11 @@ for result_json in "$AGENT_RESULTS_DIR"/*.json; do
         CHECKER_CMD+=(--existing-result "$existing_result_file")
         echo "  [增量] 基于已有结果: $output_file"
     fi
+    if [ "$INCREMENTAL" = true ]; then
+        # 已有结果默认取 --output（同一文件），指纹文件位于其旁边
+        CHECKER_CMD+=(--incremental)
+        echo "  [增量recheck] 按输入指纹复用未变化的检查项"
+    fi
     if [ -n "$ONLY_CHECKS" ]; then
         CHECKER_CMD+=(--only-checks "$ONLY_CHECKS")
         # --only-checks 隐含需要已有结果（如果存在的话）
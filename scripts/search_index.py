@@ -0,0 +1,706 @@
+#!/usr/bin/env python3
+"""
+评测结果检索索引（SQLite FTS5）
+
+查“模型X的逻辑硬伤检查中有 narrative_perspective_error 硬伤的样本”之类的问题，原来需要
+写一个 analysis/extract_judge_reasons.py 式的脚本遍历所有目录、加载所有 check_result。
+这里把所有 check_result 的检查项拆成行建立倒排索引：
+
+- 全文：check_id / subcategory_id / reason / details / flaws（type、location、description）
+- 分面过滤：model、revision、subcategory、result（pass/fail/skip）、flaw_type，可限定评测目录
+- 中文分词：FTS5 自带的 unicode61 会把一整段汉字当成一个词，这里在入库前把连续的CJK字符拆成
+  重叠二元组（“逻辑硬伤”→“逻辑 辑硬 硬伤”，每段末字再单独补一个），查询串做同样的转换后
+  作为短语匹配，任意长度（含单字）的中文子串都能命中；高亮片段在原文上定位生成
+- 增量更新：每个评测目录以 (目录mtime, sample_summaries.jsonl 的mtime/size, 各 *_env 目录的mtime)
+  为签名，checker 每写一个结果都会追加摘要行（env/sample_summary.py），新建/替换结果文件会改变
+  *_env 的mtime，签名不变的目录直接跳过；签名变化时再按文件 (mtime, size) 只重建变化的
+  check_result。原地改写已有文件且不经过摘要的改动（_env 下旧版checker副本、手工修改）由
+  full_scan 兜底：逐个文件比对签名，viewer 在后台线程中定期执行
+
+章节正文库（跨模型查看内容：“人物X第一次出现在哪一章”“哪一章是重复的结尾”）：
+- 收录所有 {data_id}_env/workspace/chapters/ 下的章节文件，同样按CJK二元组建立FTS5索引
+- 正文按内容hash去重存储（workspace/.stats.json 中的md5，过期时重新计算，与 env/check_fingerprint.py 一致），
+  同一份章节在多个目录/重跑中只入库一次；文件 (mtime, size) 未变时不读取内容
+- 目录签名以各 *_env/workspace/chapters/ 的mtime代替 *_env 的mtime（新增/删除章节即可被发现）
+- 查询结果带章节号、命中的字符偏移/行号和高亮片段，全部来自索引库，不加载小说文件；
+  first_only 只返回每个样本最早命中的章节
+
+索引文件默认为 evaluation_outputs/.search_index.sqlite，viewer 的 /api/v2/search、/api/v2/chapters/search
+首次查询时自动建立，也可以预先建好:
+    python scripts/search_index.py build
+    python scripts/search_index.py build --rebuild
+    python scripts/search_index.py query 视角 --model kimi-k2.5 --result fail --flaw-type narrative_perspective_error
+    python scripts/search_index.py chapters 林晚 --first-only
+"""
+import hashlib
+import html
+import json
+import os
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPT_DIR.parent / 'env'))
+
+from check_result_store import load_check_result  # noqa: E402
+from json_io import load_fields  # noqa: E402
+from pack_results import iter_check_result_files  # noqa: E402
+from sample_summary import SUMMARY_FILE, load_summaries  # noqa: E402
+from workspace_stats import load_stats  # noqa: E402
+
+INDEX_FILENAME = '.search_index.sqlite'
+SCHEMA_VERSION = 1
+
+# 分面字段（请求参数名 → checks表列名）
+FACETS = {
+    'model': 'model',
+    'revision': 'revision',
+    'subcategory': 'subcategory_id',
+    'result': 'check_result',
+}
+
+_CJK_RUN_RE = re.compile(r'[㐀-䶿一-鿿豈-﫿぀-ヿ가-힯]+')
+_REVISION_RE = re.compile(r'rev(\d+)')
+_CHAPTER_NO_RE = re.compile(r'chapter_(\d+)')
+CHAPTER_SUFFIXES = ('.md', '.txt')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scan_state (
+    eval_dir TEXT PRIMARY KEY,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS check_files (
+    path TEXT PRIMARY KEY,
+    eval_dir TEXT NOT NULL,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    eval_dir TEXT NOT NULL,
+    data_id TEXT NOT NULL,
+    model TEXT,
+    revision TEXT,
+    check_id TEXT,
+    subcategory_id TEXT,
+    dimension_id TEXT,
+    check_result TEXT,
+    reason TEXT,
+    details TEXT,
+    flaws TEXT
+);
+CREATE INDEX IF NOT EXISTS checks_path ON checks(path);
+CREATE INDEX IF NOT EXISTS checks_model ON checks(model);
+CREATE INDEX IF NOT EXISTS checks_subcategory ON checks(subcategory_id, check_result);
+CREATE TABLE IF NOT EXISTS check_flaw_types (
+    check_rowid INTEGER NOT NULL,
+    flaw_type TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS check_flaw_types_type ON check_flaw_types(flaw_type);
+CREATE INDEX IF NOT EXISTS check_flaw_types_check ON check_flaw_types(check_rowid);
+CREATE VIRTUAL TABLE IF NOT EXISTS checks_fts USING fts5(body);
+CREATE TABLE IF NOT EXISTS chapter_scan_state (
+    eval_dir TEXT PRIMARY KEY,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chapter_files (
+    path TEXT PRIMARY KEY,
+    eval_dir TEXT NOT NULL,
+    data_id TEXT NOT NULL,
+    model TEXT,
+    rel_path TEXT NOT NULL,
+    chapter_no INTEGER,
+    signature TEXT NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chapter_files_eval_dir ON chapter_files(eval_dir);
+CREATE INDEX IF NOT EXISTS chapter_files_hash ON chapter_files(content_hash);
+CREATE TABLE IF NOT EXISTS chapter_texts (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    text TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS chapters_fts USING fts5(body);
+"""
+
+
+# ==================== 分词 ====================
+
+def cjk_bigrams(text):
+    """把连续的CJK字符拆成重叠二元组（每段末字单独补一个，用于单字前缀查询），其他字符原样保留"""
+    def expand(m):
+        run = m.group()
+        grams = [run[i:i + 2] for i in range(len(run) - 1)]
+        grams.append(run[-1])
+        return ' ' + ' '.join(grams) + ' '
+    return _CJK_RUN_RE.sub(expand, text)
+
+
+def build_match_query(query):
+    """用户查询串 → FTS5 MATCH 表达式（空白分隔的多个词为AND，每个词按短语匹配）"""
+    phrases = []
+    for term in query.split():
+        tokens = cjk_bigrams(term).split()
+        if not tokens:
+            continue
+        last_is_single_cjk = len(tokens[-1]) == 1 and _CJK_RUN_RE.fullmatch(tokens[-1])
+        if len(tokens) > 1 and _CJK_RUN_RE.fullmatch(term):
+            tokens = tokens[:-1]  # 末字已包含在最后一个二元组中
+            last_is_single_cjk = False
+        phrase = '"' + ' '.join(t.replace('"', '""') for t in tokens) + '"'
+        phrases.append(phrase + ('*' if last_is_single_cjk else ''))
+    return ' AND '.join(phrases)
+
+
+def find_occurrences(text, query):
+    """原文中所有查询词的出现位置 [(start, end), ...]（不区分大小写，按位置排序）"""
+    lowered = text.lower()
+    return sorted(
+        (s, e) for term in query.split()
+        for s, e in _iter_occurrences(lowered, term.lower(), 0, len(text))
+    )
+
+
+def highlight(text, query, width=60):
+    """在原文中定位第一个命中的查询词，返回带<mark>高亮的HTML片段（未命中返回None）"""
+    if not text:
+        return None
+    hits = find_occurrences(text, query)
+    if not hits:
+        return None
+    return snippet_at(text, hits[0][0], hits[0][1], query, width)
+
+
+def snippet_at(text, start, end, query, width=60):
+    """以 text[start:end] 为中心截取片段，片段内所有查询词加<mark>高亮"""
+    lowered = text.lower()
+    left = max(0, start - width)
+    right = min(len(text), end + width)
+    snippet_hits = sorted(
+        (s, e) for term in query.split()
+        for s, e in _iter_occurrences(lowered, term.lower(), left, right)
+    )
+    parts, cursor = [], left
+    for s, e in snippet_hits:
+        if s < cursor:
+            continue
+        parts.append(html.escape(text[cursor:s]))
+        parts.append('<mark>' + html.escape(text[s:e]) + '</mark>')
+        cursor = e
+    parts.append(html.escape(text[cursor:right]))
+    return ('…' if left > 0 else '') + ''.join(parts) + ('…' if right < len(text) else '')
+
+
+def _iter_occurrences(lowered, term, left, right):
+    if not term:
+        return
+    pos = lowered.find(term, left)
+    while 0 <= pos and pos + len(term) <= right:
+        yield pos, pos + len(term)
+        pos = lowered.find(term, pos + len(term))
+
+
+# ==================== 索引 ====================
+
+def _file_signature(path):
+    st = os.stat(path)
+    return f'{st.st_mtime_ns}:{st.st_size}'
+
+
+def _eval_dir_signature(eval_dir, kind='checks'):
+    """评测目录签名：目录mtime + 摘要文件 + 各样本目录的mtime
+
+    kind='checks' 取 *_env 的mtime（新建/替换 check_result），'chapters' 取 *_env/workspace/chapters
+    的mtime（新增/删除章节）；每个目录只stat一次，不遍历文件
+    """
+    agent_results_dir = _agent_results_dir(eval_dir)
+    parts = [str(os.stat(eval_dir).st_mtime_ns)]
+    summary = agent_results_dir / SUMMARY_FILE
+    if summary.exists():
+        parts.append(_file_signature(summary))
+    digest = hashlib.md5()
+    for entry in sorted(os.scandir(agent_results_dir), key=lambda e: e.name):
+        if not entry.name.endswith('_env') or not entry.is_dir():
+            continue
+        path = entry.path if kind == 'checks' else os.path.join(entry.path, 'workspace', 'chapters')
+        try:
+            digest.update(f'{entry.name}:{os.stat(path).st_mtime_ns};'.encode())
+        except OSError:
+            continue
+    parts.append(digest.hexdigest()[:16])
+    return '|'.join(parts)
+
+
+def _content_hash(path, stats_entry):
+    """文件内容md5，返回 (hash, 已读出的内容或None)
+
+    workspace/.stats.json 中 size/mtime 一致的条目直接复用其hash（与 env/check_fingerprint.py 相同），
+    不读取文件
+    """
+    st = os.stat(path)
+    if stats_entry and stats_entry.get('size') == st.st_size and stats_entry.get('mtime_ns') == st.st_mtime_ns:
+        return stats_entry['hash'], None
+    raw = path.read_bytes()
+    return hashlib.md5(raw).hexdigest(), raw
+
+
+def _agent_results_dir(eval_dir):
+    return eval_dir / 'execution' if (eval_dir / 'execution').is_dir() else eval_dir
+
+
+class SearchIndex:
+    """evaluation_outputs 下所有检查结果的检索索引"""
+
+    def __init__(self, eval_outputs_dir, index_path=None):
+        self.eval_outputs_dir = Path(eval_outputs_dir)
+        self.index_path = Path(index_path) if index_path else self.eval_outputs_dir / INDEX_FILENAME
+        # viewer 的后台全量扫描使用另一个连接写入：等待写锁而不是立即报 database is locked
+        self.conn = sqlite3.connect(str(self.index_path), timeout=60)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            self._drop_all()
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    def close(self):
+        self.conn.close()
+
+    def _drop_all(self):
+        """索引结构版本变化时整体重建"""
+        for table in ('scan_state', 'check_files', 'checks', 'check_flaw_types', 'checks_fts',
+                      'chapter_scan_state', 'chapter_files', 'chapter_texts', 'chapters_fts'):
+            self.conn.execute(f'DROP TABLE IF EXISTS {table}')
+        self.conn.commit()
+
+    # ---------- 增量更新 ----------
+
+    def refresh(self, full_scan=False, rebuild=False):
+        """同步检查项索引与磁盘
+
+        Args:
+            full_scan: 不看目录签名，逐个文件比对 (mtime, size)
+            rebuild: 忽略所有签名，重建全部文件
+
+        Returns:
+            {'dirs': 扫描目录数, 'indexed': 重建文件数, 'removed': 删除文件数}
+        """
+        return self._sync('checks', 'scan_state', self._refresh_eval_dir, self._remove_eval_dir, full_scan, rebuild)
+
+    def refresh_chapters(self, full_scan=False, rebuild=False):
+        """同步章节正文库与磁盘（参数/返回值同 refresh）"""
+        stats = self._sync('chapters', 'chapter_scan_state', self._refresh_eval_dir_chapters,
+                           self._remove_eval_dir_chapters, full_scan, rebuild)
+        if stats['indexed'] or stats['removed']:
+            self._gc_chapter_texts()
+            self.conn.commit()
+        return stats
+
+    def _sync(self, kind, state_table, refresh_dir, remove_dir, full_scan, rebuild):
+        """按目录签名跳过未变化的评测目录，对变化的目录调用 refresh_dir，对已删除的目录调用 remove_dir"""
+        stats = {'dirs': 0, 'indexed': 0, 'removed': 0}
+        known = dict(self.conn.execute(f'SELECT eval_dir, signature FROM {state_table}'))
+        present = set()
+        if self.eval_outputs_dir.is_dir():
+            for entry in sorted(os.scandir(self.eval_outputs_dir), key=lambda e: e.name):
+                if not entry.is_dir():
+                    continue
+                present.add(entry.name)
+                eval_dir = Path(entry.path)
+                signature = _eval_dir_signature(eval_dir, kind)
+                if not (full_scan or rebuild) and known.get(entry.name) == signature:
+                    continue
+                refresh_dir(eval_dir, stats, rebuild)
+                self.conn.execute(f'INSERT OR REPLACE INTO {state_table} (eval_dir, signature) VALUES (?, ?)',
+                                  (entry.name, signature))
+                stats['dirs'] += 1
+                self.conn.commit()
+
+        for eval_dir_name in set(known) - present:
+            remove_dir(eval_dir_name, stats)
+            self.conn.execute(f'DELETE FROM {state_table} WHERE eval_dir = ?', (eval_dir_name,))
+        self.conn.commit()
+        return stats
+
+    def _sample_model(self, agent_results_dir, summaries, data_id):
+        """样本的模型名：优先读批次摘要，缺失时读结果文件的 model 字段"""
+        model = (summaries.get(data_id) or {}).get('model')
+        if model is None:
+            result_file = agent_results_dir / f'{data_id}.json'
+            try:
+                model = load_fields(result_file, ['model']).get('model') if result_file.exists() else None
+            except (OSError, ValueError):
+                model = None
+        return model or 'unknown'
+
+    # ---------- 检查项 ----------
+
+    def _refresh_eval_dir(self, eval_dir, stats, rebuild):
+        agent_results_dir = _agent_results_dir(eval_dir)
+        indexed = dict(self.conn.execute('SELECT path, signature FROM check_files WHERE eval_dir = ?',
+                                         (eval_dir.name,)))
+        summaries = load_summaries(agent_results_dir)
+        seen = set()
+        for path in iter_check_result_files(agent_results_dir):
+            key = str(path)
+            seen.add(key)
+            signature = _file_signature(path)
+            if not rebuild and indexed.get(key) == signature:
+                continue
+            if key in indexed:
+                self._delete_file(key)
+            data_id = path.parent.name[:-len('_env')]
+            model = self._sample_model(agent_results_dir, summaries, data_id)
+            self._index_file(path, eval_dir.name, data_id, model, signature)
+            stats['indexed'] += 1
+        for key in set(indexed) - seen:
+            self._delete_file(key)
+            stats['removed'] += 1
+
+    def _remove_eval_dir(self, eval_dir_name, stats):
+        for (path,) in self.conn.execute('SELECT path FROM check_files WHERE eval_dir = ?',
+                                         (eval_dir_name,)).fetchall():
+            self._delete_file(path)
+            stats['removed'] += 1
+
+    def _delete_file(self, path):
+        rowids = [row[0] for row in self.conn.execute('SELECT id FROM checks WHERE path = ?', (path,))]
+        for rowid in rowids:
+            self.conn.execute('DELETE FROM checks_fts WHERE rowid = ?', (rowid,))
+            self.conn.execute('DELETE FROM check_flaw_types WHERE check_rowid = ?', (rowid,))
+        self.conn.execute('DELETE FROM checks WHERE path = ?', (path,))
+        self.conn.execute('DELETE FROM check_files WHERE path = ?', (path,))
+
+    def _index_file(self, path, eval_dir_name, data_id, model, signature):
+        try:
+            check_result = load_check_result(path)
+        except Exception as e:
+            print(f'[SearchIndex] 跳过无法读取的文件 {path}: {e}')
+            check_result = {}
+        match = _REVISION_RE.search(path.stem)
+        revision = match.group(0) if match else ''
+        for check_id, item in check_result.get('check_details', {}).items():
+            if not isinstance(item, dict):
+                continue
+            flaws = item.get('flaws') if isinstance(item.get('flaws'), list) else []
+            flaws = [f for f in flaws if isinstance(f, dict)]
+            reason = str(item.get('reason', '') or '')
+            details = item.get('details', '')
+            if not isinstance(details, str):
+                details = json.dumps(details, ensure_ascii=False)
+            cur = self.conn.execute(
+                'INSERT INTO checks (path, eval_dir, data_id, model, revision, check_id, subcategory_id, '
+                'dimension_id, check_result, reason, details, flaws) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)',
+                (str(path), eval_dir_name, data_id, model, revision, check_id,
+                 item.get('subcategory_id', ''), item.get('dimension_id', ''), item.get('check_result', ''),
+                 reason, details, json.dumps(flaws, ensure_ascii=False) if flaws else None))
+            rowid = cur.lastrowid
+            flaw_types = sorted({str(f.get('type', '')) for f in flaws if f.get('type')})
+            self.conn.executemany('INSERT INTO check_flaw_types (check_rowid, flaw_type) VALUES (?, ?)',
+                                  [(rowid, t) for t in flaw_types])
+            body = '\n'.join([
+                check_id, item.get('subcategory_id', ''), reason, details,
+                *(f"{f.get('type', '')} {f.get('location', '')} {f.get('description', '')}" for f in flaws),
+            ])
+            self.conn.execute('INSERT INTO checks_fts (rowid, body) VALUES (?, ?)', (rowid, cjk_bigrams(body)))
+        self.conn.execute('INSERT OR REPLACE INTO check_files (path, eval_dir, signature) VALUES (?, ?, ?)',
+                          (str(path), eval_dir_name, signature))
+
+    # ---------- 章节正文 ----------
+
+    def _refresh_eval_dir_chapters(self, eval_dir, stats, rebuild):
+        agent_results_dir = _agent_results_dir(eval_dir)
+        indexed = dict(self.conn.execute('SELECT path, signature FROM chapter_files WHERE eval_dir = ?',
+                                         (eval_dir.name,)))
+        summaries = load_summaries(agent_results_dir)
+        seen = set()
+        for env_dir in sorted(agent_results_dir.glob('*_env')):
+            workspace_dir = env_dir / 'workspace'
+            chapters_dir = workspace_dir / 'chapters'
+            if not chapters_dir.is_dir():
+                continue
+            data_id = env_dir.name[:-len('_env')]
+            model = None
+            stats_files = None
+            for path in sorted(chapters_dir.rglob('*')):
+                if path.suffix not in CHAPTER_SUFFIXES or not path.is_file():
+                    continue
+                key = str(path)
+                seen.add(key)
+                signature = _file_signature(path)
+                if not rebuild and indexed.get(key) == signature:
+                    continue
+                if stats_files is None:
+                    stats_files = load_stats(workspace_dir)['files']
+                    model = self._sample_model(agent_results_dir, summaries, data_id)
+                rel_path = path.relative_to(workspace_dir).as_posix()
+                try:
+                    content_hash, raw = _content_hash(path, stats_files.get(rel_path))
+                    self._ensure_chapter_text(content_hash, path, raw)
+                except OSError:
+                    continue
+                match = _CHAPTER_NO_RE.search(path.stem)
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO chapter_files (path, eval_dir, data_id, model, rel_path, chapter_no, '
+                    'signature, content_hash) VALUES (?,?,?,?,?,?,?,?)',
+                    (key, eval_dir.name, data_id, model, rel_path,
+                     int(match.group(1)) if match else None, signature, content_hash))
+                stats['indexed'] += 1
+        for key in set(indexed) - seen:
+            self.conn.execute('DELETE FROM chapter_files WHERE path = ?', (key,))
+            stats['removed'] += 1
+
+    def _remove_eval_dir_chapters(self, eval_dir_name, stats):
+        cur = self.conn.execute('DELETE FROM chapter_files WHERE eval_dir = ?', (eval_dir_name,))
+        stats['removed'] += cur.rowcount
+
+    def _ensure_chapter_text(self, content_hash, path, raw=None):
+        """正文按内容hash只入库一次（raw 为计算hash时已读出的内容）"""
+        if self.conn.execute('SELECT 1 FROM chapter_texts WHERE content_hash = ?', (content_hash,)).fetchone():
+            return
+        if raw is None:
+            raw = path.read_bytes()
+        text = raw.decode('utf-8', errors='replace')
+        cur = self.conn.execute('INSERT INTO chapter_texts (content_hash, text) VALUES (?, ?)', (content_hash, text))
+        self.conn.execute('INSERT INTO chapters_fts (rowid, body) VALUES (?, ?)', (cur.lastrowid, cjk_bigrams(text)))
+
+    def _gc_chapter_texts(self):
+        """删除不再被任何章节文件引用的正文"""
+        orphan_ids = [row[0] for row in self.conn.execute(
+            'SELECT id FROM chapter_texts WHERE content_hash NOT IN (SELECT content_hash FROM chapter_files)')]
+        for text_id in orphan_ids:
+            self.conn.execute('DELETE FROM chapters_fts WHERE rowid = ?', (text_id,))
+            self.conn.execute('DELETE FROM chapter_texts WHERE id = ?', (text_id,))
+
+    # ---------- 查询 ----------
+
+    def search(self, query='', filters=None, flaw_types=None, eval_dirs=None, limit=50, offset=0):
+        """检索检查项
+
+        Args:
+            query: 全文查询串（空白分隔多个词为AND；为空时只按分面过滤）
+            filters: {分面名: [取值, ...]}，分面名见 FACETS
+            flaw_types: 只保留含这些类型硬伤的检查项
+            eval_dirs: 只检索这些评测目录（目录名列表）
+            limit/offset: 分页
+
+        Returns:
+            {'total', 'hits': [...], 'facets': {分面名: {取值: 数量}}}
+        """
+        where, params = [], []
+        match = build_match_query(query) if query else ''
+        if match:
+            where.append('c.id IN (SELECT rowid FROM checks_fts WHERE checks_fts MATCH ?)')
+            params.append(match)
+        for name, values in (filters or {}).items():
+            if values:
+                where.append(f'c.{FACETS[name]} IN ({",".join("?" * len(values))})')
+                params.extend(values)
+        if flaw_types:
+            where.append(f'c.id IN (SELECT check_rowid FROM check_flaw_types '
+                         f'WHERE flaw_type IN ({",".join("?" * len(flaw_types))}))')
+            params.extend(flaw_types)
+        if eval_dirs is not None:
+            where.append(f'c.eval_dir IN ({",".join("?" * len(eval_dirs))})')
+            params.extend(eval_dirs)
+        where_sql = ('WHERE ' + ' AND '.join(where)) if where else ''
+
+        total = self.conn.execute(f'SELECT COUNT(*) FROM checks c {where_sql}', params).fetchone()[0]
+
+        facets = {}
+        for name, column in FACETS.items():
+            facets[name] = {
+                (value or ''): count for value, count in self.conn.execute(
+                    f'SELECT c.{column}, COUNT(*) FROM checks c {where_sql} '
+                    f'GROUP BY c.{column} ORDER BY COUNT(*) DESC', params)
+            }
+        facets['flaw_type'] = {
+            value: count for value, count in self.conn.execute(
+                f'SELECT t.flaw_type, COUNT(*) FROM check_flaw_types t JOIN checks c ON c.id = t.check_rowid '
+                f'{where_sql} GROUP BY t.flaw_type ORDER BY COUNT(*) DESC', params)
+        }
+
+        rows = self.conn.execute(
+            f'SELECT c.* FROM checks c {where_sql} ORDER BY c.eval_dir, c.data_id, c.revision, c.check_id '
+            f'LIMIT ? OFFSET ?', params + [limit, offset]).fetchall()
+        hits = []
+        for row in rows:
+            flaws = json.loads(row['flaws']) if row['flaws'] else []
+            if flaw_types:
+                matched_flaws = [f for f in flaws if f.get('type') in flaw_types]
+            else:
+                matched_flaws = flaws
+            snippet = None
+            if query:
+                snippet = highlight(row['reason'], query) or highlight(row['details'], query)
+                if snippet is None:
+                    for f in flaws:
+                        snippet = highlight(f.get('description', ''), query)
+                        if snippet:
+                            break
+            hits.append({
+                'eval_dir': row['eval_dir'],
+                'data_id': row['data_id'],
+                'model': row['model'],
+                'revision': row['revision'],
+                'check_id': row['check_id'],
+                'subcategory_id': row['subcategory_id'],
+                'dimension_id': row['dimension_id'],
+                'check_result': row['check_result'],
+                'reason': row['reason'],
+                'snippet': snippet,
+                'flaws': matched_flaws,
+            })
+        return {'total': total, 'hits': hits, 'facets': facets}
+
+    def search_chapters(self, query, models=None, eval_dirs=None, data_ids=None, first_only=False,
+                        limit=50, offset=0, max_occurrences=5):
+        """检索章节正文
+
+        Args:
+            query: 全文查询串（空白分隔多个词为AND）
+            models/eval_dirs/data_ids: 过滤条件（None 表示不过滤）
+            first_only: 每个样本只返回章节号最小的命中章节
+            limit/offset: 分页
+            max_occurrences: 每个命中章节最多返回的命中位置数
+
+        Returns:
+            {'total', 'hits': [...], 'by_model': {模型: {'chapters': 命中章节数, 'samples': 命中样本数}}}
+        """
+        match = build_match_query(query)
+        if not match:
+            return {'total': 0, 'hits': [], 'by_model': {}}
+        where = ['t.id IN (SELECT rowid FROM chapters_fts WHERE chapters_fts MATCH ?)']
+        params = [match]
+        for column, values in (('model', models), ('eval_dir', eval_dirs), ('data_id', data_ids)):
+            if values is not None:
+                where.append(f'f.{column} IN ({",".join("?" * len(values))})')
+                params.extend(values)
+        matched = (f'SELECT f.eval_dir, f.data_id, f.model, f.rel_path, f.chapter_no, t.id AS text_id, '
+                   f'ROW_NUMBER() OVER (PARTITION BY f.eval_dir, f.data_id '
+                   f'ORDER BY f.chapter_no IS NULL, f.chapter_no, f.rel_path) AS nth '
+                   f'FROM chapter_files f JOIN chapter_texts t ON t.content_hash = f.content_hash '
+                   f'WHERE {" AND ".join(where)}')
+        if first_only:
+            matched = f'SELECT * FROM ({matched}) WHERE nth = 1'
+
+        total = self.conn.execute(f'SELECT COUNT(*) FROM ({matched})', params).fetchone()[0]
+        by_model = {
+            model: {'chapters': chapters, 'samples': samples}
+            for model, chapters, samples in self.conn.execute(
+                f'SELECT model, COUNT(*), COUNT(DISTINCT eval_dir || \'/\' || data_id) FROM ({matched}) '
+                f'GROUP BY model ORDER BY COUNT(*) DESC', params)
+        }
+        rows = self.conn.execute(
+            f'SELECT m.*, t.text FROM ({matched}) m JOIN chapter_texts t ON t.id = m.text_id '
+            f'ORDER BY m.eval_dir, m.data_id, m.nth LIMIT ? OFFSET ?', params + [limit, offset]).fetchall()
+
+        hits = []
+        for row in rows:
+            text = row['text']
+            spans = find_occurrences(text, query)
+            occurrences = [{
+                'offset': start,
+                'length': end - start,
+                'line': text.count('\n', 0, start) + 1,
+                'snippet': snippet_at(text, start, end, query),
+            } for start, end in spans[:max_occurrences]]
+            hits.append({
+                'eval_dir': row['eval_dir'],
+                'data_id': row['data_id'],
+                'model': row['model'],
+                'chapter': row['rel_path'],
+                'chapter_no': row['chapter_no'],
+                'occurrence_count': len(spans),
+                'occurrences': occurrences,
+            })
+        return {'total': total, 'hits': hits, 'by_model': by_model}
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='评测结果检索索引（SQLite FTS5）')
+    parser.add_argument('--eval-outputs', default=str(SCRIPT_DIR.parent / 'evaluation_outputs'),
+                        help='evaluation_outputs 目录')
+    parser.add_argument('--index', default=None, help=f'索引文件路径（默认 <eval-outputs>/{INDEX_FILENAME}）')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    b = sub.add_parser('build', help='建立/增量更新索引（逐个文件比对签名）')
+    b.add_argument('--rebuild', action='store_true', help='忽略签名，重建所有文件')
+
+    q = sub.add_parser('query', help='查询')
+    q.add_argument('query', nargs='?', default='', help='全文查询串')
+    for name in FACETS:
+        q.add_argument(f'--{name}', action='append', help=f'按{name}过滤（可重复）')
+    q.add_argument('--flaw-type', action='append', help='按硬伤类型过滤（可重复）')
+    q.add_argument('--batch', default=None, help='评测目录名前缀')
+    q.add_argument('--limit', type=int, default=20)
+
+    c = sub.add_parser('chapters', help='检索章节正文')
+    c.add_argument('query', help='全文查询串')
+    c.add_argument('--model', action='append', help='按模型过滤（可重复）')
+    c.add_argument('--batch', default=None, help='评测目录名前缀')
+    c.add_argument('--data-id', action='append', help='按样本过滤（可重复）')
+    c.add_argument('--first-only', action='store_true', help='每个样本只显示最早命中的章节')
+    c.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args()
+    index = SearchIndex(args.eval_outputs, args.index)
+
+    refreshers = {'检查项': index.refresh, '章节': index.refresh_chapters}
+    if args.command == 'query':
+        refreshers = {'检查项': index.refresh}
+    elif args.command == 'chapters':
+        refreshers = {'章节': index.refresh_chapters}
+    for label, refresh in refreshers.items():
+        start = time.time()
+        if args.command == 'build':
+            stats = refresh(full_scan=True, rebuild=args.rebuild)
+        else:
+            stats = refresh()
+        print(f'[索引/{label}] 更新 {stats["dirs"]} 个目录，重建 {stats["indexed"]} 个文件，'
+              f'删除 {stats["removed"]} 个文件，耗时 {time.time() - start:.2f}s')
+
+    eval_dirs = None
+    if args.command != 'build' and args.batch:
+        eval_dirs = [p.name for p in Path(args.eval_outputs).iterdir()
+                     if p.is_dir() and p.name.startswith(args.batch)]
+
+    if args.command == 'query':
+        start = time.time()
+        result = index.search(
+            args.query,
+            filters={name: getattr(args, name) for name in FACETS if getattr(args, name)},
+            flaw_types=args.flaw_type, eval_dirs=eval_dirs, limit=args.limit)
+        print(f'[查询] 命中 {result["total"]} 个检查项，耗时 {(time.time() - start) * 1000:.1f}ms')
+        for name, counts in result['facets'].items():
+            top = ', '.join(f'{k or "-"}={v}' for k, v in list(counts.items())[:8])
+            print(f'  {name}: {top}')
+        for hit in result['hits']:
+            print(f'- {hit["eval_dir"]}/{hit["data_id"]} [{hit["revision"] or "inline"}] '
+                  f'{hit["check_id"]} ({hit["subcategory_id"]}) → {hit["check_result"]}')
+            if hit['snippet']:
+                print(f'    {hit["snippet"]}')
+    elif args.command == 'chapters':
+        start = time.time()
+        result = index.search_chapters(
+            args.query, models=args.model, eval_dirs=eval_dirs, data_ids=args.data_id,
+            first_only=args.first_only, limit=args.limit)
+        print(f'[查询] 命中 {result["total"]} 个章节，耗时 {(time.time() - start) * 1000:.1f}ms')
+        for model, counts in result['by_model'].items():
+            print(f'  {model}: {counts["samples"]} 个样本 / {counts["chapters"]} 个章节')
+        for hit in result['hits']:
+            print(f'- {hit["eval_dir"]}/{hit["data_id"]} {hit["chapter"]} ({hit["model"]}) '
+                  f'命中 {hit["occurrence_count"]} 处')
+            for occ in hit['occurrences'][:3]:
+                print(f'    L{occ["line"]} @{occ["offset"]}: {occ["snippet"]}')
+    index.close()
+
+
+if __name__ == '__main__':
+    main()
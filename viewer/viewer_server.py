@@ -12,9 +12,47 @@ from http.server import HTTPServer, SimpleHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 import sys
 import socket
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "env"))
+from jsonl_index import JsonlIndex
+from search_index import FACETS, SearchIndex
+from json_io import dump_json, dumps, file_codec, load_fields, load_json
+from check_result_store import load_check_result
+from sample_summary import append_summary, load_summaries, summarize_sample, summary_path
+
+# 目录扫描/摘要缓存：handler每个请求新建一个实例，缓存放在模块级
+# evaluation_outputs 增删目录会改变其mtime；摘要文件按 (mtime, size) 判断是否有新追加
+_eval_dirs_cache = {'signature': None, 'names': []}
+_summary_cache = {}
+_samples_file_cache = {}
+
+# 检索索引（scripts/search_index.py）：请求线程复用一个连接，只按目录签名增量更新；
+# 逐文件比对的全量扫描（兜住原地改写、不经过样本摘要的改动）由后台线程每隔
+# SEARCH_FULL_SCAN_INTERVAL 秒执行一次（独立连接），不阻塞单线程的HTTPServer
+SEARCH_FULL_SCAN_INTERVAL = 300
+SEARCH_MAX_LIMIT = 500
+_search_state = {'index': None, 'rescan_thread': None}
+
+
+def _search_rescan_loop(eval_outputs_dir):
+    """后台定期全量扫描检索索引"""
+    index = SearchIndex(eval_outputs_dir)
+    while True:
+        time.sleep(SEARCH_FULL_SCAN_INTERVAL)
+        for label, refresh in (('检查项', index.refresh), ('章节', index.refresh_chapters)):
+            try:
+                stats = refresh(full_scan=True)
+            except Exception as e:
+                print(f"[检索] 后台全量扫描失败（{label}）: {e}")
+                continue
+            if stats['indexed'] or stats['removed']:
+                print(f"[检索] 后台全量扫描（{label}）: 重建 {stats['indexed']} 个文件，删除 {stats['removed']} 个文件")
+
 
 class ViewerHandlerV2(SimpleHTTPRequestHandler):
     """
@@ -60,6 +98,10 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
                     model = params.get('model', [''])[0]
                     file_path = params.get('file_path', [''])[0]
                     return self.handle_get_file(batch_name, data_id, model, file_path)
+        elif path == '/api/v2/search':
+            return self.handle_search(parse_qs(parsed_path.query))
+        elif path == '/api/v2/chapters/search':
+            return self.handle_chapter_search(parse_qs(parsed_path.query))
         elif path.startswith('/api/v2/specs/'):
             # /api/v2/specs/{spec_name}
             spec_name = path.split('/')[4]
@@ -98,13 +140,10 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
         # 按批次名称分组
         batch_map = {}
 
-        for eval_dir in self.eval_outputs_dir.iterdir():
-            if not eval_dir.is_dir():
-                continue
-
+        for eval_dir_name in self.list_eval_dir_names():
             # 解析目录名：eval_{batch_name}_{timestamp}_{model}
             # 或 {batch_name}_{timestamp}_{model}
-            match = re.match(r'(?:eval_)?(.+?)_(\d{8}_\d{6})_(.+)', eval_dir.name)
+            match = re.match(r'(?:eval_)?(.+?)_(\d{8}_\d{6})_(.+)', eval_dir_name)
             if not match:
                 continue
 
@@ -126,7 +165,7 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
                     'models': set()
                 }
 
-            batch_map[display_name]['eval_dirs'].append(eval_dir.name)
+            batch_map[display_name]['eval_dirs'].append(eval_dir_name)
             batch_map[display_name]['models'].add(model_simple)
 
         # 计算每个批次的样本数量
@@ -136,8 +175,7 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
 
             sample_count = 0
             if samples_file and samples_file.exists():
-                with open(samples_file, 'r', encoding='utf-8') as f:
-                    sample_count = sum(1 for _ in f)
+                sample_count = len(JsonlIndex(samples_file))
 
             batches.append({
                 'batch_name': batch_name,
@@ -159,52 +197,49 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
         if not samples_file or not samples_file.exists():
             return self.send_json_response({'error': f'Samples file not found for batch: {batch_name}'}, 404)
 
-        # 读取所有样本的data_id和query
+        # 读取所有样本的data_id和query（投影解析，跳过system/environment等大字段）
         sample_infos = []
-        with open(samples_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                sample = json.loads(line)
-                data_id = sample.get('data_id')
-                query = sample.get('query', '')
+        for sample in JsonlIndex(samples_file).iter_records(fields=['data_id', 'query']):
+            data_id = sample.get('data_id')
+            query = sample.get('query', '')
 
-                # 生成query摘要（前100字符）
-                query_summary = query[:100] + '...' if len(query) > 100 else query
+            # 生成query摘要（前100字符）
+            query_summary = query[:100] + '...' if len(query) > 100 else query
 
-                sample_infos.append({
-                    'data_id': data_id,
-                    'query_summary': query_summary
-                })
+            sample_infos.append({
+                'data_id': data_id,
+                'query_summary': query_summary
+            })
 
         # 查找该批次的所有评测结果目录
         eval_dirs = self.find_batch_eval_dirs(batch_name)
 
-        # 为每个样本加载各模型的执行状态
+        # 为每个样本加载各模型的执行状态：优先读批次摘要，缺失的样本回退到读取结果文件
+        eval_summaries = {
+            eval_dir_name: self.load_eval_dir_summaries(self.eval_outputs_dir / eval_dir_name)
+            for eval_dir_name in eval_dirs
+        }
         samples = []
         for sample_info in sample_infos:
             data_id = sample_info['data_id']
             models = []
 
             for eval_dir_name in eval_dirs:
-                eval_dir = self.eval_outputs_dir / eval_dir_name
-                result_file = eval_dir / f'{data_id}.json'
-
-                if result_file.exists():
-                    with open(result_file, 'r', encoding='utf-8') as f:
-                        result_data = json.load(f)
-
-                    model = result_data.get('model', 'unknown')
-                    status = result_data.get('execution_status', 'unknown')
-                    exec_time = result_data.get('execution_time', 0)
-                    has_annotation = 'manual_annotation' in result_data
+                summary = eval_summaries[eval_dir_name].get(data_id)
+                if summary is None:
+                    summary = summarize_sample(self.eval_outputs_dir / eval_dir_name, data_id)
+                if summary is None:
+                    continue
 
-                    models.append({
-                        'model': model,
-                        'status': status,
-                        'execution_time': exec_time,
-                        'has_annotation': has_annotation
-                    })
+                models.append({
+                    'model': summary['model'],
+                    'status': summary['execution_status'],
+                    'execution_time': summary['execution_time'],
+                    'has_annotation': summary['has_annotation'],
+                    'latest_revision': summary.get('latest_revision'),
+                    'total_score': summary.get('total_score'),
+                    'gate_triggered': summary.get('gate_triggered')
+                })
 
             samples.append({
                 'data_id': data_id,
@@ -228,20 +263,17 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
             return self.send_json_response({'error': f'Samples file not found: {batch_name}'}, 404)
 
         original_task = None
-        with open(samples_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                sample = json.loads(line)
-                if sample.get('data_id') == data_id:
-                    original_task = {
-                        'query': sample.get('query', ''),
-                        'system': sample.get('system', ''),
-                        'check_list': sample.get('check_list', []),
-                        'user_simulator_prompt': sample.get('user_simulator_prompt', ''),
-                        'environment': sample.get('environment', {})
-                    }
-                    break
+        sample = JsonlIndex(samples_file).get(
+            data_id, fields=['query', 'system', 'check_list', 'user_simulator_prompt', 'environment']
+        )
+        if sample is not None:
+            original_task = {
+                'query': sample.get('query', ''),
+                'system': sample.get('system', ''),
+                'check_list': sample.get('check_list', []),
+                'user_simulator_prompt': sample.get('user_simulator_prompt', ''),
+                'environment': sample.get('environment', {})
+            }
 
         if not original_task:
             return self.send_json_response({'error': f'Sample not found: {data_id}'}, 404)
@@ -257,8 +289,7 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
             if not result_file.exists():
                 continue
 
-            with open(result_file, 'r', encoding='utf-8') as f:
-                result_data = json.load(f)
+            result_data = load_json(result_file)
 
             # 读取workspace文件
             workspace_dir = eval_dir / f'{data_id}_env' / 'workspace'
@@ -275,9 +306,9 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
             check_result_revision = None
             env_dir = eval_dir / f'{data_id}_env'
             if env_dir.exists():
-                # 查找所有 check_result_rev*.json，取版本号最大的
+                # 查找所有 check_result_rev*.json，取版本号最大的（跳过旧版指纹文件 *.fingerprints.json）
                 check_files = sorted(
-                    env_dir.glob('check_result_rev*.json'),
+                    (p for p in env_dir.glob('check_result_rev*.json') if not p.name.endswith('.fingerprints.json')),
                     key=lambda p: p.stem,  # rev006 > rev004 > rev003 按字符串排序即可
                     reverse=True
                 )
@@ -286,8 +317,7 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
                     check_result_revision = re.search(r'rev(\d+)', latest_check_file.stem)
                     check_result_revision = check_result_revision.group(0) if check_result_revision else None
                     try:
-                        with open(latest_check_file, 'r', encoding='utf-8') as f:
-                            check_result = json.load(f)
+                        check_result = load_check_result(latest_check_file)
                     except Exception as e:
                         print(f"Failed to load check_result from {latest_check_file.name}: {e}")
 
@@ -323,9 +353,7 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
             result_file = eval_dir / f'{data_id}.json'
 
             if result_file.exists():
-                with open(result_file, 'r', encoding='utf-8') as f:
-                    result_data = json.load(f)
-                if result_data.get('model') == model:
+                if self.result_model(eval_dir, data_id) == model:
                     target_eval_dir = eval_dir
                     break
 
@@ -347,8 +375,7 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
 
         # 读取文件标注
         result_file = target_eval_dir / f'{data_id}.json'
-        with open(result_file, 'r', encoding='utf-8') as f:
-            result_data = json.load(f)
+        result_data = load_fields(result_file, ['file_annotations'])
 
         file_annotations = result_data.get('file_annotations', {})
         annotation = file_annotations.get(file_path, {})
@@ -380,9 +407,7 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
             result_file = eval_dir / f'{data_id}.json'
 
             if result_file.exists():
-                with open(result_file, 'r', encoding='utf-8') as f:
-                    result_data = json.load(f)
-                if result_data.get('model') == model:
+                if self.result_model(eval_dir, data_id) == model:
                     result_file_path = result_file
                     break
 
@@ -390,15 +415,14 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
             return self.send_json_response({'error': 'Result file not found'}, 404)
 
         # 读取、更新、保存
-        with open(result_file_path, 'r', encoding='utf-8') as f:
-            result_data = json.load(f)
+        result_data = load_json(result_file_path)
 
         # 添加时间戳
         annotation['annotated_at'] = datetime.now().isoformat()
         result_data['manual_annotation'] = annotation
 
-        with open(result_file_path, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, ensure_ascii=False, indent=2)
+        dump_json(result_data, result_file_path, codec=file_codec(result_file_path))
+        append_summary(result_file_path.parent, data_id)
 
         return self.send_json_response({
             'success': True,
@@ -425,9 +449,7 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
             result_file = eval_dir / f'{data_id}.json'
 
             if result_file.exists():
-                with open(result_file, 'r', encoding='utf-8') as f:
-                    result_data = json.load(f)
-                if result_data.get('model') == model:
+                if self.result_model(eval_dir, data_id) == model:
                     result_file_path = result_file
                     break
 
@@ -435,8 +457,7 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
             return self.send_json_response({'error': 'Result file not found'}, 404)
 
         # 读取、更新、保存
-        with open(result_file_path, 'r', encoding='utf-8') as f:
-            result_data = json.load(f)
+        result_data = load_json(result_file_path)
 
         if 'file_annotations' not in result_data:
             result_data['file_annotations'] = {}
@@ -445,14 +466,117 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
         annotation['annotated_at'] = datetime.now().isoformat()
         result_data['file_annotations'][file_path] = annotation
 
-        with open(result_file_path, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, ensure_ascii=False, indent=2)
+        dump_json(result_data, result_file_path, codec=file_codec(result_file_path))
+        append_summary(result_file_path.parent, data_id)
 
         return self.send_json_response({
             'success': True,
             'message': '文件标注已保存'
         })
 
+    # ==================== 检索 ====================
+
+    def refresh_search_index(self, kind):
+        """取进程内的检索索引并按目录签名增量更新 kind（checks / chapters），返回 (index, 更新统计)
+
+        首次调用时启动后台全量扫描线程；索引为空时本次请求会完整建立索引
+        （大量结果时可先执行 python scripts/search_index.py build）
+        """
+        index = _search_state['index']
+        if index is None:
+            index = _search_state['index'] = SearchIndex(self.eval_outputs_dir)
+        if _search_state['rescan_thread'] is None:
+            thread = threading.Thread(target=_search_rescan_loop, args=(self.eval_outputs_dir,),
+                                      name='search-rescan', daemon=True)
+            thread.start()
+            _search_state['rescan_thread'] = thread
+        refresh = index.refresh if kind == 'checks' else index.refresh_chapters
+        return index, refresh()
+
+    def parse_page_params(self, params):
+        """limit/offset（非法时返回None）；limit限制在 [1, SEARCH_MAX_LIMIT]，offset不小于0
+
+        SQLite 的 LIMIT -1 表示不限条数，负数limit不能直接传下去
+        """
+        try:
+            limit = int(params.get('limit', ['50'])[0])
+            offset = int(params.get('offset', ['0'])[0])
+        except ValueError:
+            return None
+        return max(1, min(limit, SEARCH_MAX_LIMIT)), max(0, offset)
+
+    def handle_search(self, params):
+        """跨样本检索检查项
+
+        参数: q（全文，空白分隔为AND）、model/revision/subcategory/result/flaw_type（可重复或逗号分隔）、
+        batch_name（限定批次）、limit、offset
+        """
+        def values(name):
+            return [v for raw in params.get(name, []) for v in raw.split(',') if v]
+
+        page = self.parse_page_params(params)
+        if page is None:
+            return self.send_json_response({'error': 'Invalid limit/offset'}, 400)
+        limit, offset = page
+
+        start = time.time()
+        index, refresh_stats = self.refresh_search_index('checks')
+
+        batch_name = params.get('batch_name', [''])[0]
+        try:
+            result = index.search(
+                params.get('q', [''])[0].strip(),
+                filters={name: values(name) for name in FACETS},
+                flaw_types=values('flaw_type'),
+                eval_dirs=self.find_batch_eval_dirs(batch_name) if batch_name else None,
+                limit=limit,
+                offset=offset,
+            )
+        except Exception as e:
+            return self.send_json_response({'error': f'Search failed: {str(e)}'}, 400)
+
+        result['indexed_files'] = refresh_stats['indexed']
+        result['took_ms'] = round((time.time() - start) * 1000, 1)
+        return self.send_json_response(result)
+
+    def handle_chapter_search(self, params):
+        """跨模型检索章节正文
+
+        参数: q（全文，必填）、model/data_id（可重复或逗号分隔）、batch_name（限定批次）、
+        first=1（每个样本只返回最早命中的章节）、limit、offset
+        """
+        def values(name):
+            return [v for raw in params.get(name, []) for v in raw.split(',') if v] or None
+
+        query = params.get('q', [''])[0].strip()
+        if not query:
+            return self.send_json_response({'error': 'Missing q'}, 400)
+        page = self.parse_page_params(params)
+        if page is None:
+            return self.send_json_response({'error': 'Invalid limit/offset'}, 400)
+        limit, offset = page
+
+        start = time.time()
+        index, refresh_stats = self.refresh_search_index('chapters')
+
+        batch_name = params.get('batch_name', [''])[0]
+        try:
+            result = index.search_chapters(
+                query,
+                models=values('model'),
+                eval_dirs=self.find_batch_eval_dirs(batch_name) if batch_name else None,
+                data_ids=values('data_id'),
+                first_only=params.get('first', [''])[0] in ('1', 'true'),
+                limit=limit,
+                offset=offset,
+            )
+        except Exception as e:
+            return self.send_json_response({'error': f'Search failed: {str(e)}'}, 400)
+
+        result['indexed_files'] = refresh_stats['indexed']
+        result['took_ms'] = round((time.time() - start) * 1000, 1)
+        return self.send_json_response(result)
+
     # ==================== 规范文档 ====================
 
     def handle_get_spec(self, spec_name):
@@ -484,36 +608,69 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
     # ==================== 辅助方法 ====================
 
     def find_samples_file(self, batch_name):
-        """从多个样本目录中查找样本文件"""
+        """从多个样本目录中查找样本文件（命中结果缓存，文件被删除时重新查找）"""
+        cached = _samples_file_cache.get(batch_name)
+        if cached is not None and cached.exists():
+            return cached
         for samples_dir in self.samples_dirs:
             # 尝试 eval_{batch_name}.jsonl
             samples_file = samples_dir / f'eval_{batch_name}.jsonl'
             if samples_file.exists():
+                _samples_file_cache[batch_name] = samples_file
                 return samples_file
             # 尝试 {batch_name}.jsonl
             samples_file = samples_dir / f'{batch_name}.jsonl'
             if samples_file.exists():
+                _samples_file_cache[batch_name] = samples_file
                 return samples_file
         return None
 
+    def list_eval_dir_names(self):
+        """evaluation_outputs 下的所有目录名（目录mtime不变时复用上次扫描结果）"""
+        try:
+            signature = self.eval_outputs_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        if _eval_dirs_cache['signature'] != signature:
+            _eval_dirs_cache['names'] = sorted(
+                entry.name for entry in os.scandir(self.eval_outputs_dir) if entry.is_dir()
+            )
+            _eval_dirs_cache['signature'] = signature
+        return _eval_dirs_cache['names']
+
     def find_batch_eval_dirs(self, batch_name):
         """查找批次的所有评测结果目录"""
         eval_dirs = []
 
-        if not self.eval_outputs_dir.exists():
-            return eval_dirs
-
-        for eval_dir in self.eval_outputs_dir.iterdir():
-            if not eval_dir.is_dir():
-                continue
-
+        for eval_dir_name in self.list_eval_dir_names():
             # 匹配 eval_{batch_name}_* 或 {batch_name}_*
-            if eval_dir.name.startswith(f'eval_{batch_name}_') or \
-               (eval_dir.name.startswith(f'{batch_name}_') and not eval_dir.name.startswith('eval_')):
-                eval_dirs.append(eval_dir.name)
+            if eval_dir_name.startswith(f'eval_{batch_name}_') or \
+               (eval_dir_name.startswith(f'{batch_name}_') and not eval_dir_name.startswith('eval_')):
+                eval_dirs.append(eval_dir_name)
 
         return eval_dirs
 
+    def load_eval_dir_summaries(self, eval_dir):
+        """评测目录的样本摘要 {data_id: summary}（摘要文件未变化时复用缓存）"""
+        path = summary_path(eval_dir)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return {}
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = _summary_cache.get(path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, load_summaries(eval_dir))
+            _summary_cache[path] = cached
+        return cached[1]
+
+    def result_model(self, eval_dir, data_id):
+        """样本结果的模型名（优先读摘要）"""
+        summary = self.load_eval_dir_summaries(eval_dir).get(data_id)
+        if summary is not None:
+            return summary.get('model')
+        return load_fields(eval_dir / f'{data_id}.json', ['model']).get('model')
+
     def read_workspace_files(self, workspace_dir):
         """递归读取workspace目录下的所有文件，并按照特定顺序排序"""
         files = {}
@@ -567,7 +724,8 @@ class ViewerHandlerV2(SimpleHTTPRequestHandler):
         self.send_header('Content-Type', 'application/json; charset=utf-8')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+        # 样本详情含完整对话历史，紧凑输出减小响应体积
+        self.wfile.write(dumps(data, compact=True).encode('utf-8'))
 
     def log_message(self, format, *args):
         """自定义日志格式"""